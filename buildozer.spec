@@ -13,10 +13,10 @@ package.domain = org.morijyobi
 source.dir = .
 
 # ソースコードに含める拡張子
-source.include_exts = py,png,jpg,kv,atlas,ttc,ttf,otf
+source.include_exts = py,png,jpg,kv,atlas,ttc,ttf,otf,rstd,jsonl,sqlite3
 
 # ソースコードから除外するパターン
-source.exclude_dirs = tests, bin, venv, __pycache__
+source.exclude_dirs = tests, bin, venv, __pycache__, tools
 
 # バージョン情報
 version = 0.1
@@ -7,48 +7,150 @@ main.py - KivyMD練習プロジェクトのメインアプリケーション
 このアプリケーションは、practice/ ディレクトリ内の
 各サンプルファイルの説明を表示するランチャーです。
 
+一覧のサンプルをタップすると、そのサンプルのモジュールを
+その場でimportし、build()の結果を同じウィンドウ内の
+Screenとして表示します（プロセスの再起動なし）。
+表示したあとにサンプルの on_start() を、一覧に戻るときに on_stop() を呼ぶので、
+事前作成やワーカースレッドの終了などの処理も単独で実行したときと同じように動きます。
+モジュールは一度importしたら保持されるため、2回目以降はbuild()だけで表示できます。
+
 実行方法:
     python main.py
 
-各サンプルを実際に実行するには:
+各サンプルを個別のプロセスで実行するには:
     python practice/01_basic_app.py
     python practice/02_buttons.py
     ... etc
 """
 
+import importlib.util
+import os
+import sys
+
+from kivy.app import App
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
-from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.list import MDList, TwoLineListItem
 from kivymd.uix.card import MDCard
 from kivymd.uix.toolbar import MDTopAppBar
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.screenmanager import MDScreenManager
 from kivy.metrics import dp
 
 
+# practice/ ディレクトリの絶対パス
+PRACTICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "practice")
+
+# サンプルと共通モジュール（fonts など）をimportできるようにする
+if PRACTICE_DIR not in sys.path:
+    sys.path.insert(0, PRACTICE_DIR)
+
+import bootstrap  # noqa: E402
+from recycle_list import RecycleList  # noqa: E402
+
+# サンプル一覧（ファイル名, タイトル, 説明）
+SAMPLES = [
+    ("01_basic_app.py", "基本的なMDApp", "MDAppクラスの基本構造、日本語フォント設定"),
+    ("02_buttons.py", "ボタン各種", "Raised、Flat、Iconボタンとイベント処理"),
+    ("03_cards.py", "カード表示", "MDCard、飲食店リスト風UI、RecycleView"),
+    ("04_dialogs.py", "ダイアログ", "アラート、確認、カスタムダイアログ、順番待ち"),
+    ("05_lists.py", "リスト表示", "OneLineListItem、TwoLineListItem等"),
+    ("06_navigation_drawer.py", "ナビゲーションドロワー", "サイドメニューの基本（簡略版）"),
+    ("07_bottom_navigation.py", "ボトムナビゲーション", "下部タブナビゲーション、画面切り替え"),
+    ("08_tabs.py", "タブUI", "MDTabs、タブ切り替え"),
+    ("09_textfields.py", "テキスト入力", "MDTextField、バリデーション、ログイン画面"),
+    ("10_toolbar.py", "ツールバー", "MDTopAppBar、アイコンボタン"),
+    ("11_bottom_sheet.py", "ボトムシート", "画面下部から表示されるシート、ドラッグ操作"),
+    ("12_snackbar.py", "スナックバー", "通知メッセージ、アクション付き通知、通知の順番待ち"),
+    ("13_spinner.py", "スピナー/プログレスバー", "ローディング表示、進行状況表示"),
+    ("14_switch_checkbox.py", "スイッチ/チェックボックス", "ON/OFF切り替え、複数選択"),
+    ("15_chip.py", "チップ/タグ", "タグ風UI、カテゴリ・評価・距離の絞り込み"),
+    ("16_menu.py", "ドロップダウンメニュー", "メニュー選択、並べ替え、コンテキストメニュー、数千件のメニュー"),
+]
+
+
+def load_sample_module(filename):
+    """
+    practice/ 内のサンプルモジュールをimportする関数
+
+    ファイル名が数字で始まるため通常のimport文は使えないので、
+    importlib でファイルパスから読み込みます。
+    読み込んだモジュールは sys.modules にキャッシュされ、
+    2回目以降は再読み込みしません。
+
+    Args:
+        filename (str): サンプルのファイル名（例: "03_cards.py"）
+
+    Returns:
+        module: 読み込んだモジュール
+    """
+    module_name = "practice_" + os.path.splitext(filename)[0]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(
+        module_name, os.path.join(PRACTICE_DIR, filename)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def find_app_class(module):
+    """
+    モジュール内で定義されているMDAppのサブクラスを探す関数
+
+    Args:
+        module (module): サンプルモジュール
+
+    Returns:
+        type: MDAppのサブクラス（見つからなければNone）
+    """
+    for value in vars(module).values():
+        if (isinstance(value, type) and issubclass(value, MDApp)
+                and value.__module__ == module.__name__):
+            return value
+    return None
+
+
 class KivyMDPracticeApp(MDApp):
     """
     KivyMD練習プロジェクトのメインアプリケーション
 
     各サンプルファイルの説明を表示するランチャーアプリです。
+    サンプルをタップすると、同じプロセス内でそのサンプルを表示します。
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # 表示中のサンプルのAppインスタンス（ファイル名 → App）
+        # コールバックが self を参照するため、on_stop() を呼ぶまで保持する
+        self.sample_apps = {}
+        # 表示中のサンプルのファイル名（一覧を表示中ならNone）
+        self.current_sample = None
+
     def build(self):
         """
         UIを構築するメソッド
 
-        サンプルファイル一覧を表示します。
+        サンプルファイル一覧の画面をScreenManagerに追加します。
 
         Returns:
-            MDBoxLayout: ルートウィジェット
+            MDScreenManager: ルートウィジェット
         """
         # テーマ設定
         self.theme_cls.primary_palette = "Blue"
         self.theme_cls.accent_palette = "Amber"
         self.theme_cls.theme_style = "Light"
 
+        # 画面切り替え用のScreenManager
+        self.screen_manager = MDScreenManager()
+
         # メインレイアウト
         main_layout = MDBoxLayout(orientation="vertical")
 
@@ -58,13 +160,9 @@ class KivyMDPracticeApp(MDApp):
         )
         main_layout.add_widget(toolbar)
 
-        # スクロールビュー
-        scroll_view = MDScrollView()
-
         # コンテンツレイアウト
         content_layout = MDBoxLayout(
             orientation="vertical",
-            adaptive_height=True,
             padding=dp(10),
             spacing=dp(10)
         )
@@ -78,44 +176,20 @@ class KivyMDPracticeApp(MDApp):
             radius=[dp(10)]
         )
         info_label = MDLabel(
-            text="KivyMD練習プロジェクトへようこそ！\n\n以下のサンプルは practice/ ディレクトリにあります。\n各サンプルを実行するには:\n\npython practice/XX_xxxx.py\n\nの形式で実行してください。",
+            text="KivyMD練習プロジェクトへようこそ！\n\n以下のサンプルをタップすると、この画面内で実行されます。\n個別のプロセスで実行するには:\n\npython practice/XX_xxxx.py\n\nの形式で実行してください。",
             size_hint_y=None,
             height=dp(140)
         )
         info_card.add_widget(info_label)
         content_layout.add_widget(info_card)
 
-        # サンプル一覧
-        samples = [
-            ("01_basic_app.py", "基本的なMDApp", "MDAppクラスの基本構造、日本語フォント設定"),
-            ("02_buttons.py", "ボタン各種", "Raised、Flat、Iconボタンとイベント処理"),
-            ("03_cards.py", "カード表示", "MDCard、飲食店リスト風UI、ScrollView"),
-            ("04_dialogs.py", "ダイアログ", "アラート、確認、カスタムダイアログ"),
-            ("05_lists.py", "リスト表示", "OneLineListItem、TwoLineListItem等"),
-            ("06_navigation_drawer.py", "ナビゲーションドロワー", "サイドメニューの基本（簡略版）"),
-            ("07_bottom_navigation.py", "ボトムナビゲーション", "下部タブナビゲーション、画面切り替え"),
-            ("08_tabs.py", "タブUI", "MDTabs、タブ切り替え"),
-            ("09_textfields.py", "テキスト入力", "MDTextField、バリデーション、ログイン画面"),
-            ("10_toolbar.py", "ツールバー", "MDTopAppBar、アイコンボタン"),
-            ("11_bottom_sheet.py", "ボトムシート", "画面下部から表示されるシート、ドラッグ操作"),
-            ("12_snackbar.py", "スナックバー", "通知メッセージ、アクション付き通知"),
-            ("13_spinner.py", "スピナー/プログレスバー", "ローディング表示、進行状況表示"),
-            ("14_switch_checkbox.py", "スイッチ/チェックボックス", "ON/OFF切り替え、複数選択"),
-            ("15_chip.py", "チップ/タグ", "タグ風UI、削除可能、チェック可能"),
-            ("16_menu.py", "ドロップダウンメニュー", "メニュー選択、コンテキストメニュー"),
+        # サンプルリスト（スクロール可能、タップは on_sample_press() 1つで受け取る）
+        sample_list = RecycleList(on_row_press=self.on_sample_press)
+        sample_list.data = [
+            {"text": f"{filename} - {title}", "secondary_text": description}
+            for filename, title, description in SAMPLES
         ]
-
-        # サンプルリスト
-        list_widget = MDList()
-
-        for filename, title, description in samples:
-            item = TwoLineListItem(
-                text=f"{filename} - {title}",
-                secondary_text=description
-            )
-            list_widget.add_widget(item)
-
-        content_layout.add_widget(list_widget)
+        content_layout.add_widget(sample_list)
 
         # フッター情報カード
         footer_card = MDCard(
@@ -133,25 +207,120 @@ class KivyMDPracticeApp(MDApp):
         footer_card.add_widget(footer_label)
         content_layout.add_widget(footer_card)
 
-        scroll_view.add_widget(content_layout)
-        main_layout.add_widget(scroll_view)
+        main_layout.add_widget(content_layout)
 
-        return main_layout
+        launcher_screen = MDScreen(name="launcher")
+        launcher_screen.add_widget(main_layout)
+        self.screen_manager.add_widget(launcher_screen)
+
+        return self.screen_manager
+
+    def on_sample_press(self, instance, index):
+        """
+        サンプルリストの行がタップされたときの処理
+
+        Args:
+            instance (RecycleList): サンプルリスト
+            index (int): タップされた行の番号（SAMPLES内の位置）
+        """
+        self.open_sample(SAMPLES[index][0])
+
+    def open_sample(self, filename):
+        """
+        サンプルを同じプロセス内で表示するメソッド
+
+        モジュールをimportしてbuild()を呼び出し、結果をScreenとして
+        ScreenManagerに追加して切り替えたあと、サンプルの on_start() を呼びます。
+        一覧に戻るときに on_stop() を呼んだサンプルは、次に開くときに作り直します。
+
+        Args:
+            filename (str): サンプルのファイル名
+        """
+        if self.screen_manager.has_screen(filename):
+            # 前回 on_stop() を呼んだ画面は使わない
+            self.screen_manager.remove_widget(self.screen_manager.get_screen(filename))
+        self.screen_manager.add_widget(self.create_sample_screen(filename))
+        self.screen_manager.current = filename
+        self.current_sample = filename
+        self.dispatch_sample_event(filename, "on_start")
+
+    def dispatch_sample_event(self, filename, event):
+        """
+        サンプルのAppに on_start / on_stop を発行するメソッド
+
+        発行中はサンプルのAppを実行中のAppとし、終わったらランチャーに戻します。
+
+        Args:
+            filename (str): サンプルのファイル名
+            event (str): "on_start" または "on_stop"
+        """
+        sample_app = self.sample_apps[filename]
+        App._running_app = sample_app
+        try:
+            sample_app.dispatch(event)
+        finally:
+            App._running_app = self
+
+    def create_sample_screen(self, filename):
+        """
+        サンプルのbuild()結果を載せたScreenを作成するメソッド
+
+        Args:
+            filename (str): サンプルのファイル名
+
+        Returns:
+            MDScreen: 戻るボタン付きのサンプル画面
+        """
+        app_class = find_app_class(load_sample_module(filename))
+
+        # App.__init__() は実行中のAppを自分自身に置き換えるため、
+        # build()後にランチャーを実行中のAppに戻す
+        sample_app = app_class()
+        try:
+            sample_root = sample_app.build()
+        finally:
+            App._running_app = self
+        sample_app.root = sample_root
+        self.sample_apps[filename] = sample_app
+
+        layout = MDBoxLayout(orientation="vertical")
+        layout.add_widget(MDTopAppBar(
+            title=filename,
+            left_action_items=[["arrow-left", lambda x: self.back_to_launcher()]]
+        ))
+        layout.add_widget(sample_root)
+
+        screen = MDScreen(name=filename)
+        screen.add_widget(layout)
+        return screen
+
+    def stop_current_sample(self):
+        """表示中のサンプルの on_stop() を呼び、Appインスタンスを手放すメソッド"""
+        filename = self.current_sample
+        if filename is None:
+            return
+        self.current_sample = None
+        try:
+            self.dispatch_sample_event(filename, "on_stop")
+        finally:
+            del self.sample_apps[filename]
+
+    def back_to_launcher(self):
+        """表示中のサンプルを終了し、サンプル一覧の画面に戻るメソッド"""
+        self.stop_current_sample()
+        self.screen_manager.current = "launcher"
+
+    def on_stop(self):
+        """ランチャーの終了時に、表示中のサンプルも終了する"""
+        self.stop_current_sample()
 
 
 def main():
     """
     アプリケーションのエントリーポイント
     """
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     KivyMDPracticeApp().run()
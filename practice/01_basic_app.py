@@ -17,8 +17,8 @@
 
 from kivymd.app import MDApp
 from kivymd.uix.label import MDLabel
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+
+import bootstrap
 
 
 class BasicApp(MDApp):
@@ -60,18 +60,8 @@ def main():
 
     日本語フォントを登録してから、アプリケーションを起動します。
     """
-    # デスクトップ実行時のウィンドウサイズを設定（幅360px × 高さ640px）
-    # スマートフォンの縦画面をシミュレート
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    # KivyMD 1.2.0 では個別ウィジェットに font_name を指定できないため、
-    # デフォルトフォントを置き換えることで日本語を表示する
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # BasicAppクラスのインスタンスを作成して実行
     BasicApp().run()
@@ -19,8 +19,8 @@ from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.button import MDRaisedButton, MDFlatButton, MDIconButton
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+
+import bootstrap
 
 
 class ButtonsApp(MDApp):
@@ -140,15 +140,8 @@ def main():
     """
     アプリケーションのエントリーポイント
     """
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     ButtonsApp().run()
@@ -6,9 +6,15 @@
 
 このサンプルでは、MDCardを使ったカード型UIの作り方を学びます。
 - MDCardの基本的な使い方
-- ScrollViewでスクロール対応
+- RecycleViewでスクロール対応（画面に見えているカードだけを作成）
+- 末尾までスクロールしたら次のページを読み込む（data/ にJSON Lines等がある場合）
 - 飲食店リスト風のカードデザイン
-- 画像 + テキストのレイアウト
+- 画像 + テキストのレイアウト（data/images/店名.jpg があればサムネイルを表示）
+- 店名・住所の検索（入力するたびに絞り込み、"らーめん" でも "ラーメン" が見つかる。
+  インデックスの登録と検索はワーカースレッドで行い、古い検索は打ち切る）
+- 現在地から近い店の表示（緯度・経度のマス目のインデックスで探す。
+  インデックスは最初に「近くの店」ボタンを押したときに作成する）
+- 距離は現在地と店の緯度・経度から、画面に見えているカードの分だけ計算して表示
 
 実行方法:
     python practice/03_cards.py
@@ -18,119 +24,70 @@ from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.button import MDIconButton
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivymd.uix.textfield import MDTextField
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.image import Image
 from kivy.metrics import dp
 
+import bootstrap
+from geo_index import GridIndex
+from restaurant_dataset import load_store
+from restaurant_source import PagedLoader, find_source
+from restaurants import DEFAULT_POSITION, RestaurantStore
+from search_index import SearchWorker
+from thumbnails import ThumbnailLoader, find_image
 
-class CardsApp(MDApp):
-    """
-    カード型UIのサンプルアプリケーション
 
-    飲食店リスト風のカードを複数表示するアプリです。
-    ScrollViewを使って、画面に収まらない場合はスクロールできます。
-    """
+# カード1枚の高さ
+CARD_HEIGHT = dp(120)
 
-    def build(self):
-        """
-        UIを構築するメソッド
+# 左側の画像（アイコン）の表示サイズ
+THUMBNAIL_WIDTH = dp(72)
 
-        ScrollViewの中にMDBoxLayoutを配置し、
-        その中に複数のカードを追加します。
+# 次のページを読み込み始めるスクロール位置（0が末尾、1が先頭）
+LOAD_MORE_SCROLL_Y = 0.1
 
-        Returns:
-            MDScrollView: ルートウィジェット（スクロール可能なビュー）
-        """
-        # テーマ設定
-        self.theme_cls.primary_palette = "Blue"
-        self.theme_cls.accent_palette = "Amber"
-        self.theme_cls.theme_style = "Light"
+# 全件の表示中に、一度にRecycleViewの data に追加する行数
+BROWSE_PAGE_SIZE = 200
 
-        # スクロール可能なビュー
-        # do_scroll_x=False: 横スクロール無効
-        # do_scroll_y=True: 縦スクロール有効（デフォルト）
-        scroll_view = MDScrollView()
+# 検索結果として表示する最大件数
+SEARCH_LIMIT = 500
 
-        # カードを縦に並べるレイアウト
-        # adaptive_height=True: 子ウィジェットの高さに応じて自動調整
-        layout = MDBoxLayout(
-            orientation="vertical",
-            adaptive_height=True,
-            padding=dp(10),
-            spacing=dp(10)
-        )
+# 「近くの店」として表示する件数
+NEARBY_LIMIT = 100
 
-        # サンプル飲食店データ
-        restaurants = [
-            {
-                "name": "ラーメン大将",
-                "category": "ラーメン",
-                "address": "東京都渋谷区1-2-3",
-                "rating": 4.5,
-                "distance": "150m"
-            },
-            {
-                "name": "カフェモカ",
-                "category": "カフェ",
-                "address": "東京都渋谷区2-3-4",
-                "rating": 4.2,
-                "distance": "200m"
-            },
-            {
-                "name": "カレーハウス",
-                "category": "カレー",
-                "address": "東京都渋谷区3-4-5",
-                "rating": 4.7,
-                "distance": "300m"
-            },
-            {
-                "name": "和食処 さくら",
-                "category": "和食",
-                "address": "東京都渋谷区4-5-6",
-                "rating": 4.3,
-                "distance": "400m"
-            },
-            {
-                "name": "イタリアン トマト",
-                "category": "イタリアン",
-                "address": "東京都渋谷区5-6-7",
-                "rating": 4.6,
-                "distance": "500m"
-            },
-        ]
-
-        # 各飲食店のカードを作成
-        for restaurant in restaurants:
-            card = self.create_restaurant_card(restaurant)
-            layout.add_widget(card)
-
-        scroll_view.add_widget(layout)
-        return scroll_view
-
-    def create_restaurant_card(self, restaurant):
-        """
-        飲食店カードを作成するメソッド
 
-        Args:
-            restaurant (dict): 飲食店情報（name, category, address, rating, distance）
+class RestaurantCard(RecycleDataViewBehavior, MDCard):
+    """
+    飲食店情報を表示するカード（RecycleViewのビュー）
+
+    RecycleViewは画面に見えている分のカードだけを作成し、
+    スクロールすると同じカードを使い回して別の飲食店のデータを表示します。
+    そのため、ウィジェットは __init__() で1回だけ作成し、
+    refresh_view_attrs() ではラベルの文字を書き換えるだけにしています。
+
+    RecycleViewの data には行番号（{"row": 行番号}）だけを入れ、
+    表示する値は RecycleView の store（RestaurantStore）から取り出します。
+    距離は RecycleView の position（現在地）から、表示するときに計算します。
+    店舗画像は RecycleView の thumbnails（ThumbnailLoader）に要求し、
+    読み込みが終わるまではアイコンを表示します。
+    """
 
-        Returns:
-            MDCard: 飲食店情報を表示するカード
-        """
+    def __init__(self, **kwargs):
         # MDCard（角丸のカード）
         # elevation: 影の高さ（大きいほど浮いて見える）
         # padding: 内側の余白
-        # size_hint_y: 高さを自動調整しない（Noneに設定）
-        # height: 固定の高さ
         # radius: 角の丸み
-        card = MDCard(
+        # （高さはRecycleBoxLayoutの default_size で指定）
+        super().__init__(
             elevation=2,
             padding=dp(10),
-            size_hint_y=None,
-            height=dp(120),
-            radius=[dp(10)]
+            radius=[dp(10)],
+            **kwargs
         )
 
         # カード内のレイアウト
@@ -139,12 +96,23 @@ class CardsApp(MDApp):
             spacing=dp(10)
         )
 
-        # 左側：アイコン（店舗画像の代わり）
-        icon_button = MDIconButton(
+        # 左側：店舗画像（読み込むまではアイコンを表示）
+        image_area = RelativeLayout(
+            size_hint_x=None,
+            width=THUMBNAIL_WIDTH
+        )
+        self.icon_button = MDIconButton(
             icon="store",  # 店舗アイコン
             icon_size=dp(48),
-            pos_hint={"center_y": 0.5}
+            pos_hint={"center_x": 0.5, "center_y": 0.5}
         )
+        self.thumbnail = Image(
+            fit_mode="contain",
+            opacity=0
+        )
+        image_area.add_widget(self.icon_button)
+        image_area.add_widget(self.thumbnail)
+        self.image_path = None
 
         # 右側：店舗情報（縦に並べる）
         info_layout = MDBoxLayout(
@@ -153,8 +121,7 @@ class CardsApp(MDApp):
         )
 
         # 店名ラベル
-        name_label = MDLabel(
-            text=f"[b]{restaurant['name']}[/b]",
+        self.name_label = MDLabel(
             markup=True,  # マークアップ（太字など）を有効化
             font_name="Roboto",
             font_size=dp(18),
@@ -163,8 +130,7 @@ class CardsApp(MDApp):
         )
 
         # カテゴリ・距離ラベル
-        category_label = MDLabel(
-            text=f"{restaurant['category']} • {restaurant['distance']}",
+        self.category_label = MDLabel(
             font_name="Roboto",
             font_size=dp(14),
             size_hint_y=None,
@@ -172,8 +138,7 @@ class CardsApp(MDApp):
         )
 
         # 住所ラベル
-        address_label = MDLabel(
-            text=restaurant['address'],
+        self.address_label = MDLabel(
             font_name="Roboto",
             font_size=dp(12),
             size_hint_y=None,
@@ -181,8 +146,7 @@ class CardsApp(MDApp):
         )
 
         # 評価ラベル（星マーク）
-        rating_label = MDLabel(
-            text=f"★ {restaurant['rating']}",
+        self.rating_label = MDLabel(
             font_name="Roboto",
             font_size=dp(14),
             size_hint_y=None,
@@ -190,34 +154,332 @@ class CardsApp(MDApp):
         )
 
         # 情報レイアウトにラベルを追加
-        info_layout.add_widget(name_label)
-        info_layout.add_widget(category_label)
-        info_layout.add_widget(address_label)
-        info_layout.add_widget(rating_label)
+        info_layout.add_widget(self.name_label)
+        info_layout.add_widget(self.category_label)
+        info_layout.add_widget(self.address_label)
+        info_layout.add_widget(self.rating_label)
 
         # カードレイアウトにアイコンと情報を追加
-        card_layout.add_widget(icon_button)
+        card_layout.add_widget(image_area)
         card_layout.add_widget(info_layout)
 
         # カードにカードレイアウトを追加
-        card.add_widget(card_layout)
+        self.add_widget(card_layout)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """
+        カードに表示する飲食店のデータを設定するメソッド
+
+        RecycleViewから、カードを表示（または使い回し）するたびに呼ばれます。
+
+        Args:
+            rv (RecycleView): 親のRecycleView（store 属性にデータ、position 属性に現在地を持つ）
+            index (int): RecycleViewの data 内の位置
+            data (dict): {"row": ストアの行番号}
+        """
+        self.index = index
+        store = rv.store
+        row = data["row"]
+        self.name_label.text = f"[b]{store.name(row)}[/b]"
+        # 距離は見えているカードの分だけ現在地から計算する
+        self.category_label.text = f"{store.category(row)} • {store.distance_text(row, rv.position)}"
+        self.address_label.text = store.address(row)
+        self.rating_label.text = f"★ {store.rating(row)}"
+
+        # 使い回したカードに前の店の画像が残らないようにアイコンに戻す
+        self.show_icon()
+        self.image_path = find_image(store.name(row))
+        rv.thumbnails.request(self.image_path, self.on_thumbnail)
+
+    def show_icon(self):
+        """店舗画像を隠してアイコンを表示するメソッド"""
+        self.thumbnail.opacity = 0
+        self.icon_button.opacity = 1
+
+    def on_thumbnail(self, path, texture):
+        """
+        店舗画像の読み込みが終わったときの処理
+
+        読み込み中にカードが別の店に使い回された場合は何もしません。
+
+        Args:
+            path (str): 読み込んだ画像のパス
+            texture (Texture): 縮小済みの画像
+        """
+        if path != self.image_path:
+            return
+        self.thumbnail.texture = texture
+        self.thumbnail.opacity = 1
+        self.icon_button.opacity = 0
+
+
+class CardsApp(MDApp):
+    """
+    カード型UIのサンプルアプリケーション
+
+    飲食店リスト風のカードを表示するアプリです。
+    RecycleViewを使っているため、飲食店が何万件あっても
+    作成されるカードは画面に見えている数枚だけです。
+    """
+
+    def build(self):
+        """
+        UIを構築するメソッド
+
+        検索欄の下のRecycleViewにカードを縦に並べるレイアウトを配置し、
+        表示する飲食店の行番号を data に設定します。
+
+        Returns:
+            MDBoxLayout: ルートウィジェット（検索欄 + スクロール可能なビュー）
+        """
+        # テーマ設定
+        self.theme_cls.primary_palette = "Blue"
+        self.theme_cls.accent_palette = "Amber"
+        self.theme_cls.theme_style = "Light"
+
+        # 飲食店データ（列ごとの配列で保持するストア）
+        # data/ に restaurants.jsonl / restaurants.sqlite3 があればページ単位で読み込む
+        # なければ data/restaurants.rstd をmmapで開くか、サンプルデータを使う
+        source = find_source()
+        if source is not None:
+            self.store = RestaurantStore()
+            self.loader = PagedLoader(
+                source, self.store, on_page=self.on_page_loaded, wants_more=self.needs_more_rows
+            )
+        else:
+            self.store = load_store()
+            self.loader = None
+
+        # 検索用インデックス（行の登録と検索はワーカースレッドで行う）
+        self.search_worker = SearchWorker.from_store(self.store, self.on_search_results)
+
+        # 近くの店を探すための緯度・経度のインデックス（全行を調べるので、使うときに作成する）
+        # （位置情報が取れない環境でも動くように、現在地は渋谷駅に固定している）
+        self.position = DEFAULT_POSITION
+        self.geo_index = None
+        self.nearby = False
+
+        # 店名・住所の検索欄
+        self.search_field = MDTextField(
+            hint_text="店名・住所で検索",
+            font_name="Roboto"
+        )
+        self.search_field.bind(text=self.on_search_text)
+
+        # 「近くの店」ボタン（押すたびに近い順の表示と全件の表示を切り替える）
+        self.nearby_button = MDIconButton(
+            icon="crosshairs",
+            on_release=self.on_nearby_press
+        )
+
+        # 検索欄とボタンを横に並べる
+        search_bar = MDBoxLayout(
+            orientation="horizontal",
+            size_hint=(0.9, None),
+            height=dp(56),
+            pos_hint={"center_x": 0.5}
+        )
+        search_bar.add_widget(self.search_field)
+        search_bar.add_widget(self.nearby_button)
+
+        # 見えている範囲だけカードを作成するスクロールビュー
+        # viewclass: 各行の表示に使うウィジェットのクラス
+        recycle_view = RecycleView()
+        recycle_view.viewclass = RestaurantCard
+        recycle_view.store = self.store
+        recycle_view.position = self.position
+        recycle_view.thumbnails = ThumbnailLoader()
+        recycle_view.bind(scroll_y=self.on_scroll)
+        self.recycle_view = recycle_view
+
+        # カードを縦に並べるレイアウト
+        # default_size: 各カードのサイズ（幅はNoneで親に合わせる）
+        layout = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, CARD_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            padding=dp(10),
+            spacing=dp(10)
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        recycle_view.add_widget(layout)
+
+        # 表示する行番号を先頭のページの分だけ設定（カードの作成はRecycleViewが必要な分だけ行う）
+        self.show_all_rows()
+
+        # 最初のページの読み込みを開始（読み込み中も画面は表示される）
+        if self.loader is not None:
+            self.loader.load_next()
+
+        # 検索欄とカード一覧を縦に並べる
+        main_layout = MDBoxLayout(orientation="vertical")
+        main_layout.add_widget(search_bar)
+        main_layout.add_widget(recycle_view)
+
+        return main_layout
+
+    def on_scroll(self, recycle_view, scroll_y):
+        """
+        スクロールしたときの処理
+
+        末尾に近づいたら、全件の表示中は読み込み済みの行を data に追加し、
+        すべて追加済みなら次のページを読み込みます。
+
+        Args:
+            recycle_view (RecycleView): スクロールしたビュー
+            scroll_y (float): スクロール位置（0が末尾、1が先頭）
+        """
+        if scroll_y > LOAD_MORE_SCROLL_Y:
+            return
+        if not self.nearby and not self.search_field.text.strip():
+            self.show_more_rows()
+            if len(self.recycle_view.data) < len(self.store):
+                return
+        if self.loader is not None:
+            self.loader.load_next()
+
+    def needs_more_rows(self):
+        """
+        全件の表示中に、カードが画面の高さに満たないかを返すメソッド
+
+        画面が埋まらないとスクロールが起きず、on_scroll() で次のページを読み込めないため、
+        ページの読み込み後にこのメソッドがTrueを返せば続けて読み込みます。
+
+        Returns:
+            bool: 次のページが必要ならTrue
+        """
+        if self.nearby or self.search_field.text.strip():
+            return False
+        rows_height = len(self.recycle_view.data) * (CARD_HEIGHT + dp(10))
+        return rows_height < self.recycle_view.height
+
+    def on_page_loaded(self, start, end):
+        """
+        ページの読み込みが終わったときの処理
+
+        全件の表示中は、表示済みの行に続けて data に追加します。
+        検索中は、追加された行を登録してから検索し直します。
+
+        Args:
+            start (int): 追加された最初の行番号
+            end (int): 追加された最後の行番号 + 1
+        """
+        self.search_worker.add_store_rows(self.store, start, end)
+        if self.geo_index is not None:
+            self.geo_index.extend(self.store, end)
+        if self.search_field.text.strip():
+            self.submit_search()
+        elif self.nearby:
+            self.show_nearby()
+        else:
+            self.show_more_rows()
+
+    def on_search_text(self, instance, text):
+        """
+        検索欄の文字が変わったときの処理
+
+        Args:
+            instance (MDTextField): 検索欄
+            text (str): 入力された文字
+        """
+        if text.strip():
+            self.submit_search()
+            return
+        self.search_worker.cancel()
+        if self.nearby:
+            self.show_nearby()
+        else:
+            # 検索語がなければ読み込み済みの全件の表示に戻す
+            self.show_all_rows()
+
+    def show_all_rows(self):
+        """読み込み済みの全件を、先頭の BROWSE_PAGE_SIZE 件から表示し直すメソッド"""
+        self.recycle_view.data = []
+        self.show_more_rows()
+
+    def show_more_rows(self):
+        """
+        全件の表示中に、表示済みの行に続く BROWSE_PAGE_SIZE 件を data の末尾に追加するメソッド
+
+        10万件の data を一度に作ると、起動や検索語を消すたびに10万個の辞書を作ることになるため、
+        スクロールに合わせて少しずつ追加します。
+        """
+        data = self.recycle_view.data
+        start = len(data)
+        end = min(start + BROWSE_PAGE_SIZE, len(self.store))
+        if start < end:
+            data.extend({"row": row} for row in range(start, end))
+
+    def submit_search(self):
+        """
+        検索欄の文字での検索をワーカースレッドに依頼するメソッド
+
+        近くの店の表示中は、一致した行をすべて受け取ってから近い順に選ぶため、
+        件数を制限せずに検索します（先に SEARCH_LIMIT 件で打ち切ると、近い店が結果から漏れるため）。
+        入力が続いたときは、前の検索は打ち切られます。
+        """
+        limit = None if self.nearby else SEARCH_LIMIT
+        self.search_worker.submit(self.search_field.text, limit=limit)
+
+    def on_search_results(self, query, rows):
+        """
+        検索結果を受け取ったときの処理（メインスレッドで呼ばれる）
+
+        近くの店の表示中は、一致した行の中から近い順に SEARCH_LIMIT 件を表示します。
+
+        Args:
+            query (str): 検索語
+            rows (list): 一致した行番号のリスト
+        """
+        if self.nearby:
+            latitude, longitude = self.position
+            nearest = self.get_geo_index().nearest(latitude, longitude, SEARCH_LIMIT, rows=set(rows))
+            rows = [row for _distance, row in nearest]
+        self.recycle_view.data = [{"row": row} for row in rows]
+
+    def on_nearby_press(self, instance):
+        """
+        「近くの店」ボタンが押されたときの処理
+
+        Args:
+            instance (MDIconButton): 押されたボタン
+        """
+        self.nearby = not self.nearby
+        self.nearby_button.icon = "crosshairs-gps" if self.nearby else "crosshairs"
+        self.on_search_text(self.search_field, self.search_field.text)
+
+    def get_geo_index(self):
+        """
+        緯度・経度のインデックスを返すメソッド（初めて使うときに読み込み済みの全行で作成する）
+
+        Returns:
+            GridIndex: インデックス
+        """
+        if self.geo_index is None:
+            self.geo_index = GridIndex.from_store(self.store)
+        return self.geo_index
+
+    def show_nearby(self):
+        """現在地から近い順に NEARBY_LIMIT 件のカードを表示するメソッド"""
+        latitude, longitude = self.position
+        nearest = self.get_geo_index().nearest(latitude, longitude, NEARBY_LIMIT)
+        self.recycle_view.data = [{"row": row} for _distance, row in nearest]
 
-        return card
+    def on_stop(self):
+        """アプリの終了時に、ページの読み込み・検索・サムネイルのワーカースレッドを終了する"""
+        if self.loader is not None:
+            self.loader.close()
+        self.search_worker.close()
+        self.recycle_view.thumbnails.close()
 
 
 def main():
     """
     アプリケーションのエントリーポイント
     """
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     CardsApp().run()
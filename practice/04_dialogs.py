@@ -9,20 +9,59 @@
 - ボタン付き確認ダイアログ
 - カスタムコンテンツを含むダイアログ
 - open() / dismiss()メソッド
+- ダイアログの使い回し（種類ごとに1回だけ作成し、タイトル・本文・ボタンの処理を差し替える）
+- 起動後の空いているフレームでダイアログを事前に作成（初めて開くときも引っかからない）
+- 優先度付きの順番待ち（バックグラウンド処理の結果のダイアログを1つずつ開き、
+  エラーは表示中のお知らせを中断して先に開く）
+- 開いて閉じるのを10,000回繰り返し、ウィジェット数とメモリが増えないことを確認
+  （続けて、閉じるアニメーションの途中で次を開く・中断する場合も繰り返し、
+  ダイアログがいくつ作成されたかを表示する）
 
 実行方法:
     python practice/04_dialogs.py
 """
 
+import gc
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.button import MDRaisedButton, MDFlatButton
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.textfield import MDTextField
-from kivy.core.text import LabelBase
+from kivy.clock import Clock
 from kivy.core.window import Window
 
+import bootstrap
+from dialog_pool import DialogPool
+from dialog_queue import DialogQueue
+
+
+# バックグラウンド処理の結果の例（件名, 優先度, 処理にかかる秒数）
+BACKGROUND_TASKS = (
+    ("画像のアップロード", 0, 0.5),
+    ("データの同期", 0, 0.8),
+    ("バックアップ", 10, 1.0),  # 失敗したことにする（エラーは優先度を高くする）
+)
+
+# ダイアログを開いて閉じるのを繰り返す回数と、1フレームで行う回数
+STRESS_CYCLES = 10000
+STRESS_CYCLES_PER_FRAME = 200
+
+# 続けてアニメーションありで開閉する回数と、
+# 優先度の高いダイアログで中断する間隔、最後にアニメーションの終わりを待つ秒数
+STRESS_ANIMATED_CYCLES = 30
+STRESS_PREEMPT_EVERY = 10
+STRESS_SETTLE_SECONDS = 1.0
+
+
+def count_widgets(widget):
+    """ウィジェットとその子孫の数を返す関数"""
+    return 1 + sum(count_widgets(child) for child in widget.children)
+
 
 class DialogsApp(MDApp):
     """
@@ -33,8 +72,14 @@ class DialogsApp(MDApp):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # ダイアログオブジェクトを保持する変数
-        self.dialog = None
+        # 種類ごとに作成したダイアログを使い回すプール
+        self.dialogs = DialogPool()
+        self.dialogs.register("alert", self.create_alert_dialog)
+        self.dialogs.register("confirm", self.create_confirm_dialog)
+        self.dialogs.register("custom", self.create_custom_dialog)
+        # ダイアログを優先度順に1つずつ開く順番待ち
+        self.dialog_queue = DialogQueue(self.dialogs)
+        self.executor = ThreadPoolExecutor(max_workers=2)
 
     def build(self):
         """
@@ -93,6 +138,24 @@ class DialogsApp(MDApp):
         )
         layout.add_widget(custom_button)
 
+        # バックグラウンド処理の結果をダイアログで順番に表示するボタン
+        background_button = MDRaisedButton(
+            text="バックグラウンド処理",
+            pos_hint={"center_x": 0.5},
+            size_hint_x=0.8,
+            on_press=self.start_background_tasks
+        )
+        layout.add_widget(background_button)
+
+        # ダイアログを繰り返し開いて閉じるボタン（ウィジェット数・メモリの確認用）
+        stress_button = MDRaisedButton(
+            text=f"開閉を{STRESS_CYCLES:,}回繰り返す",
+            pos_hint={"center_x": 0.5},
+            size_hint_x=0.8,
+            on_press=self.start_stress_test
+        )
+        layout.add_widget(stress_button)
+
         # 結果表示ラベル
         self.result_label = MDLabel(
             text="ダイアログのボタンを押してください",
@@ -104,99 +167,74 @@ class DialogsApp(MDApp):
 
         return layout
 
-    def show_alert_dialog(self, instance):
+    def on_start(self):
         """
-        シンプルなアラートダイアログを表示
+        アプリの開始時の処理
 
-        Args:
-            instance: 押されたボタンのインスタンス
+        最初のフレームの描画後に、各種類のダイアログを事前に作成します。
+        """
+        self.dialogs.prewarm()
+
+    def create_alert_dialog(self, on_button):
         """
-        # 既存のダイアログがあれば閉じる
-        if self.dialog:
-            self.dialog.dismiss()
+        アラートダイアログを作成（DialogPool から1回だけ呼ばれる）
+
+        Args:
+            on_button (callable): ボタンのキーからボタンの on_press に指定する関数を返す
 
+        Returns:
+            MDDialog: 作成したダイアログ
+        """
         # MDDialog作成
         # title: ダイアログのタイトル
         # text: メッセージ本文
         # buttons: ダイアログ下部のボタンリスト
-        self.dialog = MDDialog(
+        return MDDialog(
             title="お知らせ",
             text="これはシンプルなアラートダイアログです。",
             buttons=[
                 MDFlatButton(
                     text="OK",
-                    on_press=self.close_alert_dialog
+                    on_press=on_button("ok")
                 ),
             ],
         )
-        self.dialog.open()
 
-    def close_alert_dialog(self, instance):
+    def create_confirm_dialog(self, on_button):
         """
-        アラートダイアログを閉じる
+        確認ダイアログ（はい/いいえ）を作成（DialogPool から1回だけ呼ばれる）
 
         Args:
-            instance: 押されたボタンのインスタンス
-        """
-        self.dialog.dismiss()
-        self.result_label.text = "アラートダイアログが閉じられました"
-
-    def show_confirm_dialog(self, instance):
-        """
-        確認ダイアログを表示（はい/いいえ）
+            on_button (callable): ボタンのキーからボタンの on_press に指定する関数を返す
 
-        Args:
-            instance: 押されたボタンのインスタンス
+        Returns:
+            MDDialog: 作成したダイアログ
         """
-        if self.dialog:
-            self.dialog.dismiss()
-
-        self.dialog = MDDialog(
+        return MDDialog(
             title="確認",
             text="この操作を実行してもよろしいですか？",
             buttons=[
                 MDFlatButton(
                     text="キャンセル",
-                    on_press=self.cancel_action
+                    on_press=on_button("cancel")
                 ),
                 MDRaisedButton(
                     text="OK",
-                    on_press=self.confirm_action
+                    on_press=on_button("ok")
                 ),
             ],
         )
-        self.dialog.open()
-
-    def cancel_action(self, instance):
-        """
-        キャンセルボタンが押された
-
-        Args:
-            instance: 押されたボタンのインスタンス
-        """
-        self.dialog.dismiss()
-        self.result_label.text = "キャンセルされました"
 
-    def confirm_action(self, instance):
+    def create_custom_dialog(self, on_button):
         """
-        OKボタンが押された
+        カスタムコンテンツを含むダイアログを作成（DialogPool から1回だけ呼ばれる）
 
         Args:
-            instance: 押されたボタンのインスタンス
-        """
-        self.dialog.dismiss()
-        self.result_label.text = "操作が実行されました"
+            on_button (callable): ボタンのキーからボタンの on_press に指定する関数を返す
 
-    def show_custom_dialog(self, instance):
-        """
-        カスタムコンテンツを含むダイアログを表示
-
-        Args:
-            instance: 押されたボタンのインスタンス
+        Returns:
+            MDDialog: 作成したダイアログ
         """
-        if self.dialog:
-            self.dialog.dismiss()
-
         # カスタムコンテンツ（テキストフィールド）
         content = MDBoxLayout(
             orientation="vertical",
@@ -205,58 +243,235 @@ class DialogsApp(MDApp):
             height=100
         )
 
-        self.name_field = MDTextField(
+        name_field = MDTextField(
             hint_text="名前を入力",
             font_name="Roboto"
         )
-        content.add_widget(self.name_field)
+        content.add_widget(name_field)
 
-        self.dialog = MDDialog(
+        dialog = MDDialog(
             title="名前入力",
             type="custom",  # カスタムタイプ
             content_cls=content,
             buttons=[
                 MDFlatButton(
                     text="キャンセル",
-                    on_press=lambda x: self.dialog.dismiss()
+                    on_press=on_button("cancel")
                 ),
                 MDRaisedButton(
                     text="送信",
-                    on_press=self.submit_name
+                    on_press=on_button("submit")
                 ),
             ],
         )
-        self.dialog.open()
+        # 送信時に入力欄を取り出せるようにダイアログに持たせておく
+        dialog.name_field = name_field
+        # 使い回すダイアログに前回の入力が残らないように、新しく開くときは空にする。
+        # 優先度の高いダイアログで中断されて開き直すときは、中断前の入力を戻す
+        dialog.save_state = lambda: name_field.text
+        dialog.restore_state = lambda state: setattr(name_field, "text", state or "")
+        return dialog
+
+    def show_dialog(self, kind, priority=0, **kwargs):
+        """
+        ダイアログを開く要求を順番待ちに追加（表示中のダイアログが閉じたら開く）
 
-    def submit_name(self, instance):
+        Args:
+            kind (str): ダイアログの種類
+            priority (int): 優先度（大きいほど先に開く）
+            **kwargs: DialogPool.show() に渡すタイトル・本文・ボタンの処理
         """
-        名前を送信
+        self.dialog_queue.request(kind, priority=priority, **kwargs)
+
+    def show_alert_dialog(self, instance):
+        """
+        シンプルなアラートダイアログを表示
 
         Args:
             instance: 押されたボタンのインスタンス
         """
-        name = self.name_field.text
-        self.dialog.dismiss()
+        self.show_dialog(
+            "alert",
+            title="お知らせ",
+            text="これはシンプルなアラートダイアログです。",
+            ok=self.close_alert_dialog
+        )
+
+    def close_alert_dialog(self, dialog):
+        """
+        アラートダイアログのOKボタンが押された（ダイアログは閉じられている）
+
+        Args:
+            dialog: 閉じたダイアログ
+        """
+        self.result_label.text = "アラートダイアログが閉じられました"
+
+    def show_confirm_dialog(self, instance):
+        """
+        確認ダイアログを表示（はい/いいえ）
+
+        Args:
+            instance: 押されたボタンのインスタンス
+        """
+        self.show_dialog("confirm", cancel=self.cancel_action, ok=self.confirm_action)
+
+    def cancel_action(self, dialog):
+        """
+        キャンセルボタンが押された
+
+        Args:
+            dialog: 閉じたダイアログ
+        """
+        self.result_label.text = "キャンセルされました"
+
+    def confirm_action(self, dialog):
+        """
+        OKボタンが押された
+
+        Args:
+            dialog: 閉じたダイアログ
+        """
+        self.result_label.text = "操作が実行されました"
+
+    def show_custom_dialog(self, instance):
+        """
+        カスタムコンテンツを含むダイアログを表示
+
+        Args:
+            instance: 押されたボタンのインスタンス
+        """
+        self.show_dialog("custom", submit=self.submit_name)
+
+    def submit_name(self, dialog):
+        """
+        名前を送信
+
+        Args:
+            dialog: 閉じたダイアログ
+        """
+        name = dialog.name_field.text
 
         if name:
             self.result_label.text = f"こんにちは、{name}さん！"
         else:
             self.result_label.text = "名前が入力されませんでした"
 
+    def start_background_tasks(self, instance):
+        """
+        バックグラウンド処理を開始（結果はワーカースレッドからダイアログで知らせる）
+
+        Args:
+            instance: 押されたボタンのインスタンス
+        """
+        self.result_label.text = "バックグラウンド処理を実行中..."
+        for name, priority, seconds in BACKGROUND_TASKS:
+            self.executor.submit(self.run_background_task, name, priority, seconds)
+
+    def run_background_task(self, name, priority, seconds):
+        """
+        バックグラウンド処理（ワーカースレッドで実行）
+
+        終わったらダイアログを開く要求を追加します。
+        優先度の高い（エラーの）ダイアログは、表示中のお知らせを中断して先に開きます。
+
+        Args:
+            name (str): 処理の名前
+            priority (int): 結果のダイアログの優先度
+            seconds (float): 処理にかかる秒数
+        """
+        time.sleep(seconds)
+        if priority:
+            self.dialog_queue.request(
+                "alert", priority=priority, title="エラー", text=f"{name}に失敗しました"
+            )
+        else:
+            self.dialog_queue.request("alert", title="完了", text=f"{name}が完了しました")
+
+    def start_stress_test(self, instance):
+        """
+        ダイアログを開いて閉じるのを STRESS_CYCLES 回繰り返す
+
+        1フレームに STRESS_CYCLES_PER_FRAME 回ずつ、アニメーションなしで行います。
+        続けてアニメーションありで STRESS_ANIMATED_CYCLES 回行います
+        （閉じたらすぐに次を要求し、閉じるアニメーションの終わりを待って開く場合や、
+        STRESS_PREEMPT_EVERY 回ごとに優先度の高いダイアログで中断する場合も通る）。
+        アニメーションが終わったら、開始前と比べたウィジェット数・メモリの増加と、
+        ダイアログの数を表示します。
+
+        Args:
+            instance: 押されたボタンのインスタンス
+        """
+        gc.collect()
+        tracemalloc.start()
+        start_widgets = count_widgets(Window)
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_created = self.dialog_queue.debug_counts()["created"]
+        remaining = [STRESS_CYCLES]
+        remaining_animated = [STRESS_ANIMATED_CYCLES]
+
+        def run_cycles(dt):
+            for _ in range(min(STRESS_CYCLES_PER_FRAME, remaining[0])):
+                self.dialog_queue.request(
+                    "alert", title="お知らせ", text=f"残り{remaining[0]}回", animation=False
+                )
+                self.dialog_queue.process()
+                self.dialog_queue.dismiss_current(animation=False)
+                remaining[0] -= 1
+            if remaining[0]:
+                Clock.schedule_once(run_cycles, 0)
+                return
+            self.result_label.text = f"アニメーションありで{STRESS_ANIMATED_CYCLES}回繰り返しています..."
+            Clock.schedule_once(run_animated_cycles, 0)
+
+        def run_animated_cycles(dt):
+            counts = self.dialog_queue.debug_counts()
+            if self.dialog_queue.dialog is not None:
+                # 表示中のダイアログを閉じる（次は閉じるアニメーションが終わってから開く）
+                self.dialog_queue.dismiss_current()
+            elif counts["queued"] or counts["stacked"]:
+                pass
+            elif remaining_animated[0]:
+                self.dialog_queue.request(
+                    "alert", title="お知らせ", text=f"残り{remaining_animated[0]}回"
+                )
+                self.dialog_queue.process()
+                if remaining_animated[0] % STRESS_PREEMPT_EVERY == 0:
+                    self.dialog_queue.request("alert", priority=10, title="エラー", text="中断の確認")
+                    self.dialog_queue.process()
+                remaining_animated[0] -= 1
+            else:
+                Clock.schedule_once(show_result, STRESS_SETTLE_SECONDS)
+                return
+            Clock.schedule_once(run_animated_cycles, 0)
+
+        def show_result(dt):
+            gc.collect()
+            widgets = count_widgets(Window) - start_widgets
+            memory = tracemalloc.get_traced_memory()[0] - start_memory
+            tracemalloc.stop()
+            counts = self.dialog_queue.debug_counts()
+            preempted = STRESS_ANIMATED_CYCLES // STRESS_PREEMPT_EVERY
+            self.result_label.text = (
+                f"{STRESS_CYCLES:,}回 + アニメーションあり{STRESS_ANIMATED_CYCLES}回"
+                f"（うち中断{preempted}回）: ウィジェット {widgets:+d}、メモリ {memory / 1024:+.0f} KB\n"
+                f"作成 {counts['created']}（今回 {counts['created'] - start_created:+d}）、"
+                f"残っている {counts['alive']}、空き {counts['free']}"
+            )
+
+        self.result_label.text = f"開閉を{STRESS_CYCLES:,}回繰り返しています..."
+        Clock.schedule_once(run_cycles, 0)
+
+    def on_stop(self):
+        """アプリの終了時にワーカースレッドを終了する"""
+        self.executor.shutdown(wait=False)
+
 
 def main():
     """
     アプリケーションのエントリーポイント
     """
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     DialogsApp().run()
@@ -9,7 +9,9 @@
 - TwoLineListItem（2行リスト）
 - ThreeLineListItem（3行リスト）
 - リストアイテムクリックイベント
-- ScrollView対応
+- RecycleList（データ駆動のリスト、何万行でも見えている行だけを作成）
+- 末尾までスクロールしたら次のページを読み込む（data/ にJSON Lines等がある場合）
+- 店名・住所の検索（入力するたびに絞り込み、"らーめん" でも "ラーメン" が見つかる）
 
 実行方法:
     python practice/05_lists.py
@@ -18,10 +20,22 @@
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.list import MDList, OneLineListItem, TwoLineListItem, ThreeLineListItem
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.label import MDLabel
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivymd.uix.textfield import MDTextField
+
+import bootstrap
+from recycle_list import ROW_TYPES, RecycleList
+from restaurant_dataset import load_store
+from restaurant_source import PagedLoader, find_source
+from restaurants import CATEGORY_ICONS, RestaurantStore
+from search_index import SearchIndex, StoreIndexer
+
+
+# 次のページを読み込み始めるスクロール位置（0が末尾、1が先頭）
+LOAD_MORE_SCROLL_Y = 0.1
+
+# 検索結果として表示する最大件数
+SEARCH_LIMIT = 500
 
 
 class ListsApp(MDApp):
@@ -35,8 +49,8 @@ class ListsApp(MDApp):
         """
         UIを構築するメソッド
 
-        ScrollView内にMDListを配置し、
-        様々な種類のリストアイテムを追加します。
+        上部のMDListに様々な種類のリストアイテムを追加し、
+        下部の検索欄とRecycleListで飲食店の一覧を表示します。
 
         Returns:
             MDBoxLayout: ルートウィジェット
@@ -58,9 +72,6 @@ class ListsApp(MDApp):
         )
         main_layout.add_widget(self.result_label)
 
-        # スクロールビュー
-        scroll_view = MDScrollView()
-
         # MDList（リストコンテナ）
         list_widget = MDList()
 
@@ -99,29 +110,161 @@ class ListsApp(MDApp):
         )
         list_widget.add_widget(simple_item)
 
-        # 飲食店リストの例
-        # アイコンの代わりに絵文字を使用（KivyMD 1.2.0の制限回避）
-        restaurants = [
-            ("🍜 ラーメン大将", "東京都渋谷区1-2-3"),
-            ("☕ カフェモカ", "東京都渋谷区2-3-4"),
-            ("🍛 カレーハウス", "東京都渋谷区3-4-5"),
-            ("🍱 和食処 さくら", "東京都渋谷区4-5-6"),
-            ("🍝 イタリアン トマト", "東京都渋谷区5-6-7"),
-        ]
-
-        for name, address in restaurants:
-            item = TwoLineListItem(
-                text=name,
-                secondary_text=address,
-                on_press=lambda x, n=name: self.on_restaurant_press(n)
+        main_layout.add_widget(list_widget)
+
+        # 飲食店の検索欄（入力するたびに下のリストを絞り込む）
+        self.search_field = MDTextField(
+            hint_text="店名・住所で検索",
+            font_name="Roboto",
+            size_hint_x=0.9,
+            pos_hint={"center_x": 0.5}
+        )
+        self.search_field.bind(text=self.on_search_text)
+        main_layout.add_widget(self.search_field)
+
+        # 飲食店リストの例（RecycleList）
+        # data には行番号だけを入れ、表示する文字は format_restaurant() で作成する
+        # タップは行ごとの lambda ではなく on_restaurant_press() 1つで受け取る
+        self.restaurant_list = RecycleList(
+            formatter=self.format_restaurant,
+            on_row_press=self.on_restaurant_press
+        )
+        self.restaurant_list.bind(scroll_y=self.on_scroll)
+
+        # data/ に restaurants.jsonl / restaurants.sqlite3 があればページ単位で読み込む
+        # なければ data/restaurants.rstd をmmapで開くか、サンプルデータを使う
+        source = find_source()
+        if source is not None:
+            self.store = RestaurantStore()
+            self.loader = PagedLoader(
+                source, self.store, on_page=self.add_restaurant_items,
+                wants_more=self.needs_more_rows, on_error=self.on_load_error
             )
-            list_widget.add_widget(item)
+        else:
+            self.store = load_store()
+            self.loader = None
+
+        # 検索用インデックス（行は1フレームずつ少しずつ登録する）
+        self.search_index = SearchIndex.for_store(self.store)
+        self.indexer = StoreIndexer(
+            self.search_index, self.store, on_progress=self.on_index_progress
+        )
 
-        scroll_view.add_widget(list_widget)
-        main_layout.add_widget(scroll_view)
+        if self.loader is not None:
+            self.loader.load_next()
+        else:
+            self.add_restaurant_items(0, len(self.store))
+
+        main_layout.add_widget(self.restaurant_list)
 
         return main_layout
 
+    def add_restaurant_items(self, start, end):
+        """
+        飲食店の行をリストに追加するメソッド
+
+        ページの読み込みが終わったときにも呼ばれます。
+        検索中は、追加した行が登録されたときに検索結果を更新します。
+
+        Args:
+            start (int): 追加する最初の行番号
+            end (int): 追加する最後の行番号 + 1
+        """
+        self.indexer.extend(end)
+        if not self.search_field.text.strip():
+            self.restaurant_list.data.extend({"row": row} for row in range(start, end))
+
+    def on_search_text(self, instance, text):
+        """
+        検索欄の文字が変わったときの処理
+
+        Args:
+            instance (MDTextField): 検索欄
+            text (str): 入力された文字
+        """
+        if text.strip():
+            self.show_search_results()
+        else:
+            # 検索語がなければ読み込み済みの全件を表示
+            self.restaurant_list.data = [{"row": row} for row in range(len(self.store))]
+
+    def on_index_progress(self, start, end):
+        """
+        検索用インデックスに行が登録されたときの処理
+
+        検索中なら、新しく登録された行も含めて検索し直します。
+
+        Args:
+            start (int): 登録された最初の行番号
+            end (int): 登録された最後の行番号 + 1
+        """
+        if self.search_field.text.strip():
+            self.show_search_results()
+
+    def show_search_results(self):
+        """検索欄の文字で検索し、一致した飲食店をリストに表示するメソッド"""
+        rows = self.search_index.search(self.search_field.text, limit=SEARCH_LIMIT)
+        self.restaurant_list.data = [{"row": row} for row in rows]
+        if len(rows) >= SEARCH_LIMIT:
+            self.result_label.text = f"{SEARCH_LIMIT}件以上見つかりました"
+        else:
+            self.result_label.text = f"{len(rows)}件見つかりました"
+
+    def format_restaurant(self, data):
+        """
+        飲食店の行に表示する文字を作成するメソッド
+
+        Args:
+            data (dict): {"row": ストアの行番号}
+
+        Returns:
+            dict: text（絵文字 + 店名）と secondary_text（住所）
+        """
+        # アイコンの代わりにカテゴリの絵文字を使用（KivyMD 1.2.0の制限回避）
+        row = data["row"]
+        icon = CATEGORY_ICONS.get(self.store.category(row), "")
+        return {
+            "text": f"{icon} {self.store.name(row)}",
+            "secondary_text": self.store.address(row),
+        }
+
+    def on_scroll(self, scroll_view, scroll_y):
+        """
+        スクロールしたときの処理
+
+        末尾に近づいたら次のページを読み込みます。
+
+        Args:
+            scroll_view (RecycleList): スクロールしたリスト
+            scroll_y (float): スクロール位置（0が末尾、1が先頭）
+        """
+        if self.loader is not None and scroll_y <= LOAD_MORE_SCROLL_Y:
+            self.loader.load_next()
+
+    def needs_more_rows(self):
+        """
+        全件の表示中に、行がリストの高さに満たないかを返すメソッド
+
+        リストが埋まらないとスクロールが起きず、on_scroll() で次のページを読み込めないため、
+        ページの読み込み後にこのメソッドがTrueを返せば続けて読み込みます。
+
+        Returns:
+            bool: 次のページが必要ならTrue
+        """
+        if self.search_field.text.strip():
+            return False
+        rows_height = len(self.restaurant_list.data) * ROW_TYPES["two_line"][1]
+        return rows_height < self.restaurant_list.height
+
+    def on_load_error(self, error):
+        """
+        飲食店データの読み込みに失敗したときの処理（読み込みは終了している）
+
+        Args:
+            error (Exception): 発生した例外
+        """
+        self.result_label.text = f"飲食店データの読み込みに失敗しました（{len(self.store)}件まで表示）"
+
     def on_item_press(self, item_name):
         """
         リストアイテムがタップされたときの処理
@@ -131,15 +274,22 @@ class ListsApp(MDApp):
         """
         self.result_label.text = f"「{item_name}」がタップされました"
 
-    def on_restaurant_press(self, restaurant_name):
+    def on_restaurant_press(self, instance, index):
         """
-        飲食店リストアイテムがタップされたときの処理
+        飲食店リストの行がタップされたときの処理
 
         Args:
-            restaurant_name (str): タップされた飲食店の名前
+            instance (RecycleList): 飲食店リスト
+            index (int): タップされた行の data 内の位置
         """
+        restaurant_name = self.format_restaurant(instance.data[index])["text"]
         self.result_label.text = f"「{restaurant_name}」が選択されました"
 
+    def on_stop(self):
+        """アプリの終了時に、ページの読み込みのワーカースレッドを終了する"""
+        if self.loader is not None:
+            self.loader.close()
+
 
 # TwoLineIconListItemクラスを定義（カスタムクラス）
 class TwoLineIconListItem(TwoLineListItem):
@@ -155,15 +305,8 @@ def main():
     """
     アプリケーションのエントリーポイント
     """
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     ListsApp().run()
@@ -20,8 +20,8 @@ from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.toolbar import MDTopAppBar
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+
+import bootstrap
 
 
 class NavigationDrawerApp(MDApp):
@@ -66,13 +66,8 @@ class NavigationDrawerApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    Window.size = (360, 640)
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
     NavigationDrawerApp().run()
 
 
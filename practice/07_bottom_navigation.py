@@ -19,8 +19,8 @@ from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationIt
 from kivymd.uix.label import MDLabel
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDIconButton
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+
+import bootstrap
 
 
 class BottomNavigationApp(MDApp):
@@ -106,13 +106,8 @@ class BottomNavigationApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    Window.size = (360, 640)
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
     BottomNavigationApp().run()
 
 
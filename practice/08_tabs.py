@@ -17,8 +17,8 @@ from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.tab import MDTabs, MDTabsBase
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+
+import bootstrap
 
 
 class Tab(MDBoxLayout, MDTabsBase):
@@ -87,13 +87,8 @@ class TabsApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    Window.size = (360, 640)
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
     TabsApp().run()
 
 
@@ -8,6 +8,7 @@
 - MDTopAppBar（ツールバー）
 - タイトル表示
 - 左右アイコンボタンの配置
+- 検索アイコンで検索欄を開き、飲食店を検索（検索はワーカースレッドで実行）
 
 実行方法:
     python practice/10_toolbar.py
@@ -16,9 +17,18 @@
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
+from kivymd.uix.textfield import MDTextField
 from kivymd.uix.toolbar import MDTopAppBar
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivy.metrics import dp
+
+import bootstrap
+from recycle_list import RecycleList
+from restaurant_dataset import load_store
+from search_index import SearchWorker
+
+
+# 検索結果として表示する最大件数
+SEARCH_LIMIT = 500
 
 
 class ToolbarApp(MDApp):
@@ -42,6 +52,12 @@ class ToolbarApp(MDApp):
 
         # メインレイアウト
         layout = MDBoxLayout(orientation="vertical")
+        self.layout = layout
+
+        # 検索欄と検索結果（検索ボタンが押されたときに作成する）
+        self.search_field = None
+        self.search_results = None
+        self.search_worker = None
 
         # MDTopAppBar（ツールバー）
         # title: タイトル
@@ -73,23 +89,118 @@ class ToolbarApp(MDApp):
         self.result_label.text = "メニューボタンが押されました"
 
     def on_search_press(self):
-        """検索ボタンが押されたときの処理"""
-        self.result_label.text = "検索ボタンが押されました"
+        """
+        検索ボタンが押されたときの処理
+
+        初回は検索欄と検索結果のリストを作成し、
+        飲食店データの登録をワーカースレッドで始めます。
+        """
+        if self.search_field is None:
+            self.open_search()
+        self.search_field.focus = True
+
+    def open_search(self):
+        """検索欄と検索結果のリストを作成するメソッド"""
+        # data/restaurants.rstd があればmmapで開き、なければサンプルデータを使う
+        self.store = load_store()
+        # 検索はワーカースレッドで行い、結果は1フレームに1回だけ受け取る
+        self.search_worker = SearchWorker.from_store(
+            self.store, self.on_search_results, limit=SEARCH_LIMIT
+        )
+
+        # 検索欄（ツールバーのすぐ下に配置）
+        self.search_field = MDTextField(
+            hint_text="店名・住所で検索",
+            font_name="Roboto",
+            size_hint_x=0.9,
+            pos_hint={"center_x": 0.5}
+        )
+        self.search_field.bind(text=self.on_search_text)
+        self.layout.add_widget(self.search_field, index=len(self.layout.children) - 1)
+
+        # 結果ラベルは件数の表示に使い、残りの領域に検索結果を表示
+        self.result_label.size_hint_y = None
+        self.result_label.height = dp(48)
+        self.result_label.text = "店名や住所を入力してください"
+        self.search_results = RecycleList(
+            formatter=self.format_restaurant,
+            on_row_press=self.on_result_press
+        )
+        self.layout.add_widget(self.search_results)
+
+    def on_search_text(self, instance, text):
+        """
+        検索欄の文字が変わったときの処理
+
+        検索はワーカースレッドに任せるため、入力中も画面は止まりません。
+        前の検索が終わっていなければ、その検索は打ち切られます。
+
+        Args:
+            instance (MDTextField): 検索欄
+            text (str): 入力された文字
+        """
+        if text.strip():
+            self.search_worker.submit(text)
+        else:
+            self.search_worker.cancel()
+            self.search_results.data = []
+            self.result_label.text = "店名や住所を入力してください"
+
+    def on_search_results(self, query, rows):
+        """
+        検索結果を受け取ったときの処理（メインスレッドで呼ばれる）
+
+        Args:
+            query (str): 検索語
+            rows (list): 一致した行番号
+        """
+        self.search_results.data = [{"row": row} for row in rows]
+        if len(rows) >= SEARCH_LIMIT:
+            self.result_label.text = f"「{query}」: {SEARCH_LIMIT}件以上"
+        else:
+            self.result_label.text = f"「{query}」: {len(rows)}件"
+
+    def format_restaurant(self, data):
+        """
+        検索結果の行に表示する文字を作成するメソッド
+
+        Args:
+            data (dict): {"row": ストアの行番号}
+
+        Returns:
+            dict: text（店名）と secondary_text（住所）
+        """
+        row = data["row"]
+        return {
+            "text": self.store.name(row),
+            "secondary_text": self.store.address(row),
+        }
+
+    def on_result_press(self, instance, index):
+        """
+        検索結果の行がタップされたときの処理
+
+        Args:
+            instance (RecycleList): 検索結果のリスト
+            index (int): タップされた行の data 内の位置
+        """
+        restaurant_name = self.format_restaurant(instance.data[index])["text"]
+        self.result_label.text = f"「{restaurant_name}」が選択されました"
 
     def on_more_press(self):
         """その他ボタンが押されたときの処理"""
         self.result_label.text = "その他ボタンが押されました"
 
+    def on_stop(self):
+        """アプリ終了時に検索用のワーカースレッドを終了する"""
+        if self.search_worker is not None:
+            self.search_worker.close()
+
 
 def main():
     """アプリケーションのエントリーポイント"""
-    Window.size = (360, 640)
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
     ToolbarApp().run()
 
 
@@ -23,12 +23,27 @@ from kivymd.uix.bottomsheet import MDBottomSheet
 from kivymd.uix.bottomsheet import MDBottomSheetDragHandle
 from kivymd.uix.bottomsheet import MDBottomSheetDragHandleTitle
 from kivymd.uix.bottomsheet import MDBottomSheetDragHandleButton
-from kivymd.uix.list import MDList, OneLineListItem, TwoLineListItem
-from kivymd.uix.scrollview import MDScrollView
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
 from kivy.metrics import dp
 
+import bootstrap
+from recycle_list import RecycleList
+
+
+# モーダルシートのアクション（表示名, アイコン名）
+ACTIONS = [
+    ("共有", "share-variant"),
+    ("リンクをコピー", "link"),
+    ("お気に入りに追加", "star"),
+    ("削除", "delete"),
+]
+
+# スタンダードシートの情報
+INFO_ITEMS = [
+    "補助情報1: ここに詳細情報を表示",
+    "補助情報2: フィルター設定など",
+    "補助情報3: 追加オプション",
+]
+
 
 class BottomSheetApp(MDApp):
     """
@@ -170,27 +185,13 @@ class BottomSheetApp(MDApp):
         )
         content.add_widget(info_label)
 
-        # アクションリスト
-        scroll = MDScrollView(size_hint=(1, 1))
-        list_widget = MDList()
-
-        actions = [
-            ("共有", "share-variant"),
-            ("リンクをコピー", "link"),
-            ("お気に入りに追加", "star"),
-            ("削除", "delete"),
+        # アクションリスト（タップは on_action_press() 1つで受け取る）
+        action_list = RecycleList(on_row_press=self.on_action_press)
+        action_list.data = [
+            {"text": action_text, "secondary_text": "タップしてアクションを実行"}
+            for action_text, _icon in ACTIONS
         ]
-
-        for action_text, icon in actions:
-            item = TwoLineListItem(
-                text=action_text,
-                secondary_text="タップしてアクションを実行",
-                on_release=lambda x, txt=action_text: self.on_action_selected(txt)
-            )
-            list_widget.add_widget(item)
-
-        scroll.add_widget(list_widget)
-        content.add_widget(scroll)
+        content.add_widget(action_list)
 
         sheet.add_widget(content)
 
@@ -247,25 +248,10 @@ class BottomSheetApp(MDApp):
         )
         content.add_widget(info_label)
 
-        # 情報リスト
-        scroll = MDScrollView(size_hint=(1, 1))
-        list_widget = MDList()
-
-        info_items = [
-            "補助情報1: ここに詳細情報を表示",
-            "補助情報2: フィルター設定など",
-            "補助情報3: 追加オプション",
-        ]
-
-        for info_text in info_items:
-            item = OneLineListItem(
-                text=info_text,
-                on_release=lambda x, txt=info_text: self.on_info_selected(txt)
-            )
-            list_widget.add_widget(item)
-
-        scroll.add_widget(list_widget)
-        content.add_widget(scroll)
+        # 情報リスト（タップは on_info_press() 1つで受け取る）
+        info_list = RecycleList(row_type="one_line", on_row_press=self.on_info_press)
+        info_list.data = [{"text": info_text} for info_text in INFO_ITEMS]
+        content.add_widget(info_list)
 
         sheet.add_widget(content)
 
@@ -291,6 +277,26 @@ class BottomSheetApp(MDApp):
         self.result_label.text = "スタンダードボトムシートを開きました"
         self.standard_sheet.open()
 
+    def on_action_press(self, instance, index):
+        """
+        アクションリストの行がタップされた
+
+        Args:
+            instance (RecycleList): アクションリスト
+            index (int): タップされた行の番号
+        """
+        self.on_action_selected(ACTIONS[index][0])
+
+    def on_info_press(self, instance, index):
+        """
+        情報リストの行がタップされた
+
+        Args:
+            instance (RecycleList): 情報リスト
+            index (int): タップされた行の番号
+        """
+        self.on_info_selected(INFO_ITEMS[index])
+
     def on_action_selected(self, action_text):
         """
         モーダルシートのアクションが選択された
@@ -313,15 +319,8 @@ class BottomSheetApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     BottomSheetApp().run()
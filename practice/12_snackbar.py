@@ -9,23 +9,38 @@
 - アクション付きスナックバー
 - 位置とスタイルのカスタマイズ
 - 自動消去と手動消去
+- 通知の順番待ち（同じ通知は「×回数」にまとめ、エラーを優先し、スナックバーは使い回す）
 
 実行方法:
     python practice/12_snackbar.py
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
 from kivymd.uix.button import MDRaisedButton
-from kivymd.uix.snackbar import MDSnackbar, MDSnackbarText
-from kivymd.uix.snackbar import MDSnackbarSupportingText, MDSnackbarButtonContainer
-from kivymd.uix.snackbar import MDSnackbarCloseButton, MDSnackbarActionButton
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.metrics import dp
 
+import bootstrap
+from notification_queue import NotificationQueue
+
+
+# 通知の背景色と、エラーの優先度（表示中の通知より先に表示する）
+SUCCESS_COLOR = (0.2, 0.7, 0.3, 1)
+ERROR_COLOR = (0.8, 0.2, 0.2, 1)
+ERROR_PRIORITY = 10
+
+# バックグラウンドから送る通知の数、ワーカースレッドの数、1件ごとの間隔（秒）
+BURST_SIZE = 1000
+BURST_WORKERS = 4
+BURST_INTERVAL = 0.002
+
 
 class SnackbarApp(MDApp):
     """
@@ -36,8 +51,9 @@ class SnackbarApp(MDApp):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # 現在表示中のスナックバーを保持
-        self.current_snackbar = None
+        # 同じ本文の通知をまとめ、1つのスナックバーで優先度順に表示する順番待ち
+        self.notifications = NotificationQueue()
+        self.executor = ThreadPoolExecutor(max_workers=BURST_WORKERS)
 
     def build(self):
         """UIを構築するメソッド"""
@@ -129,6 +145,15 @@ class SnackbarApp(MDApp):
         )
         main_layout.add_widget(error_button)
 
+        # バックグラウンドから大量の通知を送るボタン（まとめて表示されるかの確認用）
+        burst_button = MDRaisedButton(
+            text=f"{BURST_SIZE:,}件の通知を送る",
+            pos_hint={"center_x": 0.5},
+            size_hint_x=0.8,
+            on_press=self.start_burst
+        )
+        main_layout.add_widget(burst_button)
+
         # 結果表示ラベル
         self.result_label = MDLabel(
             text="ボタンを押して通知を表示してください",
@@ -142,12 +167,6 @@ class SnackbarApp(MDApp):
 
         return screen
 
-    def close_current_snackbar(self):
-        """現在表示中のスナックバーを閉じる"""
-        if self.current_snackbar:
-            self.current_snackbar.dismiss()
-            self.current_snackbar = None
-
     def show_simple_snackbar(self, instance):
         """
         シンプルなスナックバーを表示
@@ -155,19 +174,7 @@ class SnackbarApp(MDApp):
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # シンプルなスナックバー
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="これはシンプルな通知です",
-            ),
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
-            duration=3,  # 3秒後に自動で消える
-        )
-        self.current_snackbar.open()
+        self.notifications.notify("これはシンプルな通知です", duration=3)
         self.result_label.text = "シンプルな通知を表示しました"
 
     def show_long_snackbar(self, instance):
@@ -177,22 +184,11 @@ class SnackbarApp(MDApp):
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # 長いメッセージのスナックバー
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="データの保存が完了しました",
-            ),
-            MDSnackbarSupportingText(
-                text="変更内容はすべて正常に保存されました。次回起動時に反映されます。",
-            ),
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
+        self.notifications.notify(
+            "データの保存が完了しました",
+            supporting_text="変更内容はすべて正常に保存されました。次回起動時に反映されます。",
             duration=4,
         )
-        self.current_snackbar.open()
         self.result_label.text = "長いメッセージの通知を表示しました"
 
     def show_action_snackbar(self, instance):
@@ -202,133 +198,140 @@ class SnackbarApp(MDApp):
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # アクションボタンのコンテナ
-        button_container = MDSnackbarButtonContainer()
-        action_btn = MDSnackbarActionButton(
-            text="元に戻す",
-            on_release=self.on_snackbar_action
-        )
-        button_container.add_widget(action_btn)
-
-        # アクション付きスナックバー
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="アイテムを削除しました",
-            ),
-            button_container,
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
+        self.notifications.notify(
+            "アイテムを削除しました",
             duration=5,
+            action_text="元に戻す",
+            on_action=self.on_snackbar_action,
         )
-        self.current_snackbar.open()
         self.result_label.text = "アクション付き通知を表示しました"
 
     def show_close_snackbar(self, instance):
         """
-        閉じるボタン付きスナックバーを表示
+        閉じるボタン付きスナックバーを表示（閉じるボタンはすべての通知にある）
 
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # 閉じるボタンのコンテナ
-        button_container = MDSnackbarButtonContainer()
-        close_btn = MDSnackbarCloseButton(
-            icon="close",
-            on_release=lambda x: self.current_snackbar.dismiss()
+        self.notifications.notify(
+            "この通知は手動で閉じることができます",
+            duration=0,  # 0 = 自動で消えない（順番待ちの通知が届いたら切り替わる）
         )
-        button_container.add_widget(close_btn)
-
-        # 閉じるボタン付きスナックバー
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="この通知は手動で閉じることができます",
-            ),
-            button_container,
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
-            duration=0,  # 0 = 自動で消えない
-        )
-        self.current_snackbar.open()
         self.result_label.text = "閉じるボタン付き通知を表示しました"
 
     def show_success_snackbar(self, instance):
         """
-        成功メッセージのスナックバーを表示
+        成功メッセージのスナックバーを表示（続けて押すと「×回数」にまとまる）
 
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # 成功メッセージ（緑色）
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="✓ 操作が正常に完了しました",
-            ),
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
+        self.notifications.notify(
+            "✓ 操作が正常に完了しました",
             duration=3,
-            md_bg_color=(0.2, 0.7, 0.3, 1),  # 緑色の背景
+            color=SUCCESS_COLOR,
         )
-        self.current_snackbar.open()
         self.result_label.text = "成功メッセージを表示しました"
 
     def show_error_snackbar(self, instance):
         """
-        エラーメッセージのスナックバーを表示
+        エラーメッセージのスナックバーを表示（表示中の通知より先に表示する）
 
         Args:
             instance: 押されたボタンのインスタンス
         """
-        self.close_current_snackbar()
-
-        # エラーメッセージ（赤色）
-        self.current_snackbar = MDSnackbar(
-            MDSnackbarText(
-                text="✗ エラーが発生しました",
-            ),
-            MDSnackbarSupportingText(
-                text="もう一度お試しください。",
-            ),
-            y=dp(24),
-            pos_hint={"center_x": 0.5},
-            size_hint_x=0.9,
+        self.notifications.notify(
+            "✗ エラーが発生しました",
+            priority=ERROR_PRIORITY,
+            supporting_text="もう一度お試しください。",
             duration=4,
-            md_bg_color=(0.8, 0.2, 0.2, 1),  # 赤色の背景
+            color=ERROR_COLOR,
         )
-        self.current_snackbar.open()
         self.result_label.text = "エラーメッセージを表示しました"
 
     def on_snackbar_action(self, instance):
         """
-        スナックバーのアクションボタンが押された
+        スナックバーのアクションボタンが押された（スナックバーは閉じられている）
 
         Args:
             instance: 押されたボタンのインスタンス
         """
         self.result_label.text = "「元に戻す」アクションが実行されました"
-        if self.current_snackbar:
-            self.current_snackbar.dismiss()
+
+    def start_burst(self, instance):
+        """
+        BURST_WORKERS 個のワーカースレッドから合計 BURST_SIZE 件の通知を送る
+
+        すべて送り終えたら、表示した通知の数とウィジェットを操作した回数を表示します。
+
+        Args:
+            instance: 押されたボタンのインスタンス
+        """
+        self.result_label.text = f"{BURST_SIZE:,}件の通知を送っています..."
+        start = self.notifications.debug_counts()
+        remaining = [BURST_WORKERS]
+        lock = threading.Lock()
+
+        def on_done(future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            # Clock.schedule_once はどのスレッドから呼んでもよい
+            Clock.schedule_once(lambda dt: self.show_burst_counts(start), 0)
+
+        per_worker = BURST_SIZE // BURST_WORKERS
+        for worker in range(BURST_WORKERS):
+            future = self.executor.submit(self.run_burst, worker, per_worker)
+            future.add_done_callback(on_done)
+
+    def run_burst(self, worker, count):
+        """
+        通知を続けて送る（ワーカースレッドで実行）
+
+        ほとんどは同じ本文の通知で、ときどきエラーが混ざります。
+
+        Args:
+            worker (int): ワーカーの番号
+            count (int): 送る通知の数
+        """
+        for index in range(count):
+            if index % 100 == 99:
+                self.notifications.notify(
+                    "✗ 同期に失敗しました",
+                    priority=ERROR_PRIORITY,
+                    color=ERROR_COLOR,
+                )
+            elif index % 2:
+                self.notifications.notify("保存しました")
+            else:
+                self.notifications.notify(f"ワーカー{worker + 1}: 同期しました")
+            time.sleep(BURST_INTERVAL)
+
+    def show_burst_counts(self, start):
+        """
+        バースト送信の前後の通知とウィジェットの操作の数を表示する
+
+        Args:
+            start (dict): 送信前の debug_counts()
+        """
+        counts = self.notifications.debug_counts()
+        diff = {key: counts[key] - start[key] for key in ("requested", "shown", "widget_ops")}
+        self.result_label.text = (
+            f"通知 {diff['requested']:,}件 → 表示 {diff['shown']}回、"
+            f"ウィジェットの操作 {diff['widget_ops']}回\n"
+            f"順番待ち {counts['queued']}、作成したスナックバー {counts['created']}"
+        )
+
+    def on_stop(self):
+        """アプリの終了時にワーカースレッドを終了する"""
+        self.executor.shutdown(wait=False)
 
 
 def main():
     """アプリケーションのエントリーポイント"""
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     SnackbarApp().run()
@@ -23,12 +23,12 @@ from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.spinner import MDSpinner
 from kivymd.uix.progressindicator import MDCircularProgressIndicator
 from kivymd.uix.progressbar import MDProgressBar
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
 from kivy.metrics import dp
 from kivy.clock import Clock
 from kivy.animation import Animation
 
+import bootstrap
+
 
 class SpinnerApp(MDApp):
     """
@@ -273,15 +273,8 @@ class SpinnerApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     SpinnerApp().run()
@@ -25,10 +25,10 @@ from kivymd.uix.checkbox import MDCheckbox
 from kivymd.uix.list import MDList, OneLineAvatarIconListItem, IconLeftWidget
 from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.divider import MDDivider
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
 from kivy.metrics import dp
 
+import bootstrap
+
 
 class SwitchCheckboxApp(MDApp):
     """
@@ -299,15 +299,8 @@ class SwitchCheckboxApp(MDApp):
 
 def main():
     """アプリケーションのエントリーポイント"""
-    # デスクトップ実行時のウィンドウサイズ設定
-    Window.size = (360, 640)
-
-    # 日本語フォントの登録
-    # デフォルトフォント（Roboto）を日本語フォントで上書き
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーションの起動
     SwitchCheckboxApp().run()
@@ -13,21 +13,56 @@
 - 削除可能なチップ（removable）
 - チェック可能なチップ（check）
 - チップのクリックイベント処理
+- カテゴリフィルターで10万件の飲食店リストを絞り込む（ビットセットで高速に集計）
+- チップに「ラーメン (1,204)」のように該当件数を表示（選択が変わるたびに差分で更新）
+- 評価・距離のスライダーで範囲を絞り込む（並べ替え済みの列を二分探索）
+- 10万件のデモデータは最初のフレームの描画後に作成する（最初の画面を待たせないため）
 
 実行方法:
     python practice/15_chip.py
 """
 
+import random
+
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.chip import MDChip, MDChipText
 from kivymd.uix.label import MDLabel
 from kivymd.uix.scrollview import MDScrollView
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivymd.uix.slider import MDSlider
+from kivy.clock import Clock
 from kivy.metrics import dp
 
+import bootstrap
+from facet_filter import FacetFilter
+from range_index import RangeFilter, RangeIndex
+from recycle_list import RecycleList
+from restaurants import format_distance, make_demo_store
+
+
+# カテゴリフィルターのカテゴリ（4つずつ2行に並べる）
+FILTER_CATEGORIES = ["和食", "洋食", "中華", "イタリアン", "カフェ", "居酒屋", "ラーメン", "スイーツ"]
+
+# チェック可能なチップ（「全て」以外は各行に付いている印として扱う）
+FLAG_OPTIONS = ["全て", "未読", "重要", "スター付き"]
+
+# 評価スライダー（この評価以上）の範囲
+RATING_SLIDER_RANGE = (3.0, 5.0)
+
+# 距離スライダー（この距離以内、メートル）の範囲と刻み
+DISTANCE_SLIDER_RANGE = (100, 5000)
+DISTANCE_SLIDER_STEP = 100
+
+# 絞り込み用に作成するデモデータの件数
+DEMO_RESTAURANT_COUNT = 100000
+
+# 絞り込んだ飲食店リストに一度に追加する件数
+FILTER_PAGE_SIZE = 50
+
+# 次の件数を追加し始めるスクロール位置（0が末尾、1が先頭）
+LOAD_MORE_SCROLL_Y = 0.1
+
 
 class ChipApp(MDApp):
     """
@@ -49,6 +84,11 @@ class ChipApp(MDApp):
         self.theme_cls.accent_palette = "Amber"
         self.theme_cls.theme_style = "Light"
 
+        # 絞り込み用のデータ（最初のフレームの描画後に load_restaurants() で作成する）
+        self.store = None
+        self.facets = None
+        self.chip_texts = {}  # (ファセット名, 値) → 件数を表示するチップの MDChipText
+
         # メインスクリーン
         screen = MDScreen()
 
@@ -88,11 +128,20 @@ class ChipApp(MDApp):
 
         # セクション4: チェック可能なチップ（選択型）
         main_layout.add_widget(self.create_section_label("4. チェック可能なチップ"))
-        main_layout.add_widget(self.create_checkable_chips())
+        flag_chips = self.create_checkable_chips()
+        main_layout.add_widget(flag_chips)
 
         # セクション5: 実用例（カテゴリフィルター）
         main_layout.add_widget(self.create_section_label("5. カテゴリフィルター例"))
-        main_layout.add_widget(self.create_category_filter())
+        category_filter = self.create_category_filter()
+        filtered_list = self.create_filtered_list()
+        main_layout.add_widget(category_filter)
+        main_layout.add_widget(filtered_list)
+
+        # 絞り込みに使うチップとスライダーは、データを作成するまで操作できないようにする
+        self.filter_layouts = [flag_chips, category_filter, filtered_list]
+        for layout in self.filter_layouts:
+            layout.disabled = True
 
         # ステータス表示用ラベル
         self.status_label = MDLabel(
@@ -109,6 +158,33 @@ class ChipApp(MDApp):
 
         return screen
 
+    def on_start(self):
+        """
+        アプリの開始時の処理
+
+        最初のフレームが描画された後に、絞り込み用のデータを作成します。
+        """
+        # 1回目のtickは最初の描画の前に実行されるため、もう1フレーム待つ
+        Clock.schedule_once(lambda dt: Clock.schedule_once(self.load_restaurants, 0), 0)
+
+    def load_restaurants(self, dt):
+        """
+        絞り込み用のデータを作成し、チップとリストを使えるようにするメソッド
+
+        カテゴリや印（未読・重要など）ごとのビットセットを作成しておき、
+        チップの選択で絞り込みます。
+
+        Args:
+            dt (float): 前回のフレームからの経過時間
+        """
+        self.store = make_demo_store(DEMO_RESTAURANT_COUNT, categories=FILTER_CATEGORIES)
+        self.facets = FacetFilter.from_store(self.store)
+        self.create_demo_flags()
+        self.create_range_filters()
+        self.show_filtered_rows()
+        for layout in self.filter_layouts:
+            layout.disabled = False
+
     def create_section_label(self, text):
         """
         セクションラベルを作成
@@ -247,13 +323,16 @@ class ChipApp(MDApp):
         )
 
         # チェック可能なチップ（選択型）
-        options = ["全て", "未読", "重要", "スター付き"]
+        # 文字には選んだ場合の件数も表示する
+        options = FLAG_OPTIONS
 
         for option in options:
+            chip_text = MDChipText(
+                text=option,
+            )
+            self.chip_texts[("flags", option)] = chip_text
             chip = MDChip(
-                MDChipText(
-                    text=option,
-                ),
+                chip_text,
                 type="filter",  # filterタイプでチェックマーク表示
                 pos_hint={'center_y': 0.5}
             )
@@ -284,12 +363,14 @@ class ChipApp(MDApp):
             height=dp(40)
         )
 
-        categories1 = ["和食", "洋食", "中華", "イタリアン"]
+        categories1 = FILTER_CATEGORIES[:4]
         for category in categories1:
+            chip_text = MDChipText(
+                text=category,
+            )
+            self.chip_texts[("category", category)] = chip_text
             chip = MDChip(
-                MDChipText(
-                    text=category,
-                ),
+                chip_text,
                 icon_left="silverware-fork-knife",
                 type="filter",
                 pos_hint={'center_y': 0.5}
@@ -305,12 +386,14 @@ class ChipApp(MDApp):
             height=dp(40)
         )
 
-        categories2 = ["カフェ", "居酒屋", "ラーメン", "スイーツ"]
+        categories2 = FILTER_CATEGORIES[4:]
         for category in categories2:
+            chip_text = MDChipText(
+                text=category,
+            )
+            self.chip_texts[("category", category)] = chip_text
             chip = MDChip(
-                MDChipText(
-                    text=category,
-                ),
+                chip_text,
                 icon_left="coffee",
                 type="filter",
                 pos_hint={'center_y': 0.5}
@@ -323,6 +406,212 @@ class ChipApp(MDApp):
 
         return layout
 
+    def create_demo_flags(self):
+        """
+        デモ用に、各行に「未読」「重要」「スター付き」の印をランダムに付ける
+
+        乱数のビット列をそのままビットセットとして使います
+        （未読は約1/2、重要は約1/4、スター付きは約1/8の行に付く）。
+        「全て」はすべての行に付いている印として扱います。
+        印どうしは AND で組み合わせます（例: 未読かつ重要）。
+        """
+        rng = random.Random(0)
+        size = len(self.store)
+        unread = rng.getrandbits(size)
+        important = rng.getrandbits(size) & rng.getrandbits(size)
+        starred = rng.getrandbits(size) & rng.getrandbits(size) & rng.getrandbits(size)
+        self.facets.add_facet("flags", mode="and")
+        self.facets.set_bitset("flags", "全て", self.facets.all_bits)
+        self.facets.set_bitset("flags", "未読", unread)
+        self.facets.set_bitset("flags", "重要", important)
+        self.facets.set_bitset("flags", "スター付き", starred)
+
+    def create_range_filters(self):
+        """
+        評価と距離の範囲の条件を作成する
+
+        列の値で並べ替えた行番号を1回だけ作成しておき、
+        スライダーを動かしたときは二分探索で範囲の端を求めます。
+        """
+        size = len(self.store)
+        ratings = RangeIndex([self.store.rating(row) for row in range(size)])
+        distances = RangeIndex(self.store.distances)
+        self.facets.add_range("rating", RangeFilter(ratings))
+        self.facets.add_range("distance", RangeFilter(distances))
+
+    def update_chip_counts(self):
+        """
+        チップの文字を「値 (件数)」に更新する
+
+        件数は FacetFilter が選択の変更時に差分で更新しているため、
+        ここでは表示するだけです。
+        """
+        for (facet, value), chip_text in self.chip_texts.items():
+            count = self.facets.counts[facet].get(value, 0)
+            chip_text.text = f"{value} ({count:,})"
+
+    def create_filtered_list(self):
+        """
+        カテゴリフィルターで絞り込んだ飲食店リストを作成
+
+        Returns:
+            MDBoxLayout: 件数ラベルとリストを含むレイアウト
+        """
+        layout = MDBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            height=dp(460)
+        )
+
+        # 評価の下限のスライダー
+        self.rating_label = MDLabel(
+            text="評価: 指定なし",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        rating_slider = MDSlider(
+            min=RATING_SLIDER_RANGE[0],
+            max=RATING_SLIDER_RANGE[1],
+            value=RATING_SLIDER_RANGE[0],
+            step=0.1,
+            size_hint_y=None,
+            height=dp(30)
+        )
+        rating_slider.bind(value=self.on_rating_slider)
+
+        # 距離の上限のスライダー
+        self.distance_label = MDLabel(
+            text="距離: 指定なし",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        distance_slider = MDSlider(
+            min=DISTANCE_SLIDER_RANGE[0],
+            max=DISTANCE_SLIDER_RANGE[1],
+            value=DISTANCE_SLIDER_RANGE[1],
+            step=DISTANCE_SLIDER_STEP,
+            size_hint_y=None,
+            height=dp(30)
+        )
+        distance_slider.bind(value=self.on_distance_slider)
+
+        # 該当件数のラベル
+        self.filter_count_label = MDLabel(
+            text="読み込み中…",
+            size_hint_y=None,
+            height=dp(40),
+            theme_text_color="Secondary"
+        )
+
+        # 該当する飲食店のリスト（表示する分だけビットセットから行番号を取り出す）
+        self.filtered_list = RecycleList(
+            formatter=self.format_restaurant,
+            on_row_press=self.on_restaurant_press
+        )
+        self.filtered_list.bind(scroll_y=self.on_filtered_list_scroll)
+
+        layout.add_widget(self.rating_label)
+        layout.add_widget(rating_slider)
+        layout.add_widget(self.distance_label)
+        layout.add_widget(distance_slider)
+        layout.add_widget(self.filter_count_label)
+        layout.add_widget(self.filtered_list)
+
+        return layout
+
+    def show_filtered_rows(self):
+        """
+        選択中のカテゴリで絞り込み、件数と先頭の FILTER_PAGE_SIZE 件を表示する
+
+        件数はビットを数えるだけ、行番号は表示する分だけ取り出すため、
+        10万件でも1フレームの中で終わります。
+        """
+        self.matching_bits = self.facets.matching_bits()
+        count = self.facets.count(self.matching_bits)
+        self.filter_count_label.text = f"{count:,}件 / {len(self.store):,}件"
+        self.update_chip_counts()
+        rows = self.facets.rows(self.matching_bits, 0, FILTER_PAGE_SIZE)
+        self.filtered_list.data = [{"row": row} for row in rows]
+        self.filtered_list.scroll_y = 1
+
+    def on_filtered_list_scroll(self, filtered_list, scroll_y):
+        """
+        絞り込んだ飲食店リストをスクロールしたときの処理
+
+        末尾に近づいたら、最後に表示した行より後ろの行を追加します。
+
+        Args:
+            filtered_list (RecycleList): 飲食店リスト
+            scroll_y (float): スクロール位置（0が末尾、1が先頭）
+        """
+        if scroll_y > LOAD_MORE_SCROLL_Y or not filtered_list.data:
+            return
+        start_row = filtered_list.data[-1]["row"] + 1
+        rows = self.facets.rows(self.matching_bits, start_row, FILTER_PAGE_SIZE)
+        filtered_list.data.extend({"row": row} for row in rows)
+
+    def format_restaurant(self, data):
+        """
+        飲食店の行に表示する文字を作成するメソッド
+
+        Args:
+            data (dict): {"row": ストアの行番号}
+
+        Returns:
+            dict: text（店名）と secondary_text（カテゴリ・評価・距離）
+        """
+        row = data["row"]
+        store = self.store
+        return {
+            "text": store.name(row),
+            "secondary_text": f"{store.category(row)} • ★ {store.rating(row)} • {store.distance_text(row)}",
+        }
+
+    def on_rating_slider(self, slider, value):
+        """
+        評価スライダーを動かしたときの処理（この評価以上に絞り込む）
+
+        Args:
+            slider (MDSlider): 評価スライダー
+            value (float): スライダーの値
+        """
+        low = round(value, 1)
+        if low <= RATING_SLIDER_RANGE[0]:
+            self.rating_label.text = "評価: 指定なし"
+            self.facets.set_range("rating", None, None)
+        else:
+            self.rating_label.text = f"評価: ★ {low} 以上"
+            self.facets.set_range("rating", low, None)
+        self.show_filtered_rows()
+
+    def on_distance_slider(self, slider, value):
+        """
+        距離スライダーを動かしたときの処理（この距離以内に絞り込む）
+
+        Args:
+            slider (MDSlider): 距離スライダー
+            value (float): スライダーの値（メートル）
+        """
+        high = int(value)
+        if high >= DISTANCE_SLIDER_RANGE[1]:
+            self.distance_label.text = "距離: 指定なし"
+            self.facets.set_range("distance", None, None)
+        else:
+            self.distance_label.text = f"距離: {format_distance(high)} 以内"
+            self.facets.set_range("distance", None, high)
+        self.show_filtered_rows()
+
+    def on_restaurant_press(self, instance, index):
+        """
+        飲食店リストの行がタップされたときの処理
+
+        Args:
+            instance (RecycleList): 飲食店リスト
+            index (int): タップされた行の data 内の位置
+        """
+        restaurant_name = self.format_restaurant(instance.data[index])["text"]
+        self.status_label.text = f"「{restaurant_name}」が選択されました"
+
     def on_chip_click(self, chip_text):
         """
         チップクリック時のイベントハンドラー
@@ -357,6 +646,10 @@ class ChipApp(MDApp):
         state = "選択" if chip_instance.active else "解除"
         self.status_label.text = f"「{chip_text}」が{state}されました"
 
+        # 印のビットセットを AND で組み合わせてリストを絞り込む
+        self.facets.select("flags", chip_text, chip_instance.active)
+        self.show_filtered_rows()
+
     def on_category_select(self, chip_instance, category):
         """
         カテゴリフィルター選択時のイベントハンドラー
@@ -368,19 +661,17 @@ class ChipApp(MDApp):
         state = "選択" if chip_instance.active else "解除"
         self.status_label.text = f"カテゴリ「{category}」が{state}されました"
 
+        # 選択中のカテゴリのビットセットを OR で組み合わせてリストを絞り込む
+        self.facets.select("category", category, chip_instance.active)
+        self.show_filtered_rows()
+
 
 def main():
     """
     アプリケーションのエントリーポイント
     """
-    # ウィンドウサイズ設定（スマートフォン縦画面）
-    Window.size = (360, 640)
-
-    # 日本語フォント登録
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーション実行
     ChipApp().run()
@@ -13,11 +13,19 @@
 - メニューアイテムの選択処理
 - ボタンからメニューを開く
 - 複数のメニュー（異なる用途）
+- ソートメニューで飲食店リストを並べ替え（上位の件数だけ先に選んで表示）
+- 飲食店リストは最初のフレームの描画後に読み込む（デモデータの作成で最初の画面を待たせないため）
+- おすすめ順（評価・距離・カテゴリの好みのスコア順、店をタップするとそのカテゴリを優先）
+- 数千件の項目を持つメニュー（見えている行だけを作成、入力した文字の項目まで移動）
+- メニューは最初に開くときに作成して使い回す（最初の画面の表示を速くするため）。
+  最初のフレームの描画後は、空いているフレームで1つずつ先に作成しておく
 
 実行方法:
     python practice/16_menu.py
 """
 
+import os
+
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -25,10 +33,37 @@ from kivymd.uix.button import MDRaisedButton, MDIconButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.card import MDCard
-from kivy.core.text import LabelBase
-from kivy.core.window import Window
+from kivymd.uix.scrollview import MDScrollView
+from kivy.clock import Clock
 from kivy.metrics import dp
 
+import bootstrap
+from recycle_list import RecycleList
+from restaurant_dataset import DATASET_PATH, load_store
+from restaurants import make_demo_store
+from scoring import RecommendationScorer
+from sort_engine import NAME_SORT, SortEngine
+from virtual_menu import VirtualMenu
+
+
+# 並べ替えた飲食店リストに一度に追加する件数
+SORT_PAGE_SIZE = 50
+
+# data/restaurants.rstd がない場合に作成するデモデータの件数
+DEMO_RESTAURANT_COUNT = 10000
+
+# 次の件数を追加し始めるスクロール位置（0が末尾、1が先頭）
+LOAD_MORE_SCROLL_Y = 0.1
+
+# 店をタップしたときに、そのカテゴリの好みに足す値（最大1.0）
+PREFERENCE_STEP = 0.5
+
+# 大きなメニューに表示する店の数
+LARGE_MENU_SIZE = 5000
+
+# 最初のフレームの描画後に、開かれる前のメニューを先に作成しておくか
+PREBUILD_MENUS = True
+
 
 class MenuApp(MDApp):
     """
@@ -44,6 +79,9 @@ class MenuApp(MDApp):
         self.menu_icons = None
         self.menu_sort = None
         self.menu_context = None
+        self.menu_large = None
+        self.sort_type = "新着順"
+        self.store = None
 
     def build(self):
         """
@@ -60,12 +98,17 @@ class MenuApp(MDApp):
         # メインスクリーン
         screen = MDScreen()
 
+        # スクロール可能なレイアウト（セクションを全部並べると画面の高さを超えるため）
+        scroll = MDScrollView()
+
         # メインレイアウト（縦方向）
         main_layout = MDBoxLayout(
             orientation='vertical',
             padding=dp(20),
-            spacing=dp(20)
+            spacing=dp(20),
+            size_hint_y=None
         )
+        main_layout.bind(minimum_height=main_layout.setter('height'))
 
         # タイトル
         title = MDLabel(
@@ -111,17 +154,39 @@ class MenuApp(MDApp):
         )
         self.sort_button = MDRaisedButton(
             text="新着順",
-            size_hint_x=0.7
+            size_hint_x=0.7,
+            disabled=True  # 飲食店リストを読み込むまでは選べない
         )
         self.sort_button.bind(on_release=self.open_sort_menu)
         sort_layout.add_widget(sort_label)
         sort_layout.add_widget(self.sort_button)
         main_layout.add_widget(sort_layout)
 
+        # 並べ替える飲食店リスト（中身は最初のフレームの描画後に load_restaurants() で読み込む）
+        self.sorted_list = RecycleList(
+            formatter=self.format_restaurant,
+            on_row_press=self.on_restaurant_press,
+            size_hint_y=None,
+            height=dp(300)
+        )
+        self.sorted_list.bind(scroll_y=self.on_sorted_list_scroll)
+        main_layout.add_widget(self.sorted_list)
+
         # セクション4: コンテキストメニュー（カード右上の...ボタン）
         main_layout.add_widget(self.create_section_label("4. コンテキストメニュー"))
         main_layout.add_widget(self.create_card_with_menu())
 
+        # セクション5: 大きなメニュー（店名順に並べた数千件の店）
+        main_layout.add_widget(self.create_section_label("5. 大きなメニュー"))
+        self.large_button = MDRaisedButton(
+            text="店を選択（読み込み中）",
+            pos_hint={'center_x': 0.5},
+            size_hint_x=0.8,
+            disabled=True  # 飲食店リストを読み込むまでは選べない
+        )
+        self.large_button.bind(on_release=self.open_large_menu)
+        main_layout.add_widget(self.large_button)
+
         # ステータス表示用ラベル
         self.status_label = MDLabel(
             text="メニューボタンをタップしてください",
@@ -132,13 +197,67 @@ class MenuApp(MDApp):
         )
         main_layout.add_widget(self.status_label)
 
-        screen.add_widget(main_layout)
-
-        # メニューの初期化
-        self.create_menus()
+        scroll.add_widget(main_layout)
+        screen.add_widget(scroll)
 
+        # メニューは最初に開くときに作成する（create_*_menu()）
         return screen
 
+    def on_start(self):
+        """
+        アプリの開始時の処理
+
+        最初のフレームが描画された後に、飲食店リストを読み込みます。
+        """
+        # 1回目のtickは最初の描画の前に実行されるため、もう1フレーム待つ
+        Clock.schedule_once(lambda dt: Clock.schedule_once(self.load_restaurants, 0), 0)
+
+    def load_restaurants(self, dt):
+        """
+        飲食店リストを読み込み、並べ替えの準備をするメソッド
+
+        data/restaurants.rstd があればmmapで開き、なければデモデータを作成します。
+        デモデータの作成には時間がかかるため、最初のフレームの描画後に行います。
+        読み込んだ後は、メニューの事前作成を始めます。
+
+        Args:
+            dt (float): 前回のフレームからの経過時間
+        """
+        if os.path.exists(DATASET_PATH):
+            self.store = load_store()
+        else:
+            self.store = make_demo_store(DEMO_RESTAURANT_COUNT)
+        self.sort_engine = SortEngine(self.store)
+        self.scorer = RecommendationScorer(self.store)
+        self.sort_engine.add_scorer("おすすめ順", self.scorer)
+        self.show_sorted_rows()
+        self.sort_button.disabled = False
+        self.large_button.text = f"店を選択（{min(LARGE_MENU_SIZE, len(self.store)):,}件）"
+        self.large_button.disabled = False
+        if PREBUILD_MENUS:
+            Clock.schedule_once(self.prebuild_menus, 0)
+
+    def prebuild_menus(self, dt):
+        """
+        まだ作成していないメニューを1つ作成し、残りがあれば次のフレームに回すメソッド
+
+        1フレームに1つずつ作成するので、スクロールなどの操作が止まりません。
+
+        Args:
+            dt (float): 前回のフレームからの経過時間
+        """
+        for menu, create in (
+            (self.menu_simple, self.create_simple_menu),
+            (self.menu_icons, self.create_icon_menu),
+            (self.menu_sort, self.create_sort_menu),
+            (self.menu_context, self.create_context_menu),
+            (self.menu_large, self.create_large_menu),
+        ):
+            if menu is None:
+                create()
+                Clock.schedule_once(self.prebuild_menus, 0)
+                return
+
     def create_section_label(self, text):
         """
         セクションラベルを作成
@@ -205,11 +324,13 @@ class MenuApp(MDApp):
 
         return card
 
-    def create_menus(self):
+    def create_simple_menu(self):
         """
-        各種メニューを作成
+        シンプルなメニュー（言語選択）を作成
+
+        Returns:
+            MDDropdownMenu: 作成したメニュー
         """
-        # 1. シンプルなメニュー（言語選択）
         menu_items_simple = [
             {
                 "text": "日本語",
@@ -233,8 +354,15 @@ class MenuApp(MDApp):
             items=menu_items_simple,
             width_mult=4
         )
+        return self.menu_simple
+
+    def create_icon_menu(self):
+        """
+        アイコン付きメニューを作成
 
-        # 2. アイコン付きメニュー
+        Returns:
+            MDDropdownMenu: 作成したメニュー
+        """
         menu_items_icons = [
             {
                 "text": "共有",
@@ -267,33 +395,36 @@ class MenuApp(MDApp):
             items=menu_items_icons,
             width_mult=4
         )
+        return self.menu_icons
+
+    def create_sort_menu(self):
+        """
+        ソートメニュー（新着順・古い順・人気順・評価順・店名順・おすすめ順）を作成
 
-        # 3. ソートメニュー
+        Returns:
+            MDDropdownMenu: 作成したメニュー
+        """
         menu_items_sort = [
             {
-                "text": "新着順",
-                "on_release": lambda: self.sort_callback("新着順")
-            },
-            {
-                "text": "古い順",
-                "on_release": lambda: self.sort_callback("古い順")
-            },
-            {
-                "text": "人気順",
-                "on_release": lambda: self.sort_callback("人気順")
-            },
-            {
-                "text": "評価順",
-                "on_release": lambda: self.sort_callback("評価順")
+                "text": sort_type,
+                "on_release": lambda sort_type=sort_type: self.sort_callback(sort_type)
             }
+            for sort_type in self.sort_engine.sort_types
         ]
         self.menu_sort = MDDropdownMenu(
             caller=self.sort_button,
             items=menu_items_sort,
             width_mult=3
         )
+        return self.menu_sort
+
+    def create_context_menu(self):
+        """
+        コンテキストメニューを作成
 
-        # 4. コンテキストメニュー
+        Returns:
+            MDDropdownMenu: 作成したメニュー
+        """
         menu_items_context = [
             {
                 "text": "編集",
@@ -321,43 +452,90 @@ class MenuApp(MDApp):
             items=menu_items_context,
             width_mult=3
         )
+        return self.menu_context
+
+    def create_large_menu(self):
+        """
+        大きなメニュー（店名順に並べた LARGE_MENU_SIZE 件の店）を作成
+
+        Returns:
+            VirtualMenu: 作成したメニュー
+        """
+        self.large_menu_rows = self.sort_engine.rows(NAME_SORT, 0, LARGE_MENU_SIZE)
+        self.menu_large = VirtualMenu(
+            items=[self.store.name(row) for row in self.large_menu_rows],
+            hint_text="店名を入力して移動",
+            on_select=self.large_menu_callback
+        )
+        return self.menu_large
 
     def open_simple_menu(self, button):
         """
-        シンプルなメニューを開く
+        シンプルなメニューを開く（初めて開くときに作成する）
 
         Args:
             button: ボタンインスタンス
         """
+        if self.menu_simple is None:
+            self.create_simple_menu()
         self.menu_simple.open()
 
     def open_icon_menu(self, button):
         """
-        アイコン付きメニューを開く
+        アイコン付きメニューを開く（初めて開くときに作成する）
 
         Args:
             button: ボタンインスタンス
         """
+        if self.menu_icons is None:
+            self.create_icon_menu()
         self.menu_icons.open()
 
     def open_sort_menu(self, button):
         """
-        ソートメニューを開く
+        ソートメニューを開く（初めて開くときに作成する）
 
         Args:
             button: ボタンインスタンス
         """
+        if self.menu_sort is None:
+            self.create_sort_menu()
         self.menu_sort.open()
 
     def open_context_menu(self, button):
         """
-        コンテキストメニューを開く
+        コンテキストメニューを開く（初めて開くときに作成する）
 
         Args:
             button: ボタンインスタンス
         """
+        if self.menu_context is None:
+            self.create_context_menu()
         self.menu_context.open()
 
+    def open_large_menu(self, button):
+        """
+        大きなメニューを開く（初めて開くときに作成する）
+
+        Args:
+            button: ボタンインスタンス
+        """
+        if self.menu_large is None:
+            self.create_large_menu()
+        self.menu_large.open()
+
+    def large_menu_callback(self, menu_instance, index, text):
+        """
+        大きなメニューで店が選ばれたときのコールバック
+
+        Args:
+            menu_instance (VirtualMenu): メニューインスタンス
+            index (int): 選ばれた項目の位置
+            text (str): 選ばれた店名
+        """
+        row = self.large_menu_rows[index]
+        self.status_label.text = f"「{text}」が選択されました（{self.store.category(row)}）"
+
     def menu_callback(self, item_text, menu_instance):
         """
         メニューアイテム選択時のコールバック
@@ -379,20 +557,80 @@ class MenuApp(MDApp):
         self.sort_button.text = sort_type
         self.status_label.text = f"並び替え: {sort_type}"
         self.menu_sort.dismiss()
+        self.sort_type = sort_type
+        self.show_sorted_rows()
+
+    def show_sorted_rows(self):
+        """
+        選択中の並べ替えで、先頭の SORT_PAGE_SIZE 件をリストに表示するメソッド
+
+        全件は並べ替えず、上位の件数だけを選んで表示します。
+        続きはスクロールしたときに追加します。
+        """
+        rows = self.sort_engine.rows(self.sort_type, 0, SORT_PAGE_SIZE)
+        self.sorted_list.data = [{"row": row} for row in rows]
+        self.sorted_list.scroll_y = 1
+
+    def on_sorted_list_scroll(self, sorted_list, scroll_y):
+        """
+        飲食店リストをスクロールしたときの処理
+
+        末尾に近づいたら、並べ替えた結果の続きを追加します。
+
+        Args:
+            sorted_list (RecycleList): 飲食店リスト
+            scroll_y (float): スクロール位置（0が末尾、1が先頭）
+        """
+        start = len(sorted_list.data)
+        if scroll_y > LOAD_MORE_SCROLL_Y or self.store is None or start >= len(self.store):
+            return
+        rows = self.sort_engine.rows(self.sort_type, start, start + SORT_PAGE_SIZE)
+        sorted_list.data.extend({"row": row} for row in rows)
+
+    def format_restaurant(self, data):
+        """
+        飲食店の行に表示する文字を作成するメソッド
+
+        Args:
+            data (dict): {"row": ストアの行番号}
+
+        Returns:
+            dict: text（店名）と secondary_text（評価・距離）
+        """
+        row = data["row"]
+        return {
+            "text": self.store.name(row),
+            "secondary_text": f"★ {self.store.rating(row)} • {self.store.distance_text(row)}",
+        }
+
+    def on_restaurant_press(self, instance, index):
+        """
+        飲食店リストの行がタップされたときの処理
+
+        Args:
+            instance (RecycleList): 飲食店リスト
+            index (int): タップされた行の data 内の位置
+        """
+        row = instance.data[index]["row"]
+        category = self.store.category(row)
+        self.status_label.text = (
+            f"「{self.store.name(row)}」が選択されました（おすすめで{category}を優先）"
+        )
+
+        # タップした店のカテゴリを好みとして、おすすめ順のスコアを計算し直す
+        preferences = dict(self.scorer.preferences)
+        preferences[category] = min(1.0, preferences.get(category, 0.0) + PREFERENCE_STEP)
+        self.scorer.set_preferences(preferences)
+        if self.sort_type == "おすすめ順":
+            self.show_sorted_rows()
 
 
 def main():
     """
     アプリケーションのエントリーポイント
     """
-    # ウィンドウサイズ設定（スマートフォン縦画面）
-    Window.size = (360, 640)
-
-    # 日本語フォント登録
-    LabelBase.register(
-        name='Roboto',
-        fn_regular='assets/fonts/NotoSansCJKjp-Regular.otf'
-    )
+    # ウィンドウサイズの設定と日本語フォントの登録（全サンプル共通）
+    bootstrap.setup()
 
     # アプリケーション実行
     MenuApp().run()
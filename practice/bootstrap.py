@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+bootstrap.py - 全サンプル共通の起動処理
+
+各サンプルの main() で行っていた次の処理をまとめたモジュールです。
+- デスクトップ実行時のウィンドウサイズ設定
+- 日本語フォントの登録（デフォルトフォント Roboto を上書き）
+- よく使うひらがな・カタカナ・漢字の事前描画（グリフキャッシュの準備）
+
+setup() は何回呼び出しても最初の1回だけ処理を行うため、
+ランチャー（main.py）から同じプロセス内で複数のサンプルを
+表示しても、フォントの読み込みは1回で済みます。
+
+各段階にかかった時間は kivy のログ（[INFO] [Bootstrap]）に出力されます。
+
+使い方:
+    import bootstrap
+
+    def main():
+        bootstrap.setup()
+        MyApp().run()
+"""
+
+import time
+
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.core.text import LabelBase
+from kivy.core.window import Window
+from kivy.logger import Logger
+from kivy.metrics import dp, sp
+
+from fonts import japanese_font_path
+
+
+# デスクトップ実行時のウィンドウサイズ（スマートフォンの縦画面）
+WINDOW_SIZE = (360, 640)
+
+# 事前に描画しておく文字（かな・数字・サンプルでよく使う漢字）
+WARM_UP_TEXT = (
+    "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよ"
+    "らりるれろわをんがぎぐげござじずぜぞだぢづでどばびぶべぼぱぴぷぺぽゃゅょっー"
+    "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨ"
+    "ラリルレロワヲンガギグゲゴザジズゼゾダヂヅデドバビブベボパピプペポャュョッ"
+    "0123456789。、「」・★"
+    "表示選択設定削除確認送信保存通知画面一覧東京都渋谷区店名住所評価距離"
+)
+
+# 事前描画するフォントサイズ（サンプルでよく使うサイズ）
+WARM_UP_SIZES = (sp(14), sp(16), dp(18))
+
+# 各段階の所要時間（段階名 → 秒）
+timings = {}
+
+_done = False
+
+
+def _measure(phase, func, *args):
+    """処理を実行し、所要時間を timings に記録する"""
+    start = time.perf_counter()
+    result = func(*args)
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+def set_window_size(size=WINDOW_SIZE):
+    """デスクトップ実行時のウィンドウサイズを設定する"""
+    Window.size = size
+
+
+def register_fonts():
+    """
+    日本語フォントを登録する
+
+    デフォルトフォント（Roboto）を日本語フォントで上書きします。
+    KivyMD 1.2.0 では個別ウィジェットに font_name を指定できないため、
+    デフォルトフォントを置き換えることで日本語を表示します。
+    """
+    LabelBase.register(name='Roboto', fn_regular=japanese_font_path())
+
+
+def warm_up_glyphs():
+    """
+    よく使う文字を一度描画しておく
+
+    フォントファイルの読み込みとサイズごとのフォントの準備を
+    最初の画面の表示前に済ませておきます。
+    """
+    for font_size in WARM_UP_SIZES:
+        CoreLabel(text=WARM_UP_TEXT, font_name='Roboto', font_size=font_size).refresh()
+
+
+def report():
+    """各段階の所要時間をログに出力する"""
+    for phase, seconds in timings.items():
+        Logger.info(f"Bootstrap: {phase} {seconds * 1000:.1f} ms")
+
+
+def setup(window_size=WINDOW_SIZE, warm_up=True):
+    """
+    共通の起動処理を行う（2回目以降は何もしない）
+
+    最初のフレームが描画されるまでの時間も計測し、
+    描画後に各段階の所要時間をログに出力します。
+
+    Args:
+        window_size (tuple): ウィンドウサイズ（幅, 高さ）
+        warm_up (bool): グリフの事前描画を行うか
+    """
+    global _done
+    if _done:
+        return
+    _done = True
+
+    start = time.perf_counter()
+    _measure("window", set_window_size, window_size)
+    _measure("fonts", register_fonts)
+    if warm_up:
+        _measure("glyph_warm_up", warm_up_glyphs)
+
+    def on_first_frame(dt):
+        timings["first_frame"] = time.perf_counter() - start
+        report()
+
+    # 1回目のtickは最初の描画の前に実行されるため、もう1フレーム待つ
+    Clock.schedule_once(lambda dt: Clock.schedule_once(on_first_frame, 0), 0)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+dialog_pool.py - ダイアログの使い回しと事前作成
+
+MDDialog はボタンや本文のウィジェットをまとめて作成するため、
+ボタンを押すたびに作り直すと開くまでに引っかかりが出ます。
+このモジュールでは、ダイアログを種類ごとに作成しておき、
+タイトル・本文・ボタンの処理だけを差し替えて使い回します。
+
+- register(種類, factory): 種類ごとの作成方法を登録する
+- show(種類, title=..., text=..., ボタンのキー=処理): 空いているダイアログの
+  タイトル・本文・ボタンの処理を差し替えて開く（空きがなければ作成する）
+- 閉じたダイアログは空きに戻り、次の show() で使われる
+  （空きは種類ごとに max_free 個まで。それ以上は破棄してメモリを解放する）
+- 作成したダイアログは弱参照（weakref）で数え、破棄されたものが残っていないか確認できる
+- prewarm(): 最初のフレームの描画後に、1フレームに1つずつ作成しておく
+- 入力欄のあるダイアログは save_state() / restore_state(state) を持たせておくと、
+  中断して開き直したときに入力内容を戻せる（新しく開くときは state が None）
+
+ボタンの処理は、ボタンごとにキー（"ok"、"cancel" など）で指定します。
+ボタンが押されるとダイアログを閉じてから、処理（dialog を引数に呼ぶ）を呼び出します。
+
+使い方:
+    pool = DialogPool()
+    pool.register("alert", lambda on_button: MDDialog(
+        buttons=[MDFlatButton(text="OK", on_press=on_button("ok"))]))
+    pool.prewarm()
+    pool.show("alert", title="お知らせ", text="保存しました", ok=self.on_ok)
+"""
+
+import weakref
+
+from kivy.clock import Clock
+
+
+class DialogPool:
+    """
+    ダイアログを種類ごとに保持して使い回すクラス
+    """
+
+    def __init__(self, max_free=2):
+        """
+        Args:
+            max_free (int): 種類ごとに空きとして残しておくダイアログの最大数
+        """
+        self.max_free = max_free
+        self._factories = {}  # 種類 → factory(on_button)
+        self._free = {}       # 種類 → 空いているダイアログのリスト
+        self.created = 0      # 作成したダイアログの数（使い回せているかの確認用）
+        self.alive = weakref.WeakSet()  # 破棄されていないダイアログ
+        self.on_release = None  # ダイアログが閉じたときに呼ぶ関数 on_release(dialog)
+
+    @property
+    def free_count(self):
+        """空いているダイアログの数"""
+        return sum(len(free) for free in self._free.values())
+
+    def register(self, kind, factory):
+        """
+        ダイアログの種類を登録するメソッド
+
+        Args:
+            kind (str): 種類（"alert" など）
+            factory (callable): ダイアログを作成する関数 factory(on_button)。
+                                on_button(キー) が返す関数をボタンの on_press に指定する
+        """
+        self._factories[kind] = factory
+        self._free.setdefault(kind, [])
+
+    def _create(self, kind):
+        """種類に応じたダイアログを作成する"""
+        # ボタンからは弱参照でダイアログを参照する（循環参照で破棄が遅れないように）
+        created = []
+
+        def on_button(key):
+            return lambda button: self._press(created[0](), key)
+
+        dialog = self._factories[kind](on_button)
+        created.append(weakref.ref(dialog))
+        dialog.pool_kind = kind
+        dialog.pool_callbacks = {}
+        dialog.bind(on_dismiss=self._release)
+        self.created += 1
+        self.alive.add(dialog)
+        return dialog
+
+    def acquire(self, kind):
+        """
+        空いているダイアログを取り出すメソッド（なければ作成する）
+
+        閉じるアニメーションの途中のダイアログ（まだ画面に残っている）は
+        開き直せないため、使わずに残しておきます。
+
+        Args:
+            kind (str): 種類
+
+        Returns:
+            MDDialog: ダイアログ
+        """
+        free = self._free[kind]
+        for index, dialog in enumerate(free):
+            if dialog.parent is None:
+                return free.pop(index)
+        return self._create(kind)
+
+    def show(self, kind, title=None, text=None, animation=True, state=None, **callbacks):
+        """
+        ダイアログのタイトル・本文・ボタンの処理を差し替えて開くメソッド
+
+        Args:
+            kind (str): 種類
+            title (str): タイトル（Noneなら前回のまま）
+            text (str): 本文（Noneなら前回のまま）
+            animation (bool): 開くときのアニメーションを行うか
+            state: 中断したときに save_state() で保存した入力内容（Noneなら新しく開く）
+            **callbacks: ボタンのキー=処理（処理は dialog を引数に呼ばれる）
+
+        Returns:
+            MDDialog: 開いたダイアログ
+        """
+        dialog = self.acquire(kind)
+        if title is not None:
+            dialog.title = title
+        if text is not None:
+            dialog.text = text
+        dialog.pool_callbacks = callbacks
+        restore_state = getattr(dialog, "restore_state", None)
+        if restore_state is not None:
+            restore_state(state)
+        dialog.open(animation=animation)
+        return dialog
+
+    def _press(self, dialog, key):
+        """ボタンが押されたときに、ダイアログを閉じてからキーに対応する処理を呼ぶ"""
+        callback = dialog.pool_callbacks.get(key)
+        dialog.dismiss()
+        if callback is not None:
+            callback(dialog)
+
+    def _release(self, dialog):
+        """閉じたダイアログを空きに戻す（空きが max_free 個あれば戻さずに破棄する）"""
+        dialog.pool_callbacks = {}
+        free = self._free[dialog.pool_kind]
+        if dialog not in free and len(free) < self.max_free:
+            free.append(dialog)
+        if self.on_release is not None:
+            self.on_release(dialog)
+
+    def prewarm(self, kinds=None):
+        """
+        最初のフレームの描画後に、各種類のダイアログを1つずつ作成しておくメソッド
+
+        1フレームに1つずつ作成するので、作成中も画面の操作は止まりません。
+
+        Args:
+            kinds (iterable): 作成する種類（Noneなら登録したすべての種類）
+        """
+        pending = [kind for kind in (kinds or self._factories) if not self._free[kind]]
+
+        def create_next(dt):
+            if not pending:
+                return
+            kind = pending.pop(0)
+            if not self._free[kind]:
+                self._free[kind].append(self._create(kind))
+            Clock.schedule_once(create_next, 0)
+
+        # 1回目のtickは最初の描画の前に実行されるため、もう1フレーム待つ
+        Clock.schedule_once(lambda dt: Clock.schedule_once(create_next, 0), 0)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+dialog_queue.py - 優先度付きのダイアログの順番待ち
+
+バックグラウンドの処理の結果などで、ダイアログを開く要求が続けて届いても、
+ダイアログを1つずつ順番に開くためのモジュールです。
+ダイアログは DialogPool で使い回します。
+
+- request(種類, priority=..., ...): ダイアログを開く要求を順番待ちに追加する。
+  どのスレッドから呼んでもよい（開く処理は次のフレームでメインスレッドが行う）
+- 表示中のダイアログが閉じたら、順番待ちの中で優先度の高いもの
+  （同じ優先度なら先に要求したもの）を開く。
+  閉じるアニメーションが終わるまでは開かずに待つ（アニメーション中のダイアログは
+  使い回せないため、すぐに開くとダイアログを新しく作成することになる）
+- 表示中より優先度の高い要求が届いたら、表示中のダイアログを中断してスタックに積み、
+  高い方を先に開く。閉じたら中断したダイアログを開き直す
+  （ダイアログに save_state() があれば、中断したときの入力内容も戻す）
+- debug_counts(): 開いた回数・作成したダイアログの数・破棄されずに残っている数などを返す
+
+使い方:
+    dialogs = DialogQueue(pool)
+    dialogs.request("alert", title="完了", text="保存しました", ok=self.on_ok)
+    dialogs.request("alert", priority=10, title="エラー", text="保存できませんでした")
+"""
+
+import heapq
+import itertools
+import threading
+
+from kivy.clock import Clock
+
+
+# 閉じるアニメーションの途中に次の要求があるとき、開けるか確認する間隔（秒）
+CLOSING_RETRY = 0.05
+
+
+class DialogQueue:
+    """
+    ダイアログを開く要求を優先度順に1つずつ処理するクラス
+    """
+
+    def __init__(self, pool):
+        """
+        Args:
+            pool (DialogPool): ダイアログを作成・使い回すプール
+        """
+        self.pool = pool
+        pool.on_release = self._on_release
+        self.current = None    # 表示中の要求 (優先度, 順番, 種類, 引数)
+        self.dialog = None     # 表示中のダイアログ
+        self.closing = None    # 閉じるアニメーション中かもしれないダイアログ
+        self.opened = 0        # ダイアログを開いた回数
+        self.closed = 0        # ダイアログが閉じた回数
+        self._pending = []     # 順番待ちの要求のヒープ (-優先度, 順番, 種類, 引数)
+        self._stack = []       # 中断した要求（後から中断したものが上）
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._suspending = False
+        # 要求はワーカースレッドからも届くので、開く処理はメインスレッドで行う
+        self._trigger = Clock.create_trigger(lambda dt: self.process())
+        self._retry = Clock.create_trigger(lambda dt: self.process(), CLOSING_RETRY)
+
+    def request(self, kind, priority=0, **kwargs):
+        """
+        ダイアログを開く要求を追加するメソッド（どのスレッドから呼んでもよい）
+
+        Args:
+            kind (str): ダイアログの種類
+            priority (int): 優先度（大きいほど先に開く）
+            **kwargs: DialogPool.show() に渡すタイトル・本文・ボタンの処理
+        """
+        with self._lock:
+            heapq.heappush(self._pending, (-priority, next(self._order), kind, kwargs))
+        self._trigger()
+
+    @property
+    def queued(self):
+        """順番待ちの要求の数"""
+        with self._lock:
+            return len(self._pending)
+
+    def process(self):
+        """
+        順番待ちの要求を処理するメソッド（メインスレッドで呼ぶ）
+
+        何も表示していなければ次の要求を開き、表示中より優先度の高い要求があれば
+        表示中のダイアログを中断して開きます。
+        """
+        with self._lock:
+            top = self._pending[0] if self._pending else None
+            suspend = False
+            if self.current is None:
+                if top is None and not self._stack:
+                    return
+                if self.closing is not None and self.closing.parent is not None:
+                    # 閉じるアニメーションが終わってから開く
+                    self._retry()
+                    return
+                self.closing = None
+                # 中断した要求より優先度が高ければ順番待ちから、そうでなければ中断した要求を開く
+                if top is not None and (not self._stack or -top[0] > self._stack[-1][0]):
+                    entry = self._pop_pending()
+                elif self._stack:
+                    entry = self._stack.pop()
+                else:
+                    return
+            elif top is not None and -top[0] > self.current[0]:
+                entry = self._pop_pending()
+                suspend = True
+            else:
+                return
+        if suspend:
+            self._suspend()
+        self._show(entry)
+
+    def _pop_pending(self):
+        """ヒープから取り出した要求を (優先度, 順番, 種類, 引数) の形で返す"""
+        negative_priority, order, kind, kwargs = heapq.heappop(self._pending)
+        return (-negative_priority, order, kind, kwargs)
+
+    def _suspend(self):
+        """表示中のダイアログを閉じ、要求をスタックに積む（ボタンの処理は呼ばない）"""
+        entry = self.current
+        save_state = getattr(self.dialog, "save_state", None)
+        if save_state is not None:
+            # 開き直すときは別のダイアログが使われることもあるので、入力内容は要求に持たせる
+            priority, order, kind, kwargs = entry
+            entry = (priority, order, kind, dict(kwargs, state=save_state()))
+        self._stack.append(entry)
+        self._suspending = True
+        try:
+            self.dialog.dismiss()
+        finally:
+            self._suspending = False
+        self.current = None
+        self.dialog = None
+
+    def _show(self, entry):
+        """要求のダイアログを開く"""
+        _priority, _order, kind, kwargs = entry
+        self.current = entry
+        self.dialog = self.pool.show(kind, **kwargs)
+        self.opened += 1
+
+    def _on_release(self, dialog):
+        """ダイアログが閉じたとき、次の要求を開く"""
+        if self._suspending or dialog is not self.dialog:
+            return
+        self.current = None
+        self.dialog = None
+        self.closing = dialog
+        self.closed += 1
+        self._trigger()
+
+    def dismiss_current(self, animation=True):
+        """
+        表示中のダイアログを閉じるメソッド
+
+        Args:
+            animation (bool): 閉じるときのアニメーションを行うか
+        """
+        if self.dialog is not None:
+            self.dialog.dismiss(animation=animation)
+
+    def debug_counts(self):
+        """
+        ダイアログの数を返すメソッド（使い回せているか・破棄されているかの確認用）
+
+        Returns:
+            dict: opened（開いた回数）、closed（閉じた回数）、queued（順番待ち）、
+                  stacked（中断中）、created（作成した数）、alive（破棄されていない数）、
+                  free（空きの数）
+        """
+        return {
+            "opened": self.opened,
+            "closed": self.closed,
+            "queued": self.queued,
+            "stacked": len(self._stack),
+            "created": self.pool.created,
+            "alive": len(self.pool.alive),
+            "free": self.pool.free_count,
+        }
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+
+"""
+facet_filter.py - ビットセットによる絞り込み（ファセット検索）
+
+15_chip.py のカテゴリフィルターのように、チップで選んだ条件で
+RestaurantStore の行を絞り込むためのモジュールです。
+
+- 条件の値（例: カテゴリ「和食」）ごとに、該当する行のビットを立てた
+  ビットセットを1つ保持する（Python の int を任意長のビット列として使う）
+- 同じ項目（ファセット）で選んだ値どうしは OR（いずれか）または AND（すべて）、
+  異なる項目どうしは AND で組み合わせる
+- 件数は立っているビットの数を数えるだけなので、10万件でもすぐに求まる
+- チップに表示する値ごとの件数（counts）は、範囲の条件が変わったときや
+  行が増えたときに、件数を数える対象から増えた行・減った行の値の分だけ足し引きする。
+  チップの選択が変わったときは対象の行が大きく変わるため、値ごとに数え直す
+- 行番号のリストは、画面に表示する分だけビットセットから取り出す
+- 評価・距離などの範囲の条件（range_index.RangeFilter）も AND で組み合わせられる
+
+使い方:
+    facets = FacetFilter.from_store(store)
+    facets.select("category", "和食", True)
+    bits = facets.matching_bits()
+    facets.count(bits)                  # 該当する件数
+    facets.rows(bits, 0, 50)            # 先頭50件の行番号
+    facets.counts["category"]["和食"]    # 和食を選んだ場合の件数
+"""
+
+# 0〜255 の各バイトで立っているビットの位置（行番号の取り出しに使う）
+_BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+)
+
+# 変わったかもしれない行が全体のこの割合を超えたら、足し引きせずに値ごとに数え直す
+DELTA_ROWS_RATIO = 1 / 2048
+
+
+def bit_count(bits):
+    """立っているビットの数を返す関数"""
+    return bits.bit_count() if hasattr(bits, "bit_count") else bin(bits).count("1")
+
+
+def bitsets_from_codes(codes, size):
+    """
+    各行の値（番号）の配列から、値ごとのビットセットを作る関数
+
+    1行ずつ int のビットを立てると毎回 int を作り直すことになるため、
+    bytearray でビットを立ててから最後に int に変換します。
+
+    Args:
+        codes (sequence): 各行の値の番号（RestaurantStore.category_codes など）
+        size (int): 行数
+
+    Returns:
+        dict: 値の番号 → ビットセット
+    """
+    arrays = {}
+    nbytes = (size + 7) // 8
+    for row in range(size):
+        code = codes[row]
+        array = arrays.get(code)
+        if array is None:
+            array = arrays[code] = bytearray(nbytes)
+        array[row >> 3] |= 1 << (row & 7)
+    return {code: int.from_bytes(array, "little") for code, array in arrays.items()}
+
+
+class FacetFilter:
+    """
+    ファセットごとの値のビットセットを保持し、選択された値で絞り込むクラス
+    """
+
+    def __init__(self, size=0):
+        """
+        Args:
+            size (int): 行数
+        """
+        self.size = size
+        self.bitsets = {}    # ファセット名 → {値: ビットセット}
+        self.modes = {}      # ファセット名 → "or" / "and"
+        self.selected = {}   # ファセット名 → 選択中の値の集合
+        self.counts = {}     # ファセット名 → {値: その値を選んだ場合の件数}
+        self.ranges = {}     # 範囲の条件の名前 → RangeFilter
+        self._contexts = {}  # ファセット名 → 件数を数える対象の行のビットセット
+        self._packed = {}    # ファセット名 → {値: ビットセットを bytearray にしたもの}
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        RestaurantStore のカテゴリから "category" ファセットを作成するメソッド
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+
+        Returns:
+            FacetFilter: 作成したフィルター
+        """
+        facets = cls(len(store))
+        facets.add_facet("category")
+        for code, bits in bitsets_from_codes(store.category_codes, len(store)).items():
+            facets.set_bitset("category", store.categories[code], bits)
+        return facets
+
+    @property
+    def all_bits(self):
+        """すべての行のビットが立ったビットセット"""
+        return (1 << self.size) - 1
+
+    def add_facet(self, facet, mode="or"):
+        """
+        ファセットを追加するメソッド
+
+        Args:
+            facet (str): ファセット名
+            mode (str): 選択した値どうしの組み合わせ方
+                        "or"（いずれかに該当）または "and"（すべてに該当）
+        """
+        self.bitsets.setdefault(facet, {})
+        self.modes[facet] = mode
+        self.selected.setdefault(facet, set())
+        self.counts.setdefault(facet, {})
+        self._contexts[facet] = self.context_bits(facet)
+        self._packed.setdefault(facet, {})
+
+    def set_bitset(self, facet, value, bits):
+        """
+        値のビットセットをまとめて設定するメソッド
+
+        Args:
+            facet (str): ファセット名
+            value: 値
+            bits (int): その値に該当する行のビットセット
+        """
+        self.bitsets[facet][value] = bits
+        self.counts[facet][value] = bit_count(bits & self._contexts[facet])
+        self._packed[facet].pop(value, None)
+
+    def add_range(self, name, range_filter):
+        """
+        範囲の条件を追加するメソッド
+
+        Args:
+            name (str): 条件の名前（"rating" など）
+            range_filter (RangeFilter): 範囲に入る行のビットセットを持つフィルター
+        """
+        self.ranges[name] = range_filter
+        self._update_counts()
+
+    def set_range(self, name, low=None, high=None):
+        """
+        範囲の条件を変更するメソッド
+
+        範囲の端が動いた分の行だけを更新するため、スライダーを動かすたびに呼べます。
+
+        Args:
+            name (str): 条件の名前
+            low: 下限（Noneなら下限なし）
+            high: 上限（Noneなら上限なし）
+        """
+        rows = self.ranges[name].set_range(low, high)
+        if rows:
+            self._update_counts(rows)
+
+    def add_row(self, row, **values):
+        """
+        1行分の値を追加するメソッド（ページ単位で行が増えるとき用）
+
+        Args:
+            row (int): 行番号
+            **values: ファセット名=値（複数の値を持つ場合はリストやタプル）、
+                      または範囲の条件の名前=列の値
+        """
+        self.size = max(self.size, row + 1)
+        for facet, value in values.items():
+            if facet in self.ranges:
+                self.ranges[facet].add(row, value)
+                continue
+            bitsets = self.bitsets[facet]
+            counts = self.counts[facet]
+            packed = self._packed[facet]
+            for item in value if isinstance(value, (list, tuple, set)) else (value,):
+                bitsets[item] = bitsets.get(item, 0) | (1 << row)
+                counts.setdefault(item, 0)
+                if item in packed:
+                    self._packed_bits(facet, item)[row >> 3] |= 1 << (row & 7)
+        # 追加した行が件数の対象になったファセットだけ、その行の値の件数を増やす
+        self._update_counts([row])
+
+    def select(self, facet, value, active=True):
+        """
+        ファセットの値を選択（または解除）するメソッド
+
+        Args:
+            facet (str): ファセット名
+            value: 値
+            active (bool): 選択するならTrue、解除するならFalse
+        """
+        if active:
+            self.selected[facet].add(value)
+        else:
+            self.selected[facet].discard(value)
+        self._update_counts()
+
+    def context_bits(self, facet):
+        """
+        ファセットの値ごとの件数を数える対象の行のビットセットを返すメソッド
+
+        OR のファセットは、他のファセットの選択だけで絞り込んだ行が対象です
+        （その値を追加で選んだときに増える分も含めて数えるため）。
+        AND のファセットは、自分の選択も含めて絞り込んだ行が対象です。
+
+        Args:
+            facet (str): ファセット名
+
+        Returns:
+            int: ビットセット
+        """
+        result = self.all_bits
+        for range_filter in self.ranges.values():
+            result &= range_filter.bits
+        for other, values in self.selected.items():
+            if values and (other != facet or self.modes[facet] == "and"):
+                result &= self.facet_bits(other, values)
+        return result
+
+    def _packed_bits(self, facet, value):
+        """
+        値のビットセットを bytearray にしたものを返すメソッド
+
+        1行ずつビットを調べるときに int をシフトすると毎回全体をコピーするため、
+        初めて使うときに bytearray にして保持しておきます。
+
+        Args:
+            facet (str): ファセット名
+            value: 値
+
+        Returns:
+            bytearray: 行番号 row のビットは array[row >> 3] >> (row & 7) & 1
+        """
+        nbytes = (self.size + 7) // 8
+        array = self._packed[facet].get(value)
+        if array is None:
+            array = self._packed[facet][value] = bytearray(
+                self.bitsets[facet][value].to_bytes(nbytes, "little")
+            )
+        elif len(array) < nbytes:
+            array.extend(bytes(nbytes - len(array)))
+        return array
+
+    def _update_counts(self, rows=None):
+        """
+        値ごとの件数を更新するメソッド
+
+        変わったかもしれない行 rows がわかっている場合は、そのうち件数を数える対象から
+        増えた行・減った行の値の件数だけを足し引きします（行数に比例する処理はしない）。
+        rows がわからない場合や多すぎる場合は、値ごとにビットを数え直します。
+
+        Args:
+            rows (list): 件数を数える対象から増減したかもしれない行番号（Noneならわからない）
+        """
+        nbytes = (self.size + 7) // 8
+        for facet, old in self._contexts.items():
+            new = self.context_bits(facet)
+            if new == old:
+                continue
+            counts = self.counts[facet]
+            if rows is None or len(rows) > self.size * DELTA_ROWS_RATIO:
+                for value, bits in self.bitsets[facet].items():
+                    counts[value] = bit_count(bits & new)
+            else:
+                new_bytes = new.to_bytes(nbytes, "little")
+                old_bytes = old.to_bytes(nbytes, "little")
+                arrays = [(value, self._packed_bits(facet, value)) for value in self.bitsets[facet]]
+                for row in rows:
+                    index, bit = row >> 3, row & 7
+                    delta = (new_bytes[index] >> bit & 1) - (old_bytes[index] >> bit & 1)
+                    if delta:
+                        for value, array in arrays:
+                            if array[index] >> bit & 1:
+                                counts[value] += delta
+            self._contexts[facet] = new
+
+    def facet_bits(self, facet, values):
+        """
+        1つのファセットで選ばれた値を組み合わせたビットセットを返すメソッド
+
+        Args:
+            facet (str): ファセット名
+            values (iterable): 選択された値
+
+        Returns:
+            int: ビットセット（値がなければ全行）
+        """
+        bitsets = self.bitsets[facet]
+        result = None
+        for value in values:
+            bits = bitsets.get(value, 0)
+            if result is None:
+                result = bits
+            elif self.modes[facet] == "and":
+                result &= bits
+            else:
+                result |= bits
+        return self.all_bits if result is None else result
+
+    def matching_bits(self):
+        """
+        選択中の条件に該当する行のビットセットを返すメソッド
+
+        ファセットの中は OR / AND、ファセットどうしと範囲の条件は AND で組み合わせます。
+
+        Returns:
+            int: ビットセット
+        """
+        result = self.all_bits
+        for range_filter in self.ranges.values():
+            result &= range_filter.bits
+        for facet, values in self.selected.items():
+            if values:
+                result &= self.facet_bits(facet, values)
+        return result
+
+    def count(self, bits):
+        """ビットセットに含まれる行数を返す"""
+        return bit_count(bits)
+
+    def rows(self, bits, start_row=0, limit=None):
+        """
+        ビットセットから行番号を取り出すメソッド
+
+        Args:
+            bits (int): ビットセット
+            start_row (int): この行番号以降から取り出す
+            limit (int): 取り出す件数の上限（Noneなら全件）
+
+        Returns:
+            list: 行番号のリスト（昇順）
+        """
+        result = []
+        start_byte = start_row >> 3
+        data = (bits >> (start_byte * 8)).to_bytes((self.size + 7) // 8 - start_byte, "little")
+        for offset, byte in enumerate(data):
+            if not byte:
+                continue
+            base = (start_byte + offset) * 8
+            for bit in _BYTE_BITS[byte]:
+                row = base + bit
+                if row >= start_row:
+                    result.append(row)
+            if limit is not None and len(result) >= limit:
+                return result[:limit]
+        return result
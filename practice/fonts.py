@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""
+fonts.py - 日本語フォントファイルの選択
+
+tools/subset_font.py で作成したサブセットフォント
+（アプリで使う文字だけを含む小さなフォント）があればそちらを使い、
+なければ元のフルセットのフォントを使います。
+サブセットを作成した後に文字列の元になったファイル（main.py、practice/*.py、
+data/ のデータファイル）やフルセットのフォントが更新されていたら、
+サブセットに含まれない文字があるかもしれないので、フルセットを使います。
+
+テキスト入力などでサブセットに含まれない文字を表示したい場合は、
+環境変数 KIVYMD_PRACTICE_FULL_FONT=1 を設定するとフルセットを使います。
+"""
+
+import glob
+import os
+
+
+# リポジトリのルート
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# フォントファイルのディレクトリ（リポジトリの assets/fonts/）
+FONT_DIR = os.path.join(ROOT_DIR, "assets", "fonts")
+
+# サブセットの文字を集めるデータファイルのディレクトリと拡張子
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+DATA_EXTENSIONS = (".json", ".jsonl", ".csv", ".tsv", ".txt")
+
+# 元のフルセットのフォント
+FULL_FONT = os.path.join(FONT_DIR, "NotoSansCJKjp-Regular.otf")
+
+# tools/subset_font.py が出力するサブセットフォント
+SUBSET_FONT = os.path.join(FONT_DIR, "NotoSansCJKjp-Subset.otf")
+
+
+def subset_sources(data_dir=DATA_DIR):
+    """
+    サブセットの文字を集めるファイルのパスを返す関数
+
+    Args:
+        data_dir (str): データファイルのディレクトリ
+
+    Returns:
+        tuple: (Pythonファイルのリスト, データファイルのリスト)
+    """
+    sources = [os.path.join(ROOT_DIR, "main.py")]
+    sources += sorted(glob.glob(os.path.join(ROOT_DIR, "practice", "*.py")))
+    data_files = sorted(
+        path for path in glob.glob(os.path.join(data_dir, "**", "*"), recursive=True)
+        if path.endswith(DATA_EXTENSIONS)
+    )
+    return sources, data_files
+
+
+def subset_is_stale():
+    """
+    サブセットフォントが元のファイルより古いかを返す関数
+
+    Returns:
+        bool: サブセットの作成後にフルセットのフォントや文字の元のファイルが更新されていればTrue
+    """
+    subset_time = os.path.getmtime(SUBSET_FONT)
+    sources, data_files = subset_sources()
+    for path in [FULL_FONT] + sources + data_files:
+        try:
+            if os.path.getmtime(path) > subset_time:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def japanese_font_path():
+    """
+    登録に使う日本語フォントのパスを返す関数
+
+    Returns:
+        str: 最新のサブセットフォントがあればそのパス、なければフルセットのパス
+    """
+    if os.environ.get("KIVYMD_PRACTICE_FULL_FONT") == "1":
+        return FULL_FONT
+    if os.path.exists(SUBSET_FONT) and not subset_is_stale():
+        return SUBSET_FONT
+    return FULL_FONT
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+geo_index.py - 緯度・経度による近くの店の検索
+
+03_cards.py の「近くの店」のように、現在地から近い飲食店を探すためのモジュールです。
+
+- distance_between: 2地点間の距離（メートル）を球面上の距離として計算する
+- GridIndex: 地図を一辺 cell_size メートルのマス目（グリッド）に区切り、
+  マスごとにそこにある店の行番号を保持する。
+  「半径 R メートル以内」は R を含むマスだけを調べればよく、
+  「近い順に N 件」は半径を広げながら N 件見つかるまで調べる
+
+緯度・経度が分からない行（NaN）は登録しません。
+日付変更線や極付近は想定していません（街の中の店を探す用途のため）。
+
+使い方:
+    index = GridIndex.from_store(store)
+    index.nearest(35.658, 139.7016, 10)       # 近い順に10件の (距離, 行番号)
+    index.within(35.658, 139.7016, 500)       # 500m 以内の (距離, 行番号)（近い順）
+"""
+
+import math
+
+
+# 地球の半径（メートル）
+EARTH_RADIUS = 6371000.0
+
+# 緯度1度あたりの距離（メートル）
+METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180
+
+# マスの一辺の長さ（メートル）
+DEFAULT_CELL_SIZE = 250.0
+
+# nearest() の rows がこの割合以下の行数なら、マスを調べずに rows の行の距離を直接計算する
+SPARSE_ROWS_RATIO = 1 / 8
+
+
+def distance_between(latitude1, longitude1, latitude2, longitude2):
+    """
+    2地点間の距離を返す関数（haversine の公式）
+
+    Args:
+        latitude1 (float): 地点1の緯度
+        longitude1 (float): 地点1の経度
+        latitude2 (float): 地点2の緯度
+        longitude2 (float): 地点2の経度
+
+    Returns:
+        float: 距離（メートル）
+    """
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    緯度・経度をマス目に区切り、マスごとに行番号を保持するクラス
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        """
+        Args:
+            cell_size (float): マスの一辺の長さ（メートル）
+        """
+        self.cell_size = cell_size
+        self.cells = {}      # (経度方向のマス番号, 緯度方向のマス番号) → [(緯度, 経度, 行番号)]
+        self.points = {}     # 行番号 → (緯度, 経度, 行番号)（cells と同じタプル）
+        self.count = 0       # 登録した行数
+        self.rows = 0        # 調べ終わった行数（extend() で続きから登録するため）
+        # 緯度・経度をマス番号に変換する係数（最初の地点の緯度で経度方向の縮尺を決める）
+        self._lat_scale = METERS_PER_DEGREE / cell_size
+        self._lon_scale = None
+
+    @classmethod
+    def from_store(cls, store, cell_size=DEFAULT_CELL_SIZE):
+        """
+        RestaurantStore の全行を登録したインデックスを作成するメソッド
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+            cell_size (float): マスの一辺の長さ（メートル）
+
+        Returns:
+            GridIndex: 作成したインデックス
+        """
+        index = cls(cell_size)
+        index.extend(store, len(store))
+        return index
+
+    def extend(self, store, end):
+        """
+        まだ登録していない行（行番号 end の手前まで）を登録するメソッド
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+            end (int): 登録する最後の行番号 + 1
+        """
+        latitudes = store.latitudes
+        longitudes = store.longitudes
+        for row in range(self.rows, end):
+            self.add(row, latitudes[row], longitudes[row])
+        self.rows = max(self.rows, end)
+
+    def add(self, row, latitude, longitude):
+        """
+        1行を登録するメソッド（緯度・経度が NaN の行は登録しない）
+
+        Args:
+            row (int): 行番号
+            latitude (float): 緯度
+            longitude (float): 経度
+        """
+        if math.isnan(latitude) or math.isnan(longitude):
+            return
+        if self._lon_scale is None:
+            self._lon_scale = self._lat_scale * math.cos(math.radians(latitude))
+        cell = self._cell(latitude, longitude)
+        point = (latitude, longitude, row)
+        self.cells.setdefault(cell, []).append(point)
+        self.points[row] = point
+        self.count += 1
+
+    def _cell(self, latitude, longitude):
+        """緯度・経度を含むマスの番号を返す"""
+        return (math.floor(longitude * self._lon_scale), math.floor(latitude * self._lat_scale))
+
+    def _candidates(self, latitude, longitude, radius):
+        """
+        中心から radius メートルの円を囲む範囲のマスにある点を返す
+
+        範囲のマスが登録済みのマスより多いときは、登録済みのマスから範囲内のものを選びます。
+        """
+        dlat = radius / METERS_PER_DEGREE
+        # 円の中で最も極に近い緯度で、経度方向の幅がいちばん広くなる
+        widest = min(89.0, abs(latitude) + dlat)
+        dlon = radius / (METERS_PER_DEGREE * math.cos(math.radians(widest)))
+        x0, y0 = self._cell(latitude - dlat, longitude - dlon)
+        x1, y1 = self._cell(latitude + dlat, longitude + dlon)
+        cells = self.cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    points = cells.get((x, y))
+                    if points:
+                        yield from points
+        else:
+            for (x, y), points in cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield from points
+
+    def _scan(self, latitude, longitude, radius, rows=None):
+        """
+        中心から radius メートルの円を囲む範囲のマスにある点の距離を計算する
+
+        rows を指定した場合は、その中の行だけ距離を計算します
+        （距離の計算は行番号の確認より遅いため、先に行番号で絞り込む）。
+
+        Returns:
+            tuple: ((距離, 行番号) のリスト（順不同、半径の外の行も含む）, 範囲のマスにあった点の数)
+        """
+        result = []
+        scanned = 0
+        for point_latitude, point_longitude, row in self._candidates(latitude, longitude, radius):
+            scanned += 1
+            if rows is None or row in rows:
+                distance = distance_between(latitude, longitude, point_latitude, point_longitude)
+                result.append((distance, row))
+        return result, scanned
+
+    def within(self, latitude, longitude, radius):
+        """
+        中心から radius メートル以内の行を近い順に返すメソッド
+
+        Args:
+            latitude (float): 中心の緯度
+            longitude (float): 中心の経度
+            radius (float): 半径（メートル）
+
+        Returns:
+            list: (距離, 行番号) のリスト（近い順）
+        """
+        if not self.count:
+            return []
+        found, _scanned = self._scan(latitude, longitude, radius)
+        result = [item for item in found if item[0] <= radius]
+        result.sort()
+        return result
+
+    def nearest(self, latitude, longitude, n, rows=None):
+        """
+        中心から近い順に n 件の行を返すメソッド
+
+        半径を2倍ずつ広げながら探し、半径の中に n 件以上見つかったら
+        その中から近い順に n 件を選びます（半径の外の行は必ずそれより遠い）。
+        調べたマスに全行が入ったら、それ以上は広げずに全行から選びます。
+        rows を指定した場合は、その中の行だけを数えます（検索結果を近い順に並べるときなど）。
+        rows が少ない場合は、マスを広げながら全行を調べるより速いので、rows の行の距離を直接計算します。
+
+        Args:
+            latitude (float): 中心の緯度
+            longitude (float): 中心の経度
+            n (int): 件数
+            rows (set): この行番号の中から探す（Noneなら登録したすべての行）
+
+        Returns:
+            list: (距離, 行番号) のリスト（近い順）
+        """
+        n = min(n, self.count if rows is None else len(rows))
+        if n <= 0:
+            return []
+        if rows is not None and len(rows) <= self.count * SPARSE_ROWS_RATIO:
+            points = self.points
+            found = []
+            for row in rows:
+                point = points.get(row)
+                if point is not None:
+                    found.append((distance_between(latitude, longitude, point[0], point[1]), row))
+            found.sort()
+            return found[:n]
+        radius = self.cell_size
+        while True:
+            found, scanned = self._scan(latitude, longitude, radius, rows)
+            if scanned < self.count:
+                found = [item for item in found if item[0] <= radius]
+            if len(found) >= n or scanned == self.count:
+                found.sort()
+                return found[:n]
+            radius *= 2
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+"""
+geocoder.py - 住所から緯度・経度を求めるオフラインのジオコーダー
+
+"東京都渋谷区道玄坂2-1-1" のような住所を、同梱の住所データ
+（data/gazetteer.tsv）だけを使って緯度・経度に変換します。ネットワークは使いません。
+
+- 住所データは「都道府県 → 市区町村 → 町・丁目」の順に1文字ずつたどる
+  トライ木にして保持する。住所の先頭から木をたどり、
+  最後に一致した階層の代表点を返す（丁目が分からなければ区役所の位置など）
+- 都道府県を省いた住所（"渋谷区道玄坂1-2"）は、市区町村から始まる
+  もう1つのトライ木でたどる。同じ名前の市区町村が複数の都道府県にある場合
+  （"府中市" など）はどちらか決められないため、町・丁目まで一致しなければNoneを返す
+- 住所の表記ゆれ（全角数字、"2-1-1" と "2丁目1-1"、"二丁目"）は
+  たどる前に正規化してそろえる
+- 一度変換した住所は結果をメモしておき、同じ住所は木をたどらない
+  （メモは MEMO_SIZE 件までで、あふれたら最も長く使っていない住所から消す）
+- 大量の住所は geocode_all() でプロセスプールに分けて変換する
+- 変換結果は GeocodeCache でファイルに保存し、次回の起動では読み込むだけにする
+
+使い方:
+    geocoder = Geocoder.from_file()
+    geocoder.geocode("東京都渋谷区道玄坂2-1-1")   # (緯度, 経度, "town")
+    geocode_all(addresses)                         # 住所 → 結果 の dict
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 同梱の住所データ（都道府県, 市区町村, 町・丁目, 緯度, 経度 のタブ区切り）
+GAZETTEER_PATH = os.path.join(ROOT_DIR, "data", "gazetteer.tsv")
+
+# 変換結果の保存先
+CACHE_PATH = os.path.join(ROOT_DIR, "data", "geocode_cache.json")
+
+# 住所の階層（トライ木で一致した深さ）
+LEVELS = ("prefecture", "city", "town")
+
+# この件数より少なければプロセスプールを使わずに変換する（起動の時間のほうが長いため）
+PROCESS_POOL_THRESHOLD = 50000
+
+# プロセスプールで1回に渡す住所の件数
+CHUNK_SIZE = 2000
+
+# 変換結果をメモしておく住所の件数
+MEMO_SIZE = 65536
+
+# トライ木の節で、その位置で終わる住所の代表点を入れるキー
+_END = ""
+
+# 市区町村から始まるトライ木で、複数の都道府県に同じ住所があることを表す値
+_AMBIGUOUS = "ambiguous"
+
+# 漢数字（丁目の前に使われるもの）
+_KANJI_DIGITS = {"一": 1, "二": 2, "三": 3, "四": 4, "五": 5,
+                 "六": 6, "七": 7, "八": 8, "九": 9, "十": 10}
+
+# ハイフンの代わりに使われる文字
+_DASHES = str.maketrans({character: "-" for character in "‐‑–—―−ーｰ"})
+
+# 漢数字の丁目（"二丁目"、"十二丁目"）
+_KANJI_CHOME = re.compile(f"([{''.join(_KANJI_DIGITS)}]+)丁目")
+
+# 町名の直後の丁目の番号（"道玄坂2-1-1" の "2"）
+_DIGIT_CHOME = re.compile(r"(?<=[^\d\-])(\d+)(?:-|$)")
+
+
+def _kanji_number(text):
+    """"二"、"十二"、"二十" のような漢数字を整数にする"""
+    if "十" not in text:
+        return _KANJI_DIGITS[text]
+    tens, _, ones = text.partition("十")
+    return (_KANJI_DIGITS[tens] if tens else 1) * 10 + (_KANJI_DIGITS[ones] if ones else 0)
+
+
+def normalize_address(address):
+    """
+    住所の表記をそろえる関数
+
+    全角の英数字を半角にし、ハイフンの表記ゆれをそろえ、
+    "道玄坂2-1-1" や "道玄坂二丁目1-1" を "道玄坂2丁目1-1" にします。
+
+    Args:
+        address (str): 住所
+
+    Returns:
+        str: 正規化した住所
+    """
+    text = unicodedata.normalize("NFKC", address).translate(_DASHES)
+    text = "".join(text.split())
+    text = _KANJI_CHOME.sub(lambda match: f"{_kanji_number(match.group(1))}丁目", text)
+    if "丁目" not in text:
+        text = _DIGIT_CHOME.sub(r"\1丁目", text, count=1)
+    return text
+
+
+class Geocoder:
+    """
+    住所データのトライ木で、住所を緯度・経度に変換するクラス
+    """
+
+    def __init__(self):
+        self.root = {}
+        # 都道府県を省いた住所用のトライ木（節の _END には (都道府県, 代表点) を入れる）
+        self.city_root = {}
+        self._memo = OrderedDict()  # 住所 → 変換結果（最後に使ったものが末尾）
+
+    @classmethod
+    def from_file(cls, path=GAZETTEER_PATH):
+        """
+        住所データのファイルからジオコーダーを作成するメソッド
+
+        Args:
+            path (str): 住所データのパス（# で始まる行はコメント）
+
+        Returns:
+            Geocoder: 作成したジオコーダー
+        """
+        geocoder = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                prefecture, city, town, latitude, longitude = line.rstrip("\n").split("\t")
+                geocoder.add((prefecture, city, town), float(latitude), float(longitude))
+        return geocoder
+
+    def add(self, names, latitude, longitude):
+        """
+        住所データを1件登録するメソッド
+
+        Args:
+            names (tuple): (都道府県, 市区町村, 町・丁目)（下の階層は "" でもよい）
+            latitude (float): 代表点の緯度
+            longitude (float): 代表点の経度
+        """
+        node = self.root
+        city_node = None
+        level = None
+        for depth, name in zip(LEVELS, names):
+            if not name:
+                break
+            if depth == "city":
+                city_node = self.city_root
+            for character in normalize_address(name):
+                node = node.setdefault(character, {})
+                if city_node is not None:
+                    city_node = city_node.setdefault(character, {})
+            level = depth
+        result = (latitude, longitude, level)
+        node[_END] = result
+        if city_node is not None:
+            prefecture = names[0]
+            previous = city_node.get(_END)
+            if previous is not None and previous != _AMBIGUOUS and previous[0] != prefecture:
+                city_node[_END] = _AMBIGUOUS
+            elif previous != _AMBIGUOUS:
+                city_node[_END] = (prefecture, result)
+        self._memo.clear()
+
+    def geocode(self, address):
+        """
+        住所を緯度・経度に変換するメソッド
+
+        住所の先頭からトライ木をたどり、最後に一致した代表点を返します。
+        都道府県で一致しなければ、市区町村から始まるトライ木でたどり直します。
+        一度変換した住所はメモした結果を返します。
+
+        Args:
+            address (str): 住所
+
+        Returns:
+            tuple: (緯度, 経度, 一致した階層)（一致しなければNone）
+        """
+        memo = self._memo
+        if address in memo:
+            memo.move_to_end(address)
+            return memo[address]
+        text = normalize_address(address)
+        node = self.root
+        result = None
+        for character in text:
+            node = node.get(character)
+            if node is None:
+                break
+            result = node.get(_END, result)
+        if result is None:
+            result = self._geocode_without_prefecture(text)
+        memo[address] = result
+        if len(memo) > MEMO_SIZE:
+            memo.popitem(last=False)
+        return result
+
+    def _geocode_without_prefecture(self, text):
+        """正規化した住所を、市区町村から始まるトライ木でたどる"""
+        node = self.city_root
+        result = None
+        for character in text:
+            node = node.get(character)
+            if node is None:
+                break
+            value = node.get(_END)
+            if value == _AMBIGUOUS:
+                result = None
+            elif value is not None:
+                result = value[1]
+        return result
+
+
+# プロセスプールの各ワーカーで使うジオコーダー（initializer で作成する）
+_worker_geocoder = None
+
+
+def _init_worker(path):
+    global _worker_geocoder
+    _worker_geocoder = Geocoder.from_file(path)
+
+
+def _geocode_chunk(addresses):
+    return [_worker_geocoder.geocode(address) for address in addresses]
+
+
+def geocode_all(addresses, path=GAZETTEER_PATH, cache=None, processes=None):
+    """
+    たくさんの住所をまとめて緯度・経度に変換する関数
+
+    同じ住所は1回だけ変換し、cache にある住所は変換しません。
+    変換する住所が PROCESS_POOL_THRESHOLD 件以上なら、
+    CHUNK_SIZE 件ずつに分けてプロセスプールで変換します。
+
+    Args:
+        addresses (iterable): 住所
+        path (str): 住所データのパス
+        cache (GeocodeCache): 変換結果の保存先（Noneなら保存しない）
+        processes (int): プロセス数（Noneなら CPU の数）
+
+    Returns:
+        dict: 住所 → (緯度, 経度, 一致した階層) または None
+    """
+    results = {}
+    pending = []
+    for address in dict.fromkeys(addresses):
+        if cache is not None and address in cache.results:
+            results[address] = cache.results[address]
+        else:
+            pending.append(address)
+
+    if len(pending) < PROCESS_POOL_THRESHOLD:
+        geocoder = Geocoder.from_file(path)
+        results.update((address, geocoder.geocode(address)) for address in pending)
+    else:
+        chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(path,)) as pool:
+            for chunk, chunk_results in zip(chunks, pool.map(_geocode_chunk, chunks)):
+                results.update(zip(chunk, chunk_results))
+
+    if cache is not None and pending:
+        cache.update((address, results[address]) for address in pending)
+    return results
+
+
+class GeocodeCache:
+    """
+    変換結果をファイルに保存するキャッシュ
+
+    住所データのファイルが更新されたら（更新日時・サイズが変わったら）、
+    保存した結果は使わずに変換し直します。
+    """
+
+    def __init__(self, path=CACHE_PATH, gazetteer_path=GAZETTEER_PATH):
+        """
+        Args:
+            path (str): 保存先のパス
+            gazetteer_path (str): 住所データのパス
+        """
+        self.path = path
+        stat = os.stat(gazetteer_path)
+        self.signature = [stat.st_mtime_ns, stat.st_size]
+        self.results = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        """保存した結果を読み込む（住所データが変わっていれば読み込まない）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("gazetteer") != self.signature:
+            return
+        self.results = {
+            address: tuple(result) if result is not None else None
+            for address, result in saved["results"].items()
+        }
+
+    def update(self, items):
+        """
+        変換結果を追加するメソッド
+
+        Args:
+            items (iterable): (住所, 変換結果) のペア
+        """
+        self.results.update(items)
+        self.dirty = True
+
+    def save(self):
+        """追加した結果があればファイルに書き出すメソッド"""
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"gazetteer": self.signature, "results": self.results},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
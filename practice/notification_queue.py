@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+"""
+notification_queue.py - まとめて表示する通知の順番待ち
+
+バックグラウンドの処理から通知が続けて届いても、スナックバーを1つだけ使い回して
+順番に表示するためのモジュールです。
+
+- notify(本文, priority=...): 通知を順番待ちに追加する。どのスレッドから呼んでもよい
+  （表示は次のフレームでメインスレッドがまとめて行う）
+- 同じ本文の通知は1つにまとめ、「保存しました ×3」のように回数を表示する
+- 表示中より優先度の高い通知（エラーなど）が届いたら、すぐに差し替えて表示する。
+  差し替えられた通知は順番待ちに戻し、後で表示し直す
+- 表示中と同じか高い優先度の通知が順番待ちにあるときは、1つの通知を
+  min_interval 秒表示したら次に切り替える（低い優先度の通知しか待っていなければ、
+  表示中の通知を duration 秒表示し終えてから切り替える）。
+  順番待ちが max_pending 件を超えたら、優先度の低いものから
+  「ほかにN件の通知があります」の1件にまとめる
+- スナックバーは最初の通知のときに1つだけ作成し、本文・色・ボタンを差し替えて使い回す。
+  閉じるのは順番待ちが空になったときだけ
+- debug_counts(): 届いた通知の数・表示した数・ウィジェットを操作した回数などを返す
+
+通知が1,000件届いても、ウィジェットを操作するのは1フレームに1回までで、
+回数は表示した通知（まとめた後の数）に比例します。
+
+使い方:
+    notifications = NotificationQueue()
+    notifications.notify("保存しました")
+    notifications.notify("保存できませんでした", priority=10, color=(0.8, 0.2, 0.2, 1))
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivymd.uix.snackbar import MDSnackbar, MDSnackbarText
+from kivymd.uix.snackbar import MDSnackbarSupportingText, MDSnackbarButtonContainer
+from kivymd.uix.snackbar import MDSnackbarCloseButton, MDSnackbarActionButton
+
+
+# まとめた通知の本文（{count} は件数）
+OVERFLOW_TEXT = "ほかに{count}件の通知があります"
+
+# 閉じるアニメーションの途中に通知が届いたとき、開き直せるか確認する間隔（秒）
+CLOSING_RETRY = 0.1
+
+
+class _Notification:
+    """順番待ちの通知（同じ本文の通知は count にまとめる）"""
+
+    __slots__ = (
+        "text", "priority", "order", "supporting_text", "color",
+        "duration", "action_text", "on_action", "count", "overflow"
+    )
+
+    def __init__(self, text, priority, order, supporting_text=None, color=None,
+                 duration=3, action_text=None, on_action=None, overflow=False):
+        self.text = text
+        self.priority = priority
+        self.order = order
+        self.supporting_text = supporting_text
+        self.color = color
+        self.duration = duration
+        self.action_text = action_text
+        self.on_action = on_action
+        self.count = 1
+        self.overflow = overflow
+
+    def __lt__(self, other):
+        # 優先度の高いもの、同じ優先度なら先に届いたものが先
+        return (-self.priority, self.order) < (-other.priority, other.order)
+
+    @property
+    def display_text(self):
+        """スナックバーに表示する本文"""
+        if self.overflow:
+            return OVERFLOW_TEXT.format(count=self.count)
+        if self.count > 1:
+            return f"{self.text} ×{self.count}"
+        return self.text
+
+
+class NotificationQueue:
+    """
+    通知を同じ本文ごとにまとめ、優先度順に1つのスナックバーで表示するクラス
+    """
+
+    def __init__(self, min_interval=1.0, max_pending=20):
+        """
+        Args:
+            min_interval (float): 順番待ちがあるときに1つの通知を表示する秒数
+            max_pending (int): 本文ごとに分けて順番待ちにしておく通知の最大数（1以上）
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending は1以上にしてください: {max_pending}")
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self.snackbar = None    # 使い回すスナックバー（最初の通知のときに作成する）
+        self.current = None     # 表示中の通知
+        self.requested = 0      # 届いた通知の数
+        self.shown = 0          # 通知を表示した回数（差し替えを含む）
+        self.updates = 0        # スナックバーの本文などを書き換えた回数
+        self.opened = 0         # スナックバーを開いた回数
+        self.dismissed = 0      # スナックバーを閉じた回数
+        self.created = 0        # 作成したスナックバーの数
+        self._pending = []      # 順番待ちの通知のヒープ
+        self._by_text = {}      # 本文 → 順番待ちの通知
+        self._overflow = None   # 順番待ちに入りきらなかった通知をまとめたもの
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._dirty = False     # 表示中の通知の回数が増えたか
+        self._shown_at = 0.0    # 表示中の通知を表示した時刻
+        self._touched_at = 0.0  # 表示中の通知を表示した（回数が増えた）時刻
+        self._timer = None
+        # 通知はワーカースレッドからも届くので、表示はメインスレッドで1フレームに1回行う
+        self._trigger = Clock.create_trigger(lambda dt: self.process())
+        self._retry = Clock.create_trigger(lambda dt: self.process(), CLOSING_RETRY)
+
+    def notify(self, text, priority=0, supporting_text=None, color=None, duration=3,
+               action_text=None, on_action=None):
+        """
+        通知を順番待ちに追加するメソッド（どのスレッドから呼んでもよい）
+
+        表示中・順番待ちに同じ本文の通知があれば、新しく追加せずに回数を増やします。
+
+        Args:
+            text (str): 本文
+            priority (int): 優先度（大きいほど先に表示する）
+            supporting_text (str): 本文の下に表示する説明
+            color (tuple): 背景色（Noneならテーマの色）
+            duration (float): 表示する秒数（0なら閉じるボタンが押されるまで表示する）
+            action_text (str): アクションボタンの文字（Noneならボタンを表示しない）
+            on_action (callable): アクションボタンが押されたときの処理 on_action(button)
+        """
+        with self._lock:
+            self.requested += 1
+            current = self.current
+            if current is not None and not current.overflow and current.text == text:
+                current.count += 1
+                self._dirty = True
+            elif text in self._by_text:
+                entry = self._by_text[text]
+                entry.count += 1
+                if priority > entry.priority:
+                    entry.priority = priority
+                    heapq.heapify(self._pending)
+            else:
+                entry = _Notification(
+                    text, priority, next(self._order), supporting_text, color,
+                    duration, action_text, on_action
+                )
+                self._push(entry)
+        self._trigger()
+
+    def _push(self, entry):
+        """通知を順番待ちに入れる（入りきらなければ優先度の低いものをまとめる）"""
+        if len(self._by_text) >= self.max_pending:
+            # 順番待ちで最も後に表示されるものと比べ、後になる方をまとめる
+            last = max(pending for pending in self._pending if not pending.overflow)
+            if entry < last:
+                self._pending.remove(last)
+                heapq.heapify(self._pending)
+                del self._by_text[last.text]
+                self._merge_overflow(last)
+            else:
+                self._merge_overflow(entry)
+                return
+        heapq.heappush(self._pending, entry)
+        self._by_text[entry.text] = entry
+
+    def _merge_overflow(self, entry):
+        """通知を「ほかにN件の通知」にまとめる"""
+        if self._overflow is None:
+            self._overflow = _Notification(None, entry.priority, entry.order, overflow=True)
+            self._overflow.count = 0
+            heapq.heappush(self._pending, self._overflow)
+        self._overflow.count += entry.count
+
+    def _pop(self):
+        """順番待ちの先頭の通知を取り出す"""
+        entry = heapq.heappop(self._pending)
+        if entry.overflow:
+            self._overflow = None
+        else:
+            del self._by_text[entry.text]
+        return entry
+
+    def _requeue(self, entry):
+        """差し替えられた通知を順番待ちに戻す（同じ本文が届いていれば回数をまとめる）"""
+        if entry.overflow:
+            if self._overflow is None:
+                self._overflow = entry
+                heapq.heappush(self._pending, entry)
+            else:
+                self._overflow.count += entry.count
+        elif entry.text in self._by_text:
+            self._by_text[entry.text].count += entry.count
+        else:
+            heapq.heappush(self._pending, entry)
+            self._by_text[entry.text] = entry
+
+    @property
+    def queued(self):
+        """順番待ちの通知の数（まとめた後の数）"""
+        with self._lock:
+            return len(self._pending)
+
+    def process(self):
+        """
+        順番待ちの通知を表示するメソッド（メインスレッドで呼ぶ）
+
+        何も表示していなければ次の通知を開き、表示中より優先度の高い通知があれば
+        差し替えます。表示中の通知の回数が増えていれば本文を書き換えます。
+        """
+        with self._lock:
+            top = self._pending[0] if self._pending else None
+            entry = None
+            if self.current is None:
+                if top is None:
+                    return
+                if self.snackbar is not None and self.snackbar.parent is not None:
+                    # 閉じるアニメーションが終わるまで開き直せない
+                    self._retry()
+                    return
+                entry = self._pop()
+            elif top is not None and top.priority > self.current.priority:
+                self._requeue(self.current)
+                entry = self._pop()
+            dirty = self._dirty
+            self._dirty = False
+        if entry is not None:
+            self._show(entry)
+        elif dirty:
+            self.snackbar.text_label.text = self.current.display_text
+            self.updates += 1
+            self._touched_at = time.monotonic()
+        self._schedule_next()
+
+    def _create(self):
+        """使い回すスナックバーを作成する"""
+        text_label = MDSnackbarText(text="")
+        supporting_label = MDSnackbarSupportingText(text="")
+        action_button = MDSnackbarActionButton(text="", on_release=self._press_action)
+        close_button = MDSnackbarCloseButton(
+            icon="close",
+            on_release=lambda button: self.dismiss_current()
+        )
+        button_container = MDSnackbarButtonContainer()
+        button_container.add_widget(action_button)
+        button_container.add_widget(close_button)
+
+        snackbar = MDSnackbar(
+            text_label,
+            supporting_label,
+            button_container,
+            y=dp(24),
+            pos_hint={"center_x": 0.5},
+            size_hint_x=0.9,
+            duration=0,  # 閉じる時刻はこのクラスで管理する
+        )
+        snackbar.text_label = text_label
+        snackbar.supporting_label = supporting_label
+        snackbar.action_button = action_button
+        snackbar.default_color = list(snackbar.md_bg_color)
+        self.created += 1
+        return snackbar
+
+    def _show(self, entry):
+        """通知の本文・色・ボタンをスナックバーに設定して表示する"""
+        if self.snackbar is None:
+            self.snackbar = self._create()
+        snackbar = self.snackbar
+        self.current = entry
+        self._shown_at = self._touched_at = time.monotonic()
+
+        snackbar.text_label.text = entry.display_text
+        snackbar.supporting_label.text = entry.supporting_text or ""
+        snackbar.md_bg_color = entry.color or snackbar.default_color
+        has_action = entry.action_text is not None
+        snackbar.action_button.text = entry.action_text or ""
+        snackbar.action_button.opacity = 1 if has_action else 0
+        snackbar.action_button.disabled = not has_action
+        self.updates += 1
+        self.shown += 1
+
+        if snackbar.parent is None:
+            snackbar.open()
+            self.opened += 1
+
+    def _schedule_next(self):
+        """表示中の通知を切り替える（閉じる）時刻にタイマーを設定する"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.current is None:
+            return
+        with self._lock:
+            top = self._pending[0] if self._pending else None
+        if top is not None and top.priority >= self.current.priority:
+            # 同じか高い優先度の順番待ちがあれば min_interval 秒で次に切り替える
+            # （低い優先度の通知のために、エラーなどを早く閉じない）
+            deadline = self._shown_at + self.min_interval
+        elif self.current.duration:
+            # 回数が増えたら、そこから duration 秒表示する
+            deadline = self._touched_at + self.current.duration
+        else:
+            return
+        self._timer = Clock.schedule_once(
+            self._advance, max(0.0, deadline - time.monotonic())
+        )
+
+    def _advance(self, *args):
+        """表示中の通知を終え、次の通知に切り替える（なければ閉じる）"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        with self._lock:
+            entry = self._pop() if self._pending else None
+            self.current = None
+            self._dirty = False
+        if entry is not None:
+            self._show(entry)
+            self._schedule_next()
+        elif self.snackbar is not None and self.snackbar.parent is not None:
+            self.snackbar.dismiss()
+            self.dismissed += 1
+
+    def dismiss_current(self):
+        """表示中の通知を閉じるメソッド（順番待ちがあれば次の通知を表示する）"""
+        if self.current is not None:
+            self._advance()
+
+    def _press_action(self, button):
+        """アクションボタンが押されたときに、表示中の通知の処理を呼んでから閉じる"""
+        entry = self.current
+        if entry is None or entry.on_action is None:
+            return
+        self.dismiss_current()
+        entry.on_action(button)
+
+    def debug_counts(self):
+        """
+        通知とウィジェットの操作の数を返すメソッド（まとめられているかの確認用）
+
+        Returns:
+            dict: requested（届いた数）、shown（表示した数）、queued（順番待ち）、
+                  widget_ops（ウィジェットの操作の回数）、created（作成したスナックバーの数）
+        """
+        return {
+            "requested": self.requested,
+            "shown": self.shown,
+            "queued": self.queued,
+            "widget_ops": self.updates + self.opened + self.dismissed,
+            "created": self.created,
+        }
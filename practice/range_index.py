@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+range_index.py - 評価・距離の範囲で絞り込むための並べ替え済みインデックス
+
+「評価 4.3 以上」「距離 300m 以内」のような範囲の条件で
+RestaurantStore の行を絞り込むためのモジュールです。
+
+- RangeIndex: 列の値で並べ替えた行番号と値のリスト。
+  範囲に入る行は二分探索（bisect）で位置を求め、その間を切り出すだけで求まる
+- RangeFilter: 現在の範囲に入る行のビットセットを保持する。
+  スライダーを動かして範囲が変わったときは、範囲の端が動いた分の行だけ
+  bytearray のビットをその場で反転するので、1回の更新は O(log n + 動いた行数) で済む。
+  int のビットセット（bits）への変換は、変わった後に初めて読むときに1回だけ行う
+
+ビットセットは facet_filter.py と同じ形式（Python の int）なので、
+FacetFilter.add_range() でカテゴリのチップなどと組み合わせられます。
+
+使い方:
+    ratings = RangeIndex([store.rating(row) for row in range(len(store))])
+    ratings.rows_between(4.3, None)        # 評価 4.3 以上の行番号
+    rating_filter = RangeFilter(ratings)
+    rating_filter.set_range(4.3, None)     # rating_filter.bits が更新される
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+def packed_from_rows(rows, size):
+    """
+    行番号のリストから、ビットを立てた bytearray を作る関数
+
+    Args:
+        rows (iterable): 行番号
+        size (int): 行数
+
+    Returns:
+        bytearray: 行番号 row のビットは array[row >> 3] >> (row & 7) & 1
+    """
+    array = bytearray((size + 7) // 8)
+    for row in rows:
+        array[row >> 3] |= 1 << (row & 7)
+    return array
+
+
+def bitset_from_rows(rows, size):
+    """
+    行番号のリストからビットセットを作る関数
+
+    Args:
+        rows (iterable): 行番号
+        size (int): 行数
+
+    Returns:
+        int: ビットセット
+    """
+    return int.from_bytes(packed_from_rows(rows, size), "little")
+
+
+class RangeIndex:
+    """
+    列の値で並べ替えた行番号を保持するクラス
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values (sequence): 行番号の順に並んだ列の値
+        """
+        self.rows = sorted(range(len(values)), key=values.__getitem__)
+        self.values = [values[row] for row in self.rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def span(self, low=None, high=None):
+        """
+        low 以上 high 以下の値が並んでいる位置を二分探索で求めるメソッド
+
+        Args:
+            low: 下限（Noneなら下限なし）
+            high: 上限（Noneなら上限なし）
+
+        Returns:
+            tuple: (開始位置, 終了位置 + 1)
+        """
+        start = 0 if low is None else bisect_left(self.values, low)
+        stop = len(self.values) if high is None else bisect_right(self.values, high)
+        return start, max(start, stop)
+
+    def rows_between(self, low=None, high=None):
+        """
+        low 以上 high 以下の値を持つ行番号を返すメソッド（値の小さい順）
+
+        Args:
+            low: 下限（Noneなら下限なし）
+            high: 上限（Noneなら上限なし）
+
+        Returns:
+            list: 行番号のリスト
+        """
+        start, stop = self.span(low, high)
+        return self.rows[start:stop]
+
+    def insert(self, row, value):
+        """
+        行を追加するメソッド（並び順を保ったまま挿入する）
+
+        Args:
+            row (int): 行番号
+            value: 列の値
+        """
+        position = bisect_right(self.values, value)
+        self.values.insert(position, value)
+        self.rows.insert(position, row)
+
+
+class RangeFilter:
+    """
+    RangeIndex の範囲に入る行のビットセットを保持するクラス
+    """
+
+    def __init__(self, index, size=None):
+        """
+        Args:
+            index (RangeIndex): 絞り込みに使うインデックス
+            size (int): 行数（Noneならインデックスの件数）
+        """
+        self.index = index
+        self.size = len(index) if size is None else size
+        self.low = None
+        self.high = None
+        self.start, self.stop = index.span()
+        self.packed = packed_from_rows(index.rows, self.size)
+        self._bits = None  # packed を int にしたもの（packed が変わったら作り直す）
+
+    @property
+    def bits(self):
+        """範囲に入る行のビットセット（int）"""
+        if self._bits is None:
+            self._bits = int.from_bytes(self.packed, "little")
+        return self._bits
+
+    def set_range(self, low=None, high=None):
+        """
+        範囲を変更するメソッド
+
+        前の範囲と新しい範囲で、始まりの位置の間と終わりの位置の間にある行だけ
+        ビットを反転します。2つの間は別々に XOR で反転するので、
+        両方に含まれる行（範囲が重ならないほど大きく動いたとき）は2回反転して元に戻ります。
+
+        Args:
+            low: 下限（Noneなら下限なし）
+            high: 上限（Noneなら上限なし）
+
+        Returns:
+            list: ビットを反転した行番号（範囲に入る行が変わらなければ空のリスト）
+        """
+        start, stop = self.index.span(low, high)
+        self.low, self.high = low, high
+        if (start, stop) == (self.start, self.stop):
+            return []
+
+        rows = self.index.rows
+        packed = self.packed
+        toggled = []
+        for old, new in ((self.start, start), (self.stop, stop)):
+            edge = rows[min(old, new):max(old, new)]
+            for row in edge:
+                packed[row >> 3] ^= 1 << (row & 7)
+            toggled += edge
+        self._bits = None
+        self.start, self.stop = start, stop
+        return toggled
+
+    def add(self, row, value):
+        """
+        行を追加するメソッド（ページ単位で行が増えるとき用）
+
+        Args:
+            row (int): 行番号
+            value: 列の値
+        """
+        self.index.insert(row, value)
+        self.size = max(self.size, row + 1)
+        self.start, self.stop = self.index.span(self.low, self.high)
+        if len(self.packed) < (self.size + 7) // 8:
+            self.packed.extend(bytes((self.size + 7) // 8 - len(self.packed)))
+        if (self.low is None or value >= self.low) and (self.high is None or value <= self.high):
+            self.packed[row >> 3] |= 1 << (row & 7)
+            self._bits = None
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+recycle_list.py - データ駆動のリスト（RecycleViewを使ったMDList）
+
+MDList にリストアイテムを1行ずつ追加し、行ごとに lambda を作る代わりに、
+行のデータ（dict）のリストを渡すだけで表示できるリストです。
+- 画面に見えている行のウィジェットだけを作成して使い回す
+- タップは1つのイベント on_row_press で受け取り、行番号（data内の位置）が渡される
+
+使い方:
+    sample_list = RecycleList(on_row_press=self.on_row_press)
+    sample_list.data = [{"text": "1行目", "secondary_text": "説明"}, ...]
+
+    def on_row_press(self, instance, index):
+        ...
+
+formatter を指定すると、data には行番号などの最小限の値だけを入れ、
+表示する文字は表示するときに formatter(data) で作成できます。
+"""
+
+from kivymd.uix.list import OneLineListItem, TwoLineListItem
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.metrics import dp
+
+
+class RecycleListRowBehavior(RecycleDataViewBehavior):
+    """
+    RecycleList の行ウィジェットに共通の処理
+
+    データの表示と、タップされたときの on_row_press の発行を行います。
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.index = None
+        self.list_view = None
+        self.bind(on_release=self.dispatch_row_press)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """
+        行に表示するデータを設定するメソッド
+
+        Args:
+            rv (RecycleList): 親のリスト
+            index (int): data内の位置
+            data (dict): 行のデータ
+        """
+        self.index = index
+        self.list_view = rv
+        values = rv.formatter(data) if rv.formatter is not None else data
+        self.text = values.get("text", "")
+        if hasattr(self, "secondary_text"):
+            self.secondary_text = values.get("secondary_text", "")
+
+    def dispatch_row_press(self, *args):
+        """タップされた行の番号でリストの on_row_press を発行する"""
+        if self.list_view is not None:
+            self.list_view.dispatch("on_row_press", self.index)
+
+
+class RecycleOneLineRow(RecycleListRowBehavior, OneLineListItem):
+    """1行のリストアイテム（text）"""
+
+
+class RecycleTwoLineRow(RecycleListRowBehavior, TwoLineListItem):
+    """2行のリストアイテム（text, secondary_text）"""
+
+
+# 行の種類 → (行ウィジェットのクラス, 行の高さ)
+ROW_TYPES = {
+    "one_line": (RecycleOneLineRow, dp(48)),
+    "two_line": (RecycleTwoLineRow, dp(72)),
+}
+
+
+class RecycleList(RecycleView):
+    """
+    データ駆動のリスト
+
+    イベント:
+        on_row_press(instance, index): 行がタップされたときに発行される
+    """
+
+    __events__ = ("on_row_press",)
+
+    def __init__(self, row_type="two_line", formatter=None, **kwargs):
+        """
+        Args:
+            row_type (str): 行の種類（"one_line" または "two_line"）
+            formatter (callable): data の要素から表示用の dict を作る関数
+        """
+        super().__init__(**kwargs)
+        self.formatter = formatter
+        viewclass, row_height = ROW_TYPES[row_type]
+        self.viewclass = viewclass
+
+        # 行を縦に並べるレイアウト
+        layout = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, row_height),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+
+    def on_row_press(self, index):
+        """行がタップされたときのデフォルトの処理（何もしない）"""
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+restaurant_dataset.py - メモリマップで読み込む飲食店データファイル
+
+飲食店データをバイナリファイル（.rstd）に保存し、
+mmap で開いて必要な行だけを読み出すためのモジュールです。
+ファイルを開くときに全件を読み込まないため、
+起動時間はデータの件数に依存しません。
+
+ファイル形式（数値はすべてリトルエンディアン）:
+    ヘッダー       : マジック "RSTD"、バージョン、行数、カテゴリ数、各セクションの位置
+    カテゴリ位置   : uint32 × (カテゴリ数 + 1)  文字列ヒープ内の開始位置
+    評価           : float32 × 行数
+    距離           : uint32 × 行数（メートル）
+    カテゴリ番号   : uint16 × 行数
+    店名位置       : uint32 × (行数 + 1)
+    住所位置       : uint32 × (行数 + 1)
+    緯度           : float64 × 行数（分からない店は NaN）
+    経度           : float64 × 行数
+    文字列ヒープ   : UTF-8 の文字列を連結したもの
+
+バージョン1のファイル（緯度・経度のセクションがない）も読み込めます。
+その場合、緯度・経度はすべて NaN になります。
+
+各列は固定長の配列として並んでいるので、
+memoryview.cast() でコピーせずに配列として参照できます。
+
+使い方:
+    from restaurant_dataset import load_store, write_dataset
+
+    write_dataset(store, "data/restaurants.rstd")   # 変換（tools/convert_restaurants.py）
+    store = load_store()                            # data/ にファイルがあればmmapで開く
+"""
+
+import math
+import mmap
+import os
+import struct
+from array import array
+
+from restaurants import RestaurantStore, SAMPLE_RESTAURANTS
+
+
+# 既定のデータファイル（リポジトリの data/restaurants.rstd）
+DATASET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "restaurants.rstd"
+)
+
+MAGIC = b"RSTD"
+VERSION = 2
+
+# セクションの並び順
+SECTIONS = (
+    "category_offsets",
+    "ratings",
+    "distances",
+    "category_codes",
+    "name_offsets",
+    "address_offsets",
+    "latitudes",
+    "longitudes",
+    "heap",
+)
+
+# マジック, バージョン, 予約, 行数, カテゴリ数, 各セクションの開始位置 × 9
+HEADER = struct.Struct(f"<4sHHII{len(SECTIONS)}Q")
+
+# バージョンごとのヘッダーとセクションの並び順（読み込み用）
+LAYOUTS = {
+    1: (struct.Struct("<4sHHII7Q"), tuple(name for name in SECTIONS
+                                          if name not in ("latitudes", "longitudes"))),
+    VERSION: (HEADER, SECTIONS),
+}
+
+# マジックとバージョン（ヘッダーの先頭）
+PREFIX = struct.Struct("<4sH")
+
+
+class StringColumn:
+    """
+    文字列ヒープ内の文字列を行番号で取り出す読み取り専用の列
+
+    list と同じように column[row] と len(column) が使えます。
+    """
+
+    def __init__(self, heap, offsets):
+        """
+        Args:
+            heap (memoryview): 文字列ヒープ
+            offsets (memoryview): 各文字列の開始位置（行数 + 1 個）
+        """
+        self.heap = heap
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        return str(self.heap[self.offsets[row]:self.offsets[row + 1]], "utf-8")
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+
+class MappedRestaurantStore(RestaurantStore):
+    """
+    データファイルをmmapで開いた読み取り専用の RestaurantStore
+
+    列は mmap 上の memoryview なので、アクセスした行だけが
+    ディスクから読み込まれます。
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): データファイルのパス
+        """
+        super().__init__()
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version not in LAYOUTS:
+            self._mmap.close()
+            raise ValueError(f"飲食店データファイルではありません: {path}")
+        header, section_names = LAYOUTS[version]
+        _magic, _version, _reserved, rows, category_count, *offsets = \
+            header.unpack_from(self._mmap, 0)
+
+        view = memoryview(self._mmap)
+        sections = dict(zip(section_names, offsets))
+        sizes = {
+            "category_offsets": (category_count + 1, "I"),
+            "ratings": (rows, "f"),
+            "distances": (rows, "I"),
+            "category_codes": (rows, "H"),
+            "name_offsets": (rows + 1, "I"),
+            "address_offsets": (rows + 1, "I"),
+            "latitudes": (rows, "d"),
+            "longitudes": (rows, "d"),
+        }
+        columns = {}
+        for name, (count, typecode) in sizes.items():
+            if name not in sections:
+                # 古いバージョンのファイルには緯度・経度がない
+                columns[name] = array(typecode, [math.nan]) * count
+                continue
+            start = sections[name]
+            end = start + count * struct.calcsize(typecode)
+            columns[name] = view[start:end].cast(typecode)
+        heap = view[sections["heap"]:]
+
+        self.ratings = columns["ratings"]
+        self.distances = columns["distances"]
+        self.category_codes = columns["category_codes"]
+        self.latitudes = columns["latitudes"]
+        self.longitudes = columns["longitudes"]
+        self.names = StringColumn(heap, columns["name_offsets"])
+        self.addresses = StringColumn(heap, columns["address_offsets"])
+        # カテゴリは数が少ないので開くときに読み込んでおく
+        self.categories = list(StringColumn(heap, columns["category_offsets"]))
+        self.category_ids = {name: code for code, name in enumerate(self.categories)}
+
+    def append(self, name, category, address, rating, distance,
+               latitude=math.nan, longitude=math.nan):
+        """データファイルは読み取り専用のため追加できない"""
+        raise TypeError("MappedRestaurantStore は読み取り専用です")
+
+
+def _align(offset, size=8):
+    """offset を size の倍数に切り上げる"""
+    return (offset + size - 1) // size * size
+
+
+def write_dataset(store, path):
+    """
+    RestaurantStore をデータファイルに書き出す関数
+
+    Args:
+        store (RestaurantStore): 書き出すストア
+        path (str): 出力先のパス
+    """
+    heap = bytearray()
+
+    def add_strings(values):
+        offsets = array("I", [len(heap)])
+        for value in values:
+            heap.extend(value.encode("utf-8"))
+            offsets.append(len(heap))
+        return offsets
+
+    # 店名・住所・カテゴリの位置は全体で1つのヒープを共有する
+    name_offsets = add_strings(store.names)
+    address_offsets = add_strings(store.addresses)
+    category_offsets = add_strings(store.categories)
+
+    payloads = {
+        "category_offsets": category_offsets.tobytes(),
+        "ratings": array("f", store.ratings).tobytes(),
+        "distances": array("I", store.distances).tobytes(),
+        "category_codes": array("H", store.category_codes).tobytes(),
+        "name_offsets": name_offsets.tobytes(),
+        "address_offsets": address_offsets.tobytes(),
+        "latitudes": array("d", store.latitudes).tobytes(),
+        "longitudes": array("d", store.longitudes).tobytes(),
+        "heap": bytes(heap),
+    }
+
+    offsets = []
+    position = _align(HEADER.size)
+    for name in SECTIONS:
+        offsets.append(position)
+        position = _align(position + len(payloads[name]))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(store), len(store.categories), *offsets))
+        for name, offset in zip(SECTIONS, offsets):
+            f.seek(offset)
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+
+
+def load_store(path=DATASET_PATH):
+    """
+    飲食店データを読み込む関数
+
+    データファイルがあればmmapで開き、なければサンプルデータを使います。
+
+    Args:
+        path (str): データファイルのパス
+
+    Returns:
+        RestaurantStore: 飲食店データ
+    """
+    if os.path.exists(path):
+        return MappedRestaurantStore(path)
+    return RestaurantStore.from_records(SAMPLE_RESTAURANTS)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+restaurant_source.py - 飲食店データのページ単位の読み込み
+
+JSON Lines（.jsonl）や SQLite（.sqlite3）の飲食店データを
+一定件数（ページ）ずつ読み込むためのモジュールです。
+読み込みはワーカースレッドで行い、読み込んだページは
+メインスレッド（Kivyの描画スレッド）で RestaurantStore に追加します。
+ファイル全体を読み終える前に最初の画面を表示できます。
+
+使い方:
+    source = find_source()            # data/ にファイルがなければ None
+    store = RestaurantStore()
+    loader = PagedLoader(source, store, on_page=self.on_page_loaded,
+                         wants_more=self.needs_more_rows, on_error=self.on_load_error)
+    loader.load_next()                # スクロールが末尾に近づいたら再度呼ぶ
+    loader.close()                    # アプリの終了時（on_stop）に呼ぶ
+"""
+
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+from restaurants import parse_coordinate, parse_distance
+
+
+# データファイルのディレクトリ（リポジトリの data/）
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+)
+
+# find_source() が探すファイル（見つかった最初のファイルを使う）
+SOURCE_FILES = ("restaurants.jsonl", "restaurants.sqlite3")
+
+
+class RestaurantSource:
+    """
+    飲食店データの読み込み元のインターフェース
+
+    read_page() は先頭から順番に呼ばれ、
+    前回の続きから最大 limit 件のレコードを返します。
+    """
+
+    def read_page(self, limit):
+        """
+        次のページを読み込むメソッド（ワーカースレッドで呼ばれる）
+
+        Args:
+            limit (int): 最大件数
+
+        Returns:
+            list: name, category, address, rating, distance を持つ dict のリスト
+                  （latitude, longitude は省略可能。空のリストなら最後まで読み終えた）
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """ファイルを閉じるメソッド"""
+
+
+class JsonLinesSource(RestaurantSource):
+    """1行に1件のJSONが書かれたファイルを先頭から順に読み込む"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): .jsonl ファイルのパス
+        """
+        self.path = path
+        self._file = None
+
+    def read_page(self, limit):
+        if self._file is None:
+            self._file = open(self.path, encoding="utf-8")
+        records = []
+        for line in self._file:
+            if line.strip():
+                records.append(json.loads(line))
+                if len(records) >= limit:
+                    break
+        return records
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteSource(RestaurantSource):
+    """
+    SQLite の restaurants テーブルを rowid の順に読み込む
+
+    テーブルには name, category, address, rating, distance の列が必要です
+    （latitude, longitude の列があれば緯度・経度も読み込みます）。
+    OFFSET ではなく「前回の最後の rowid より後」で絞り込むため、
+    後ろのページでも読み込み時間は変わりません。
+    """
+
+    def __init__(self, path, table="restaurants"):
+        """
+        Args:
+            path (str): .sqlite3 ファイルのパス
+            table (str): テーブル名
+        """
+        self.path = path
+        self.table = table
+        self._connection = None
+        self._last_rowid = 0
+
+    def read_page(self, limit):
+        # 接続は読み込みを行うワーカースレッドで作成する
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            # 列名で値を取り出す（緯度・経度の列がないテーブルも読めるようにする）
+            self._connection.row_factory = sqlite3.Row
+        rows = self._connection.execute(
+            f"SELECT rowid AS _rowid, * "
+            f"FROM {self.table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (self._last_rowid, limit)
+        ).fetchall()
+        records = []
+        for row in rows:
+            record = dict(row)
+            self._last_rowid = record.pop("_rowid")
+            records.append(record)
+        return records
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def open_source(path):
+    """
+    拡張子に応じた読み込み元を作成する関数
+
+    Args:
+        path (str): .jsonl または .sqlite3 / .db ファイルのパス
+
+    Returns:
+        RestaurantSource: 読み込み元
+    """
+    if path.endswith(".jsonl"):
+        return JsonLinesSource(path)
+    if path.endswith((".sqlite3", ".db")):
+        return SQLiteSource(path)
+    raise ValueError(f"対応していないファイル形式です: {path}")
+
+
+def find_source(data_dir=DATA_DIR):
+    """
+    data/ ディレクトリにある飲食店データの読み込み元を返す関数
+
+    Returns:
+        RestaurantSource: 読み込み元（ファイルがなければNone）
+    """
+    for filename in SOURCE_FILES:
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            return open_source(path)
+    return None
+
+
+class PagedLoader:
+    """
+    読み込み元からページ単位でデータを読み込み、ストアに追加するクラス
+
+    load_next() を呼ぶと、ワーカースレッドで次のページを読み込みます。
+    読み込みが終わると、メインスレッドでストアに追加してから
+    on_page(開始行, 終了行) を呼び出します。
+    読み込み中に load_next() を呼んでも、二重には読み込みません。
+
+    最初のページが画面を埋めないとスクロールが起きず、次のページを読み込めないため、
+    ページ追加後の次のフレームで wants_more() がTrueを返せば続けて読み込みます。
+    読み込みに失敗したとき（壊れた行やSQLiteのエラー）は例外を送出せず、
+    ログに出力して on_error(例外) を呼び、読み込みを終了します。
+    """
+
+    def __init__(self, source, store, page_size=50, on_page=None, wants_more=None,
+                 on_error=None):
+        """
+        Args:
+            source (RestaurantSource): 読み込み元
+            store (RestaurantStore): 追加先のストア
+            page_size (int): 1ページの件数
+            on_page (callable): ページ追加後に呼ぶ関数 on_page(start, end)
+            wants_more (callable): 続けて次のページが必要ならTrueを返す関数 wants_more()
+            on_error (callable): 読み込みに失敗したときに呼ぶ関数 on_error(exception)
+        """
+        self.source = source
+        self.store = store
+        self.page_size = page_size
+        self.on_page = on_page
+        self.wants_more = wants_more
+        self.on_error = on_error
+        self.loading = False
+        self.finished = False
+        self.error = None  # 読み込みに失敗したときの例外
+        self._closed = False
+        # 読み込み元は1つのスレッドからだけ使う
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def load_next(self):
+        """
+        次のページの読み込みを開始するメソッド
+
+        Returns:
+            bool: 読み込みを開始した場合はTrue
+        """
+        if self.loading or self.finished:
+            return False
+        self.loading = True
+        future = self._executor.submit(self.source.read_page, self.page_size)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._apply_page(f), 0)
+        )
+        return True
+
+    def _apply_page(self, future):
+        """読み込んだページをストアに追加する（メインスレッドで実行）"""
+        self.loading = False
+        if self._closed:
+            return  # 読み込み中に close() された
+        start = len(self.store)
+        try:
+            records = future.result()
+            for record in records:
+                self.store.append(
+                    record["name"],
+                    record["category"],
+                    record["address"],
+                    record["rating"],
+                    parse_distance(record["distance"]),
+                    parse_coordinate(record.get("latitude")),
+                    parse_coordinate(record.get("longitude"))
+                )
+        except Exception as error:
+            # 壊れた行より前に追加できた行は表示する
+            self._fail(error)
+        else:
+            if len(records) < self.page_size:
+                self.close()
+
+        if len(self.store) > start and self.on_page is not None:
+            self.on_page(start, len(self.store))
+        if not self.finished and self.wants_more is not None:
+            # 追加した行のレイアウトが終わってから、画面が埋まったかを確認する
+            Clock.schedule_once(self._load_more_if_wanted, 0)
+
+    def _load_more_if_wanted(self, dt):
+        """wants_more() がTrueなら次のページを読み込む"""
+        if self.wants_more():
+            self.load_next()
+
+    def _fail(self, error):
+        """読み込みに失敗したときに、ログに出力して読み込みを終了する"""
+        Logger.warning(f"PagedLoader: 飲食店データを読み込めませんでした: {error!r}")
+        self.error = error
+        self.close()
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def close(self):
+        """読み込み元とワーカースレッドを終了するメソッド"""
+        if self._closed:
+            return
+        self._closed = True
+        self.finished = True
+        self._executor.submit(self.source.close)
+        self._executor.shutdown(wait=False)
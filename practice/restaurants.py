@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+
+"""
+restaurants.py - 飲食店データの列指向ストア
+
+03_cards.py と 05_lists.py で使う飲食店データを管理するモジュールです。
+1件ごとに dict を作るのではなく、項目（列）ごとに配列で保持します。
+- 店名・住所: 文字列のリスト
+- カテゴリ: カテゴリ番号の配列（カテゴリ名は1回だけ保持）
+- 評価: float の配列
+- 距離: メートル単位の整数の配列（"150m" のような文字列は表示時に作成）
+- 緯度・経度: float の配列（分からない店は NaN）
+
+並べ替えや絞り込みは列の配列に対して行い、
+画面に表示するときだけ行番号から値を取り出します。
+
+使い方:
+    from restaurants import RestaurantStore, SAMPLE_RESTAURANTS
+
+    store = RestaurantStore.from_records(SAMPLE_RESTAURANTS)
+    store.name(0)               # "ラーメン大将"
+    store.distance_text(0)      # "150m"
+    store.distance_text(0, DEFAULT_POSITION)   # 現在地からの距離を計算して表示
+"""
+
+import math
+import random
+from array import array
+
+from geo_index import METERS_PER_DEGREE, distance_between
+
+
+# 現在地が分からないときに使う位置（渋谷駅の緯度・経度）
+DEFAULT_POSITION = (35.6580, 139.7016)
+
+# サンプル飲食店データ（distance は DEFAULT_POSITION からの距離）
+SAMPLE_RESTAURANTS = [
+    {
+        "name": "ラーメン大将",
+        "category": "ラーメン",
+        "address": "東京都渋谷区1-2-3",
+        "rating": 4.5,
+        "distance": "150m",
+        "latitude": 35.65935,
+        "longitude": 139.7016
+    },
+    {
+        "name": "カフェモカ",
+        "category": "カフェ",
+        "address": "東京都渋谷区2-3-4",
+        "rating": 4.2,
+        "distance": "200m",
+        "latitude": 35.658,
+        "longitude": 139.70381
+    },
+    {
+        "name": "カレーハウス",
+        "category": "カレー",
+        "address": "東京都渋谷区3-4-5",
+        "rating": 4.7,
+        "distance": "300m",
+        "latitude": 35.6553,
+        "longitude": 139.7016
+    },
+    {
+        "name": "和食処 さくら",
+        "category": "和食",
+        "address": "東京都渋谷区4-5-6",
+        "rating": 4.3,
+        "distance": "400m",
+        "latitude": 35.658,
+        "longitude": 139.69717
+    },
+    {
+        "name": "イタリアン トマト",
+        "category": "イタリアン",
+        "address": "東京都渋谷区5-6-7",
+        "rating": 4.6,
+        "distance": "500m",
+        "latitude": 35.66118,
+        "longitude": 139.70551
+    },
+]
+
+# カテゴリごとの絵文字（リスト表示でアイコンの代わりに使う）
+CATEGORY_ICONS = {
+    "ラーメン": "🍜",
+    "カフェ": "☕",
+    "カレー": "🍛",
+    "和食": "🍱",
+    "イタリアン": "🍝",
+}
+
+
+def parse_distance(text):
+    """
+    距離の文字列をメートル単位の整数に変換する関数
+
+    Args:
+        text (str): "150m"、"1.2km" のような文字列（数値ならそのまま使う）
+
+    Returns:
+        int: メートル単位の距離
+    """
+    if isinstance(text, (int, float)):
+        return int(text)
+    text = text.strip().lower()
+    if text.endswith("km"):
+        return int(round(float(text[:-2]) * 1000))
+    if text.endswith("m"):
+        return int(round(float(text[:-1])))
+    return int(round(float(text)))
+
+
+def format_distance(meters):
+    """
+    メートル単位の距離を表示用の文字列に変換する関数
+
+    Args:
+        meters (int): メートル単位の距離
+
+    Returns:
+        str: "150m"、"1.2km" のような文字列
+    """
+    if meters < 1000:
+        return f"{meters}m"
+    return f"{meters / 1000:.1f}km"
+
+
+def parse_coordinate(value):
+    """
+    緯度・経度の値を float に変換する関数
+
+    Args:
+        value: 数値、数値の文字列、または None / ""（分からない場合）
+
+    Returns:
+        float: 緯度・経度（分からない場合は NaN）
+    """
+    if value is None or value == "":
+        return math.nan
+    return float(value)
+
+
+class RestaurantStore:
+    """
+    飲食店データを列ごとの配列で保持するストア
+
+    行番号（0から始まる整数）で各列の値を取り出します。
+    """
+
+    def __init__(self):
+        self.names = []
+        self.addresses = []
+        self.categories = []               # カテゴリ名の一覧（番号 → 名前）
+        self.category_ids = {}             # カテゴリ名 → 番号
+        self.category_codes = array("H")   # 各行のカテゴリ番号
+        self.ratings = array("f")
+        self.distances = array("I")        # メートル単位
+        self.latitudes = array("d")        # 分からない店は NaN
+        self.longitudes = array("d")
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        dict のリストからストアを作成するメソッド
+
+        Args:
+            records (list): name, category, address, rating, distance を持つ dict のリスト
+                            （latitude, longitude は省略可能）
+
+        Returns:
+            RestaurantStore: 作成したストア
+        """
+        store = cls()
+        for record in records:
+            store.append(
+                record["name"],
+                record["category"],
+                record["address"],
+                record["rating"],
+                parse_distance(record["distance"]),
+                parse_coordinate(record.get("latitude")),
+                parse_coordinate(record.get("longitude"))
+            )
+        return store
+
+    def __len__(self):
+        return len(self.names)
+
+    def category_code(self, category):
+        """
+        カテゴリ名に対応する番号を返すメソッド（新しいカテゴリなら登録する）
+
+        Args:
+            category (str): カテゴリ名
+
+        Returns:
+            int: カテゴリ番号
+        """
+        code = self.category_ids.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self.category_ids[category] = code
+        return code
+
+    def append(self, name, category, address, rating, distance,
+               latitude=math.nan, longitude=math.nan):
+        """
+        1件追加するメソッド
+
+        Args:
+            name (str): 店名
+            category (str): カテゴリ名
+            address (str): 住所
+            rating (float): 評価
+            distance (int): メートル単位の距離
+            latitude (float): 緯度（分からなければ NaN）
+            longitude (float): 経度（分からなければ NaN）
+
+        Returns:
+            int: 追加した行の行番号
+        """
+        self.names.append(name)
+        self.addresses.append(address)
+        self.category_codes.append(self.category_code(category))
+        self.ratings.append(rating)
+        self.distances.append(distance)
+        self.latitudes.append(latitude)
+        self.longitudes.append(longitude)
+        return len(self.names) - 1
+
+    def name(self, row):
+        """店名を返す"""
+        return self.names[row]
+
+    def address(self, row):
+        """住所を返す"""
+        return self.addresses[row]
+
+    def category(self, row):
+        """カテゴリ名を返す"""
+        return self.categories[self.category_codes[row]]
+
+    def rating(self, row):
+        """評価を小数第1位に丸めて返す（float32 の誤差を表示しないため）"""
+        return round(self.ratings[row], 1)
+
+    def distance_to(self, row, position):
+        """
+        指定した位置からの距離を返すメソッド
+
+        Args:
+            row (int): 行番号
+            position (tuple): (緯度, 経度)
+
+        Returns:
+            int: メートル単位の距離（店の緯度・経度が分からなければ保存されている距離）
+        """
+        latitude = self.latitudes[row]
+        longitude = self.longitudes[row]
+        if math.isnan(latitude) or math.isnan(longitude):
+            return self.distances[row]
+        return int(round(distance_between(position[0], position[1], latitude, longitude)))
+
+    def distance_text(self, row, position=None):
+        """
+        距離を表示用の文字列で返すメソッド
+
+        Args:
+            row (int): 行番号
+            position (tuple): 現在地の (緯度, 経度)（Noneなら保存されている距離）
+
+        Returns:
+            str: "150m" のような文字列
+        """
+        if position is None:
+            return format_distance(self.distances[row])
+        return format_distance(self.distance_to(row, position))
+
+    def record(self, row):
+        """
+        1件分のデータを dict で返すメソッド
+
+        Args:
+            row (int): 行番号
+
+        Returns:
+            dict: name, category, address, rating, distance
+                  （緯度・経度が分かる店は latitude, longitude も）を持つ dict
+        """
+        record = {
+            "name": self.name(row),
+            "category": self.category(row),
+            "address": self.address(row),
+            "rating": self.rating(row),
+            "distance": self.distance_text(row),
+        }
+        if not math.isnan(self.latitudes[row]):
+            record["latitude"] = self.latitudes[row]
+            record["longitude"] = self.longitudes[row]
+        return record
+
+    def rows_in_category(self, category, rows=None):
+        """
+        指定したカテゴリの行番号を返すメソッド
+
+        Args:
+            category (str): カテゴリ名
+            rows (iterable): 対象の行番号（Noneなら全件）
+
+        Returns:
+            list: 行番号のリスト
+        """
+        code = self.category_ids.get(category)
+        if code is None:
+            return []
+        codes = self.category_codes
+        if rows is None:
+            rows = range(len(self))
+        return [row for row in rows if codes[row] == code]
+
+    def sorted_rows(self, column, reverse=False, rows=None):
+        """
+        列の値で並べ替えた行番号を返すメソッド
+
+        Args:
+            column (str): 列名（"names"、"ratings"、"distances" など）
+            reverse (bool): 降順にするか
+            rows (iterable): 対象の行番号（Noneなら全件）
+
+        Returns:
+            list: 行番号のリスト
+        """
+        values = getattr(self, column)
+        if rows is None:
+            rows = range(len(self))
+        return sorted(rows, key=values.__getitem__, reverse=reverse)
+
+
+def make_demo_store(count, seed=0, categories=None):
+    """
+    動作確認用に大量の飲食店データを作成する関数
+
+    SAMPLE_RESTAURANTS をもとに、店名・住所・評価・距離を変えたデータを作ります。
+    緯度・経度は DEFAULT_POSITION から距離の分だけ乱数の方角に離れた位置にします。
+    categories を指定すると、カテゴリはその中から乱数で選びます。
+
+    Args:
+        count (int): 作成する件数
+        seed (int): 乱数の種
+        categories (list): カテゴリ名のリスト（Noneならサンプルと同じカテゴリ）
+
+    Returns:
+        RestaurantStore: 作成したストア
+    """
+    rng = random.Random(seed)
+    store = RestaurantStore()
+    latitude, longitude = DEFAULT_POSITION
+    lon_meters = METERS_PER_DEGREE * math.cos(math.radians(latitude))  # 経度1度あたりの距離
+    for i in range(count):
+        base = SAMPLE_RESTAURANTS[i % len(SAMPLE_RESTAURANTS)]
+        if categories is None:
+            name, category = base["name"], base["category"]
+        else:
+            category = rng.choice(categories)
+            name = f"{category}の店"
+        address = f"東京都渋谷区{rng.randint(1, 9)}-{rng.randint(1, 30)}-{rng.randint(1, 20)}"
+        rating = round(rng.uniform(3.0, 5.0), 1)
+        distance = rng.randint(50, 5000)
+        # 距離と方角から緯度・経度を求める（数km の範囲なので平面として計算する）
+        bearing = rng.uniform(0, 2 * math.pi)
+        store.append(
+            f"{name} {i + 1}号店",
+            category,
+            address,
+            rating,
+            distance,
+            latitude + distance * math.cos(bearing) / METERS_PER_DEGREE,
+            longitude + distance * math.sin(bearing) / lon_meters
+        )
+    return store
@@ -0,0 +1,543 @@
+# -*- coding: utf-8 -*-
+
+"""
+search_index.py - 日本語のインクリメンタル検索用の転置インデックス
+
+店名や住所を入力に合わせて検索（search-as-you-type）するためのモジュールです。
+文字列を1文字・2文字ずつに区切った「n-gram」ごとに、
+その n-gram を含む行番号を昇順に並べた配列（array('I')）を保持します（転置インデックス）。
+行番号1件あたり4バイトなので、10万件でも数十MBに収まります。
+
+検索前に次の正規化を行うため、表記ゆれがあっても見つかります。
+- NFKC正規化（全角英数字 → 半角、半角カナ → 全角カナ など）
+- ひらがな → カタカナ（"らーめん" で "ラーメン大将" が見つかる）
+- 英字の小文字化
+
+検索は最も短い配列の行番号を先頭から少しずつ区切り、区切った範囲ごとに
+ほかの配列との積集合を求めて確かめていくので、limit 件見つかった時点で打ち切れます。
+
+行の追加・削除に合わせてインデックスを少しずつ更新できるので、
+ページ単位でデータを読み込む画面でも使えます。
+何万件もある場合は StoreIndexer で1フレームずつ少しずつ登録すると、
+登録中も画面が止まりません。
+検索自体に時間がかかる場合は SearchWorker でワーカースレッドに任せます。
+
+使い方:
+    index = SearchIndex.from_store(store)
+    index.search("らーめん")          # → [0, ...]（一致した行番号）
+    index.add(row, name, address)   # 行を追加したとき
+"""
+
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+try:
+    from kivy.clock import Clock
+except ImportError:
+    # SearchIndex と normalize() はKivyがなくても使える（ツールやテストから使うため）
+    Clock = None
+
+
+# ひらがな → カタカナの変換表（ぁ〜ゖ を ァ〜ヶ に）
+_HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(0x3041, 0x3097)}
+
+# 1フレームで行の登録に使ってよい時間（秒）
+INDEX_BUDGET = 0.004
+
+# limit を指定した検索で、最初に積集合を求める候補の数（範囲ごとに2倍にしていく）
+# 範囲ごとに、打ち切るか（cancelled）も確認する
+SEARCH_CHUNK_ROWS = 1024
+
+
+def normalize(text):
+    """
+    検索用に文字列を正規化する関数
+
+    Args:
+        text (str): 元の文字列
+
+    Returns:
+        str: 正規化した文字列
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return text.translate(_HIRAGANA_TO_KATAKANA).lower()
+
+
+def ngrams(text):
+    """
+    正規化済みの文字列から 1-gram と 2-gram の集合を作る関数
+
+    Args:
+        text (str): 正規化済みの文字列
+
+    Returns:
+        set: n-gram の集合
+    """
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    grams.discard(" ")
+    return grams
+
+
+def query_grams(query):
+    """
+    検索語から、候補の絞り込みに使う n-gram を作る関数
+
+    1文字の検索語なら 1-gram、2文字以上なら 2-gram を使います。
+    """
+    if len(query) == 1:
+        return {query}
+    return {query[i:i + 2] for i in range(len(query) - 1)}
+
+
+def _join_normalized(texts):
+    """複数の文字列を正規化し、またいで一致しないように改行で区切ってつなげる"""
+    return "\n".join(normalize(text) for text in texts)
+
+
+def _join_folded(texts):
+    """
+    複数の文字列を、ひらがな → カタカナの変換を省いて正規化してつなげる
+
+    変換表による置き換えは1文字ずつ行うため遅いので、検索語の確認では
+    代わりに _kana_pattern() の正規表現でひらがなとカタカナの両方に一致させます。
+    """
+    return "\n".join(unicodedata.normalize("NFKC", text).lower() for text in texts)
+
+
+def _kana_pattern(term):
+    """
+    正規化した検索語から、カタカナの部分がひらがなにも一致する正規表現を作る関数
+
+    Args:
+        term (str): 正規化済みの検索語
+
+    Returns:
+        re.Pattern: _join_folded() の文字列から検索語を探す正規表現
+    """
+    parts = []
+    for char in term:
+        code = ord(char) - 0x60
+        if 0x3041 <= code < 0x3097:
+            parts.append(f"[{char}{chr(code)}]")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts))
+
+
+class SearchIndex:
+    """
+    n-gram の転置インデックス
+
+    行番号ごとに、検索対象の文字列（店名・住所など）を登録します。
+
+    text_of を指定すると、インデックスは正規化した文字列を保持せず、
+    3文字以上の検索語の確認と remove() のときに text_of(row) から取り出します
+    （RestaurantStore のように、登録した行の文字列が後から変わらない場合に使う）。
+    """
+
+    def __init__(self, text_of=None):
+        """
+        Args:
+            text_of (callable): text_of(row) の形で、行の検索対象の文字列のタプルを返す関数
+                                （Noneなら登録した文字列をインデックスに保持する）
+        """
+        self.postings = {}  # n-gram → 行番号の配列（昇順）
+        self.text_of = text_of
+        self.texts = {} if text_of is None else None  # 行番号 → 正規化した文字列
+        self._rows = set()  # 登録済みの行番号
+
+    @classmethod
+    def for_store(cls, store):
+        """
+        RestaurantStore の店名と住所を検索する、空のインデックスを作成するメソッド
+
+        文字列はストアから取り出すので、インデックスには保持しません。
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+
+        Returns:
+            SearchIndex: 作成したインデックス（行は add_store_rows() などで登録する）
+        """
+        return cls(text_of=lambda row: (store.name(row), store.address(row)))
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        RestaurantStore の店名と住所からインデックスを作成するメソッド
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+
+        Returns:
+            SearchIndex: 作成したインデックス
+        """
+        index = cls.for_store(store)
+        index.add_store_rows(store, 0, len(store))
+        return index
+
+    def add_store_rows(self, store, start, end):
+        """
+        RestaurantStore の指定範囲の行を登録するメソッド
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+            start (int): 最初の行番号
+            end (int): 最後の行番号 + 1
+        """
+        for row in range(start, end):
+            self.add(row, store.name(row), store.address(row))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, row):
+        return row in self._rows
+
+    def _text(self, row):
+        """行の正規化した検索対象の文字列を返す"""
+        if self.texts is not None:
+            return self.texts[row]
+        return _join_normalized(self.text_of(row))
+
+    def add(self, row, *texts):
+        """
+        行を登録するメソッド（登録済みなら置き換える）
+
+        行番号の昇順に登録すると、配列の末尾に追加するだけで済みます。
+
+        Args:
+            row (int): 行番号
+            *texts (str): 検索対象の文字列（店名、住所など）
+        """
+        if row in self._rows:
+            self.remove(row)
+        text = _join_normalized(texts)
+        if self.texts is not None:
+            self.texts[row] = text
+        self._rows.add(row)
+        postings = self.postings
+        for gram in ngrams(text):
+            rows = postings.get(gram)
+            if rows is None:
+                postings[gram] = array("I", (row,))
+            elif rows[-1] < row:
+                rows.append(row)
+            else:
+                rows.insert(bisect_left(rows, row), row)
+
+    def remove(self, row):
+        """
+        行を削除するメソッド
+
+        Args:
+            row (int): 行番号
+        """
+        if row not in self._rows:
+            return
+        text = self._text(row)
+        self._rows.discard(row)
+        if self.texts is not None:
+            del self.texts[row]
+        for gram in ngrams(text):
+            rows = self.postings.get(gram)
+            if rows is None:
+                continue
+            position = bisect_left(rows, row)
+            if position < len(rows) and rows[position] == row:
+                del rows[position]
+                if not rows:
+                    del self.postings[gram]
+
+    def search(self, query, limit=None, cancelled=None):
+        """
+        検索語を含む行を探すメソッド
+
+        最も短い n-gram の配列を先頭から区切り、区切った範囲の行番号の積集合を
+        ほかの配列と求め、3文字以上の検索語は候補の文字列に含まれるかも確認します。
+        limit 件見つかった時点で打ち切るので、一致する行がとても多い検索語でも
+        画面では limit を指定すれば速く返ります。
+
+        Args:
+            query (str): 検索語（空白区切りで複数指定するとAND検索）
+            limit (int): 返す行数の上限（Noneなら全件）
+            cancelled (callable): True を返したら途中で検索をやめる関数
+                                  （ワーカースレッドで古い検索を打ち切るため）
+
+        Returns:
+            list: 一致した行番号（昇順、打ち切った場合は空）
+        """
+        terms = [normalize(term) for term in query.split()]
+        if not terms or limit == 0:
+            return []
+
+        grams = set()
+        for term in terms:
+            grams |= query_grams(term)
+        posting_lists = []
+        for gram in grams:
+            rows = self.postings.get(gram)
+            if not rows:
+                return []
+            posting_lists.append(rows)
+        posting_lists.sort(key=len)
+        # 全行に含まれる n-gram（"東京" など）は絞り込みに役立たないので確認を省く
+        total = len(self._rows)
+        posting_lists = [rows for rows in posting_lists if len(rows) < total] \
+            or posting_lists[:1]
+
+        # 2-gram がすべて含まれていても、連続して並んでいるとは限らないので、
+        # 3文字以上の検索語は候補の文字列に含まれるか確認する
+        long_terms = [term for term in terms if len(term) > 2]
+        first, others = posting_lists[0], posting_lists[1:]
+        if not others and not long_terms:
+            return list(first if limit is None else first[:limit])
+        matches = self._matcher(long_terms)
+
+        if limit is None:
+            # 全件を返すときは、積集合をまとめて求める方が速い
+            candidates = set(first).intersection(*others)
+            if cancelled is not None and cancelled():
+                return []
+            return [row for row in sorted(candidates) if matches(row)]
+
+        # 行番号は昇順なので、first を先頭から区切り、ほかの配列からは
+        # 同じ行番号の範囲だけを切り出して積集合を求める（1行ずつの二分探索より速い）
+        positions = [0] * len(others)
+        result = []
+        start = 0
+        size = SEARCH_CHUNK_ROWS
+        while start < len(first):
+            if cancelled is not None and cancelled():
+                return []
+            chunk = first[start:start + size]
+            candidates = set(chunk)
+            exhausted = False
+            for i, rows in enumerate(others):
+                end = bisect_right(rows, chunk[-1], positions[i])
+                candidates.intersection_update(rows[positions[i]:end])
+                positions[i] = end
+                exhausted = exhausted or end == len(rows)
+            for row in sorted(candidates):
+                if matches(row):
+                    result.append(row)
+                    if len(result) >= limit:
+                        return result
+            if exhausted:
+                break  # これより後の行はその n-gram を含まない
+            start += size
+            size *= 2
+        return result
+
+    def _matcher(self, long_terms):
+        """行の文字列に3文字以上の検索語がすべて含まれるかを返す関数を作る"""
+        if not long_terms:
+            return lambda row: True
+        if self.texts is not None:
+            texts = self.texts
+            return lambda row: all(term in texts[row] for term in long_terms)
+        text_of = self.text_of
+        patterns = [_kana_pattern(term).search for term in long_terms]
+
+        def matches(row):
+            text = _join_folded(text_of(row))
+            return all(search(text) for search in patterns)
+        return matches
+
+
+class StoreIndexer:
+    """
+    RestaurantStore の行を、メインスレッドで1フレームずつ少しずつ登録するクラス
+
+    1フレームあたりの登録時間には上限（予算）を設けているため、
+    何万件あってもスクロールや文字入力が止まりません。
+    """
+
+    def __init__(self, index, store, on_progress=None, budget=INDEX_BUDGET):
+        """
+        Args:
+            index (SearchIndex): 登録先のインデックス
+            store (RestaurantStore): 飲食店データ
+            on_progress (callable): on_progress(start, end) の形で、
+                                    登録した行の範囲を受け取る関数
+            budget (float): 1フレームで登録に使う時間（秒）
+        """
+        self.index = index
+        self.store = store
+        self.on_progress = on_progress
+        self.budget = budget
+        self.indexed = 0  # 登録済みの行数
+        self.end = 0      # 登録する行数
+        self._trigger = Clock.create_trigger(self._index_rows, 0)
+
+    @property
+    def done(self):
+        """登録待ちの行がなければ True"""
+        return self.indexed >= self.end
+
+    def extend(self, end):
+        """
+        行番号 end の手前までを登録の対象にするメソッド
+
+        Args:
+            end (int): 登録する最後の行番号 + 1
+        """
+        self.end = max(self.end, end)
+        if not self.done:
+            self._trigger()
+
+    def _index_rows(self, dt):
+        """予算の時間内で行を登録し、残りは次のフレームに回す"""
+        start = row = self.indexed
+        index, store = self.index, self.store
+        deadline = perf_counter() + self.budget
+        while row < self.end and perf_counter() < deadline:
+            index.add(row, store.name(row), store.address(row))
+            row += 1
+        self.indexed = row
+
+        if not self.done:
+            self._trigger()
+        if self.on_progress is not None:
+            self.on_progress(start, row)
+
+
+class SearchWorker:
+    """
+    SearchIndex の検索をワーカースレッドで行うクラス
+
+    文字を入力するたびに submit() を呼ぶと、ワーカースレッドで検索し、
+    結果をメインスレッドで on_results(検索語, 行番号のリスト) に渡します。
+    - 新しい検索語を受け取ると、古い検索は待ち行列から取り消すか途中で打ち切る
+    - 結果は1フレームに1回だけ渡す（同じフレームに届いた古い結果は捨てる）
+
+    ワーカースレッドがインデックスを読んでいる間に、メインスレッドで
+    インデックスを変更しないでください（登録も submit_task() でワーカーに任せる）。
+    """
+
+    def __init__(self, index, on_results, limit=None):
+        """
+        Args:
+            index (SearchIndex): 検索するインデックス
+            on_results (callable): on_results(query, rows) の形で結果を受け取る関数
+            limit (int): 1回の検索で返す行数の上限
+        """
+        self.index = index
+        self.on_results = on_results
+        self.limit = limit
+        self._generation = 0   # submit() のたびに増やす（古い検索の判定に使う）
+        self._pending = None   # 最後に投入した検索の Future
+        self._result = None    # メインスレッドに渡す (世代, 検索語, 行番号)
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._trigger_deliver = Clock.create_trigger(self._deliver, 0)
+
+    @classmethod
+    def from_store(cls, store, on_results, limit=None):
+        """
+        RestaurantStore の店名と住所を、ワーカースレッドで登録してから検索するメソッド
+
+        登録は最初の検索より先に実行されるため、画面の表示は待たせません。
+        登録中もメインスレッドが止まらないように、INDEX_BUDGET 秒登録するたびに
+        同じ時間だけ休んで GIL をメインスレッドに譲ります。
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+            on_results (callable): on_results(query, rows) の形で結果を受け取る関数
+            limit (int): 1回の検索で返す行数の上限
+
+        Returns:
+            SearchWorker: 作成したワーカー
+        """
+        worker = cls(SearchIndex.for_store(store), on_results, limit)
+        worker.add_store_rows(store, 0, len(store))
+        return worker
+
+    def add_store_rows(self, store, start, end):
+        """
+        RestaurantStore の指定範囲の行を、ワーカースレッドで登録するメソッド（すぐに戻る）
+
+        後から submit() した検索は、登録が終わってから実行されます。
+
+        Args:
+            store (RestaurantStore): 飲食店データ
+            start (int): 最初の行番号
+            end (int): 最後の行番号 + 1
+
+        Returns:
+            Future: 実行結果
+        """
+        return self.submit_task(self._add_store_rows, store, start, end)
+
+    def _add_store_rows(self, store, start, end):
+        """行を INDEX_BUDGET 秒ずつ登録し、その間に GIL を譲る（ワーカースレッドで呼ばれる）"""
+        index = self.index
+        row = start
+        while row < end and not self._closed:
+            deadline = perf_counter() + INDEX_BUDGET
+            while row < end and perf_counter() < deadline:
+                index.add(row, store.name(row), store.address(row))
+                row += 1
+            time.sleep(INDEX_BUDGET)
+
+    def submit_task(self, func, *args):
+        """
+        検索と同じワーカースレッドで関数を実行するメソッド（インデックスの更新用）
+
+        Returns:
+            Future: 実行結果
+        """
+        return self._executor.submit(func, *args)
+
+    def submit(self, query, limit=None):
+        """
+        検索を依頼するメソッド（すぐに戻る）
+
+        Args:
+            query (str): 検索語
+            limit (int): この検索で返す行数の上限（Noneなら作成時の limit）
+        """
+        # まだ始まっていない古い検索は取り消す（実行中なら途中で打ち切られる）
+        self.cancel()
+        if limit is None:
+            limit = self.limit
+        self._pending = self._executor.submit(self._run, self._generation, query, limit)
+
+    def cancel(self):
+        """依頼済みの検索を取り消すメソッド（結果は on_results に渡されない）"""
+        self._generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    def _run(self, generation, query, limit):
+        """検索を実行する（ワーカースレッドで呼ばれる）"""
+        def cancelled():
+            return generation != self._generation
+
+        rows = self.index.search(query, limit, cancelled=cancelled)
+        if cancelled():
+            return
+        self._result = (generation, query, rows)
+        self._trigger_deliver()
+
+    def _deliver(self, dt):
+        """最新の検索結果を on_results に渡す（メインスレッド）"""
+        result, self._result = self._result, None
+        if result is None:
+            return
+        generation, query, rows = result
+        if generation == self._generation:
+            self.on_results(query, rows)
+
+    def close(self):
+        """実行中の検索・登録を打ち切り、ワーカースレッドを終了するメソッド"""
+        self._closed = True
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""
+sort_engine.py - 飲食店一覧の並べ替え
+
+16_menu.py のソートメニュー（新着順・古い順・人気順・評価順・店名順）で
+RestaurantStore の行を並べ替えるためのモジュールです。
+
+- 並べ替えのキーは並べ替えの種類ごとに1回だけ計算し、1つの整数にまとめて保持する
+  （「キー << ROW_BITS | 行番号」の形なので、整数のまま比較するだけで並べ替えられる）
+- 店名は読み（よみ）で並べる。読みのキーは行ごとに1回だけ計算する。
+  pykakasi があれば漢字も読みに変換し、
+  なければひらがな・カタカナを同じ文字として扱うだけにする
+  （漢字の店名は読みではなく文字コードの順になるので、メニューの名前を
+  「店名順」ではなく「店名の文字順」にする）
+- 新着順・古い順は行番号の順そのものなので、キーを作らずに行番号から直接返す
+- 画面に最初に表示する分だけなら、全件を並べ替えずに上位k件だけを選ぶ
+- 何件かの行が変わったときは、並べ替え済みの結果に差分だけを反映する
+
+ストアには「いつ登録したか」「レビュー数」の列がないため、
+新着順・古い順は行番号（後から追加した行ほど新しい）、
+人気順は評価の高い順（同じ評価なら近い順）で並べます。
+
+使い方:
+    engine = SortEngine(store)
+    engine.rows("評価順", 0, 50)   # 評価順の上位50件の行番号
+    engine.update([3, 10])         # 行3と行10の値が変わったとき
+    engine.extend(len(store))      # 行が追加されたとき
+
+スコアで並べる種類（「おすすめ順」など）は add_scorer() で追加できます。
+"""
+
+import heapq
+from bisect import bisect_left, insort
+
+from search_index import normalize
+
+try:
+    import pykakasi
+except ImportError:
+    pykakasi = None
+
+
+# まとめた整数キーのうち、行番号に使うビット数（最大で約1600万行）
+ROW_BITS = 24
+ROW_MASK = (1 << ROW_BITS) - 1
+
+# 店名の読みのうち、並べ替えに使う先頭の文字数
+YOMI_LENGTH = 12
+
+# 読みのキーのビット数（UTF-32 で1文字4バイト）
+YOMI_BITS = 32 * YOMI_LENGTH
+
+# 全件を並べ替えずに上位k件だけを選ぶ件数の上限
+TOP_K_LIMIT = 1000
+
+# 店名で並べる種類の名前（pykakasi がなければ漢字の店名は読みの順にならない）
+NAME_SORT = "店名順" if pykakasi is not None else "店名の文字順"
+
+# 並べ替えの種類
+SORT_TYPES = ("新着順", "古い順", "人気順", "評価順", NAME_SORT)
+
+
+_kakasi = pykakasi.kakasi() if pykakasi is not None else None
+
+
+def reading(text):
+    """
+    文字列の読みを返す関数
+
+    pykakasi があれば漢字も読み（ひらがな）に変換します。
+    最後に検索と同じ正規化を行い、ひらがなとカタカナを同じ文字にそろえます。
+
+    Args:
+        text (str): 店名など
+
+    Returns:
+        str: 読み（カタカナ）
+    """
+    if _kakasi is not None:
+        text = "".join(item["hira"] for item in _kakasi.convert(text))
+    return normalize(text)
+
+
+def yomi_keys(texts):
+    """
+    読みの先頭 YOMI_LENGTH 文字を、大小関係を保ったまま整数にする関数
+
+    UTF-32（ビッグエンディアン）のバイト列は文字コードの順に並ぶため、
+    そのまま整数にしても大小関係は変わりません。
+    足りない文字を 0 で埋めるため、短い読みほど前に並びます。
+    正規化は改行でつないだ文字列に1回だけ行います（1件ずつより速い）。
+    店名に改行が含まれていても件数がずれないように、先に空白に置き換えます。
+
+    Args:
+        texts (list): 店名などのリスト
+
+    Returns:
+        list: 照合用のキーのリスト
+    """
+    if not texts:
+        return []
+    if _kakasi is not None:
+        texts = [reading(text) for text in texts]  # 漢字の読みは1件ずつ変換する
+    size = YOMI_BITS // 8
+    from_bytes = int.from_bytes
+    return [
+        from_bytes(text[:YOMI_LENGTH].encode("utf-32-be").ljust(size, b"\0"), "big")
+        for text in normalize("\n".join(text.replace("\n", " ") for text in texts)).split("\n")
+    ]
+
+
+class SortEngine:
+    """
+    RestaurantStore の行を並べ替えるクラス
+
+    並べ替えの種類ごとに、行番号の順にまとめたキー（packed）と、
+    全件を並べ替えた結果（order）を必要になったときに作成して保持します。
+    """
+
+    # 行番号の順に並ぶ種類（値 = 降順にするか）
+    ROW_ORDER_TYPES = {"新着順": True, "古い順": False}
+
+    def __init__(self, store):
+        """
+        Args:
+            store (RestaurantStore): 飲食店データ
+        """
+        self.store = store
+        self._key_functions = {
+            "人気順": self._popularity_key,
+            "評価順": self._rating_key,
+            NAME_SORT: self._name_key,
+        }
+        self._scorers = {}  # 並べ替えの種類 → rows()/update()/extend() を持つオブジェクト
+        self._yomi = []    # 行ごとの店名の読みのキー
+        self._packed = {}  # 並べ替えの種類 → 行ごとのまとめたキー
+        self._orders = {}  # 並べ替えの種類 → まとめたキーを昇順に並べたリスト
+
+    @property
+    def sort_types(self):
+        """並べ替えの種類の一覧（add_scorer() で追加したものを含む）"""
+        return SORT_TYPES + tuple(self._scorers)
+
+    def add_scorer(self, sort_type, scorer):
+        """
+        スコアで並べる種類を追加するメソッド
+
+        Args:
+            sort_type (str): 並べ替えの種類（"おすすめ順" など）
+            scorer: rows(start, stop)、update(rows)、extend(end) を持つオブジェクト
+                    （scoring.RecommendationScorer など）
+        """
+        self._scorers[sort_type] = scorer
+
+    # --- 並べ替えの種類ごとのキー（小さいほど前に並ぶ） ---
+
+    def _popularity_key(self, row):
+        # 評価の高い順、同じ評価なら近い順
+        rating = round(self.store.ratings[row] * 10)
+        return ((1000 - rating) << 32) | self.store.distances[row]
+
+    def _rating_key(self, row):
+        # 評価の高い順、同じ評価なら店名の読み順
+        rating = round(self.store.ratings[row] * 10)
+        return ((1000 - rating) << YOMI_BITS) | self.yomi(row)
+
+    def _name_key(self, row):
+        return self.yomi(row)
+
+    def yomi(self, row):
+        """
+        店名の読みのキーを返すメソッド（まだ計算していない行の分をまとめて計算する）
+
+        Args:
+            row (int): 行番号
+
+        Returns:
+            int: 読みのキー
+        """
+        yomi = self._yomi
+        if row >= len(yomi):
+            # mmap のストアの店名の列はスライスできないので、1行ずつ取り出す
+            store = self.store
+            yomi.extend(yomi_keys([store.name(row) for row in range(len(yomi), len(store))]))
+        return yomi[row]
+
+    def _pack(self, sort_type, row):
+        """キーと行番号を1つの整数にまとめる（同じキーなら行番号順）"""
+        return (self._key_functions[sort_type](row) << ROW_BITS) | row
+
+    def packed_keys(self, sort_type):
+        """
+        行ごとのまとめたキーを返すメソッド（初回だけ全行分を計算する）
+
+        Args:
+            sort_type (str): 並べ替えの種類
+
+        Returns:
+            list: 行番号の順に並んだ、まとめたキー
+        """
+        packed = self._packed.get(sort_type)
+        if packed is None:
+            packed = [self._pack(sort_type, row) for row in range(len(self.store))]
+            self._packed[sort_type] = packed
+        return packed
+
+    def rows(self, sort_type, start=0, stop=None):
+        """
+        並べ替えた結果のうち、start 番目から stop 番目の手前までの行番号を返すメソッド
+
+        全件の並べ替えがまだで stop が TOP_K_LIMIT 以下なら、
+        上位 stop 件だけを選ぶ（全件を並べ替えるより速い）。
+
+        Args:
+            sort_type (str): 並べ替えの種類
+            start (int): 開始位置
+            stop (int): 終了位置（Noneなら最後まで）
+
+        Returns:
+            list: 行番号のリスト
+        """
+        scorer = self._scorers.get(sort_type)
+        if scorer is not None:
+            return scorer.rows(start, stop)
+
+        reverse = self.ROW_ORDER_TYPES.get(sort_type)
+        if reverse is not None:
+            rows = range(len(self.store))
+            return list((rows[::-1] if reverse else rows)[start:stop])
+
+        order = self._orders.get(sort_type)
+        if order is None and stop is not None and stop <= TOP_K_LIMIT:
+            selected = heapq.nsmallest(stop, self.packed_keys(sort_type))[start:]
+        else:
+            selected = self.order(sort_type)[start:stop]
+        return [packed & ROW_MASK for packed in selected]
+
+    def order(self, sort_type):
+        """
+        全件を並べ替えたまとめたキーのリストを返すメソッド（初回だけ並べ替える）
+
+        Args:
+            sort_type (str): 並べ替えの種類
+
+        Returns:
+            list: 昇順に並んだ、まとめたキー
+        """
+        order = self._orders.get(sort_type)
+        if order is None:
+            order = sorted(self.packed_keys(sort_type))
+            self._orders[sort_type] = order
+        return order
+
+    def update(self, rows):
+        """
+        値が変わった行のキーを計算し直し、並べ替え済みの結果に反映するメソッド
+
+        全件を並べ替え直す代わりに、変わった行だけを取り除いて挿入し直します。
+
+        Args:
+            rows (iterable): 値が変わった行の行番号
+        """
+        rows = list(rows)
+        for scorer in self._scorers.values():
+            scorer.update(rows)
+        for row in rows:
+            if row < len(self._yomi):
+                self._yomi[row] = yomi_keys([self.store.name(row)])[0]
+        for sort_type, packed in self._packed.items():
+            order = self._orders.get(sort_type)
+            for row in rows:
+                old = packed[row]
+                new = self._pack(sort_type, row)
+                if new == old:
+                    continue
+                packed[row] = new
+                if order is not None:
+                    del order[bisect_left(order, old)]
+                    insort(order, new)
+
+    def extend(self, end):
+        """
+        ストアに追加された行（行番号 end の手前まで）を反映するメソッド
+
+        Args:
+            end (int): 追加された最後の行番号 + 1
+        """
+        for scorer in self._scorers.values():
+            scorer.extend(end)
+        for sort_type, packed in self._packed.items():
+            order = self._orders.get(sort_type)
+            new_keys = [self._pack(sort_type, row) for row in range(len(packed), end)]
+            packed.extend(new_keys)
+            if order is None:
+                continue
+            if len(new_keys) > TOP_K_LIMIT:
+                # たくさん追加されたときは、次に必要になったときに並べ替え直す
+                del self._orders[sort_type]
+            else:
+                for key in new_keys:
+                    insort(order, key)
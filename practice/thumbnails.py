@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+thumbnails.py - 飲食店カード用サムネイルの非同期読み込み
+
+店舗画像のデコードと縮小はスレッドプールで行い、
+テクスチャの作成（GPUへの転送）だけをメインスレッドで行います。
+1フレームあたりの転送時間には上限（予算）を設けているため、
+画像がたくさん届いてもスクロールが止まりません。
+
+- ディスクキャッシュ: 縮小済みの画像を「元画像の内容のハッシュ」を名前にして保存
+                     （同じ画像なら2回目以降は縮小処理を省略）
+- メモリキャッシュ : 作成済みのテクスチャを LRU で保持
+
+画像のデコードと縮小には Pillow を使います（pip install pillow）。
+Pillow がない場合はサムネイルを読み込まず、アイコン表示のままになります。
+
+使い方:
+    loader = ThumbnailLoader()
+    loader.request(image_path, self.on_thumbnail)   # on_thumbnail(path, texture)
+"""
+
+import hashlib
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from time import perf_counter
+
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 店舗画像のディレクトリ（data/images/店名.jpg または .png）
+IMAGE_DIR = os.path.join(ROOT_DIR, "data", "images")
+
+# 縮小済み画像のキャッシュディレクトリ
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "thumbnail_cache")
+
+# サムネイルの最大サイズ（ピクセル）
+THUMBNAIL_SIZE = (144, 144)
+
+# 1フレームでテクスチャの作成に使ってよい時間（秒）
+UPLOAD_BUDGET = 0.004
+
+# メモリに保持するテクスチャの数
+LRU_CAPACITY = 64
+
+
+@lru_cache(maxsize=4096)
+def find_image(name, image_dir=IMAGE_DIR):
+    """
+    店名に対応する店舗画像を探す関数
+
+    スクロール中に何度も呼ばれるため、結果をキャッシュします。
+
+    Args:
+        name (str): 店名
+        image_dir (str): 店舗画像のディレクトリ
+
+    Returns:
+        str: 画像のパス（なければNone）
+    """
+    for extension in (".jpg", ".jpeg", ".png"):
+        path = os.path.join(image_dir, name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def decode_thumbnail(path, size=THUMBNAIL_SIZE, cache_dir=CACHE_DIR):
+    """
+    画像を読み込んで縮小する関数（ワーカースレッドで呼ばれる）
+
+    縮小した画像は元画像の内容のハッシュを名前にしてキャッシュし、
+    次回からはキャッシュを読み込みます。
+
+    Args:
+        path (str): 元画像のパス
+        size (tuple): 最大サイズ（幅, 高さ）
+        cache_dir (str): キャッシュディレクトリ
+
+    Returns:
+        tuple: ((幅, 高さ), RGBAのバイト列)
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha1(content + repr(size).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, digest[:2], digest + ".png")
+
+    if os.path.exists(cache_path):
+        image = PILImage.open(cache_path).convert("RGBA")
+    else:
+        image = PILImage.open(path)
+        image.thumbnail(size)
+        image = image.convert("RGBA")
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        image.save(tmp_path, "PNG")
+        os.replace(tmp_path, cache_path)
+
+    # Kivyのテクスチャは下から上の順に並ぶため、上下を反転しておく
+    image = image.transpose(PILImage.FLIP_TOP_BOTTOM)
+    return image.size, image.tobytes()
+
+
+class ThumbnailLoader:
+    """
+    サムネイルを非同期に読み込み、テクスチャとして返すクラス
+
+    request() はすぐに戻り、テクスチャができたら
+    メインスレッドでコールバックを呼び出します。
+    """
+
+    def __init__(self, workers=2, capacity=LRU_CAPACITY, budget=UPLOAD_BUDGET):
+        """
+        Args:
+            workers (int): デコードを行うスレッド数
+            capacity (int): メモリに保持するテクスチャの数
+            budget (float): 1フレームでテクスチャ作成に使う時間（秒）
+        """
+        self.available = PILImage is not None
+        self.capacity = capacity
+        self.budget = budget
+        self._textures = OrderedDict()  # パス → テクスチャ（LRU）
+        self._callbacks = {}            # 読み込み中のパス → コールバックのリスト
+        self._decoded = deque()         # デコード済みで転送待ちの (パス, サイズ, 画素)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._trigger_upload = Clock.create_trigger(self._upload, 0)
+
+    def request(self, path, callback):
+        """
+        サムネイルを要求するメソッド
+
+        テクスチャがメモリにあればすぐにコールバックを呼び出します。
+
+        Args:
+            path (str): 画像のパス
+            callback (callable): callback(path, texture) の形で呼ばれる関数
+        """
+        if not self.available or path is None:
+            return
+        texture = self._textures.get(path)
+        if texture is not None:
+            self._textures.move_to_end(path)
+            callback(path, texture)
+            return
+
+        callbacks = self._callbacks.get(path)
+        if callbacks is not None:
+            callbacks.append(callback)  # 読み込み中なら完了を待つだけ
+            return
+        self._callbacks[path] = [callback]
+        future = self._executor.submit(decode_thumbnail, path)
+        future.add_done_callback(lambda f: self._on_decoded(path, f))
+
+    def _on_decoded(self, path, future):
+        """デコードが終わったときの処理（ワーカースレッドで呼ばれる）"""
+        try:
+            size, pixels = future.result()
+        except Exception:
+            # 壊れた画像などは諦めて、アイコン表示のままにする
+            Clock.schedule_once(lambda dt: self._callbacks.pop(path, None), 0)
+            return
+        self._decoded.append((path, size, pixels))
+        self._trigger_upload()
+
+    def _upload(self, dt):
+        """
+        デコード済みの画像をテクスチャにするメソッド（メインスレッド）
+
+        予算の時間を超えたら残りは次のフレームに回します。
+        """
+        start = perf_counter()
+        while self._decoded and perf_counter() - start < self.budget:
+            path, size, pixels = self._decoded.popleft()
+            texture = Texture.create(size=size, colorfmt="rgba")
+            texture.blit_buffer(pixels, colorfmt="rgba", bufferfmt="ubyte")
+
+            self._textures[path] = texture
+            if len(self._textures) > self.capacity:
+                self._textures.popitem(last=False)
+
+            for callback in self._callbacks.pop(path, []):
+                callback(path, texture)
+        if self._decoded:
+            self._trigger_upload()
+
+    def close(self):
+        """デコード待ちの画像を取り消し、ワーカースレッドを終了するメソッド"""
+        self.available = False
+        self._trigger_upload.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+virtual_menu.py - 数千件の項目を持つメニュー
+
+駅名・店名・言語のように項目が数千件あるメニューのためのモジュールです。
+MDDropdownMenu のように項目ごとに dict と on_release の関数を用意する代わりに、
+項目の文字列のリストを渡すだけで表示できます。
+
+- VirtualMenu: RecycleList（画面に見えている行のウィジェットだけを作成して使い回す）
+  で項目を表示するので、5,000件でも開く速さは数件のメニューと変わらない
+- PrefixIndex: 上の入力欄に文字を入力すると、その文字で始まる最初の項目まで
+  スクロールする（ひらがなとカタカナ、全角と半角は同じ文字として扱う）。
+  項目の読みを並べ替えたリストを二分探索するので、何件あってもすぐに見つかる。
+  一致した項目のうちメニューで最も上の項目も、区間の最小値の表から O(1) で求める。
+  インデックスは最初に文字が入力されたときに作成する
+
+使い方:
+    menu = VirtualMenu(items=station_names, on_select=self.on_station_select)
+    menu.open()
+
+    def on_station_select(self, menu, index, text):
+        ...
+"""
+
+from bisect import bisect_left
+
+from kivy.metrics import dp
+from kivy.uix.modalview import ModalView
+from kivymd.uix.card import MDCard
+from kivymd.uix.textfield import MDTextField
+
+from recycle_list import ROW_TYPES, RecycleList
+from search_index import normalize
+
+
+class PrefixIndex:
+    """
+    項目の文字列を正規化して並べ替え、前方一致する項目を二分探索で探すクラス
+    """
+
+    def __init__(self, texts):
+        """
+        Args:
+            texts (list): 項目の文字列（メニューに表示する順）
+        """
+        # 正規化は改行でつないだ文字列に1回だけ行う（1件ずつより速い）
+        # 項目に改行が含まれていても件数がずれないように、先に空白に置き換える
+        keys = normalize("\n".join(text.replace("\n", " ") for text in texts)).split("\n") if texts else []
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[position] for position in order]
+        self.positions = order
+        # self.minimums[k][i] は positions[i:i + 2 ** k] の最小値（区間の最小値の表）
+        self.minimums = [order]
+        width = 1
+        while width * 2 <= len(order):
+            previous = self.minimums[-1]
+            self.minimums.append([
+                left if left < right else right
+                for left, right in zip(previous, previous[width:])
+            ])
+            width *= 2
+
+    def first(self, prefix):
+        """
+        prefix で始まる項目のうち、メニューで最も上にある項目の位置を返すメソッド
+
+        Args:
+            prefix (str): 入力された文字
+
+        Returns:
+            int: メニュー内の位置（見つからなければNone）
+        """
+        prefix = normalize(prefix).strip()
+        if not prefix:
+            return None
+        keys = self.keys
+        start = bisect_left(keys, prefix)
+        # prefix で始まる項目は並べ替えたリストの中で連続している
+        stop = bisect_left(keys, prefix + "\U0010ffff", start)
+        if start == stop:
+            return None
+        # 長さ 2 ** level の2つの区間（重なってもよい）で [start, stop) を覆う
+        level = (stop - start).bit_length() - 1
+        minimums = self.minimums[level]
+        return min(minimums[start], minimums[stop - (1 << level)])
+
+
+class VirtualMenu(ModalView):
+    """
+    数千件の項目を表示できるメニュー
+
+    イベント:
+        on_select(instance, index, text): 項目がタップされたときに発行される
+    """
+
+    __events__ = ("on_select",)
+
+    def __init__(self, items=(), hint_text="入力して移動", **kwargs):
+        """
+        Args:
+            items (list): 項目の文字列
+            hint_text (str): 入力欄のヒント
+        """
+        kwargs.setdefault("size_hint", (0.85, 0.7))
+        super().__init__(**kwargs)
+        self._items = []
+        self._prefix_index = None
+
+        card = MDCard(
+            orientation="vertical",
+            padding=dp(8),
+            radius=[dp(8)]
+        )
+        self.type_ahead_field = MDTextField(
+            hint_text=hint_text,
+            size_hint_y=None,
+            height=dp(48)
+        )
+        self.type_ahead_field.bind(text=self.on_type_ahead)
+        self.list_view = RecycleList(
+            row_type="one_line",
+            on_row_press=self.on_row_press
+        )
+        card.add_widget(self.type_ahead_field)
+        card.add_widget(self.list_view)
+        self.add_widget(card)
+
+        self.items = items
+
+    @property
+    def items(self):
+        """項目の文字列のリスト"""
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = list(items)
+        self._prefix_index = None  # 次に文字が入力されたときに作り直す
+        self.list_view.data = [{"text": text} for text in self._items]
+
+    @property
+    def prefix_index(self):
+        """前方一致の検索用インデックス（初めて使うときに作成する）"""
+        if self._prefix_index is None:
+            self._prefix_index = PrefixIndex(self._items)
+        return self._prefix_index
+
+    def open(self, *args, **kwargs):
+        """入力欄を空にし、先頭までスクロールしてから開くメソッド"""
+        self.type_ahead_field.text = ""
+        self.list_view.scroll_y = 1
+        super().open(*args, **kwargs)
+
+    def scroll_to(self, index):
+        """
+        指定した位置の項目が一番上に来るようにスクロールするメソッド
+
+        Args:
+            index (int): メニュー内の位置
+        """
+        row_height = ROW_TYPES["one_line"][1]
+        scrollable = len(self._items) * row_height - self.list_view.height
+        if scrollable <= 0:
+            self.list_view.scroll_y = 1
+        else:
+            self.list_view.scroll_y = max(0.0, 1 - index * row_height / scrollable)
+
+    def on_type_ahead(self, instance, text):
+        """
+        入力欄の文字が変わったときの処理
+
+        Args:
+            instance (MDTextField): 入力欄
+            text (str): 入力された文字
+        """
+        index = self.prefix_index.first(text)
+        if index is not None:
+            self.scroll_to(index)
+
+    def on_row_press(self, instance, index):
+        """
+        項目がタップされたときの処理
+
+        Args:
+            instance (RecycleList): 項目のリスト
+            index (int): タップされた項目の位置
+        """
+        self.dismiss()
+        self.dispatch("on_select", index, self._items[index])
+
+    def on_select(self, index, text):
+        """項目が選ばれたときのデフォルトの処理（何もしない）"""
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+テスト共通の設定
+
+practice/ の共通モジュール（search_index など）をimportできるようにします。
+
+Kivy を使うモジュール（dialog_queue など）は load_practice フィクスチャでimportします。
+Kivy がインストールされていなければ kivy / kivymd の代わりに中身のないモジュールを使い、
+どちらの場合もモジュールの Clock を、テストから時間を進める FakeClock に置き換えます。
+"""
+
+import heapq
+import importlib
+import importlib.abc
+import importlib.machinery
+import itertools
+import os
+import sys
+import types
+
+import pytest
+
+
+PRACTICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "practice")
+
+if PRACTICE_DIR not in sys.path:
+    sys.path.insert(0, PRACTICE_DIR)
+
+
+class FakeClock:
+    """
+    kivy.clock.Clock の代わりに使うクロック
+
+    tick(秒) を呼ぶと時間を進め、その時刻までに予定されていた処理を呼びます。
+    Kivy と同じく、処理の中で予定した 0 秒後の処理は次の tick() で呼びます。
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self._events = []  # (時刻, 順番, イベント) のヒープ
+        self._order = itertools.count()
+
+    def monotonic(self):
+        """現在の時刻（time.monotonic() の代わり）"""
+        return self.time
+
+    def schedule_once(self, callback, timeout=0):
+        event = _FakeEvent(self, callback, timeout)
+        event()
+        return event
+
+    def create_trigger(self, callback, timeout=0):
+        return _FakeEvent(self, callback, timeout)
+
+    def _schedule(self, event):
+        heapq.heappush(self._events, (self.time + event.timeout, next(self._order), event))
+
+    def tick(self, seconds=0.0):
+        """時間を seconds 秒進め、予定の時刻が来た処理を呼ぶ"""
+        end = self.time + seconds
+        due = []
+        while self._events and self._events[0][0] <= end:
+            due.append(heapq.heappop(self._events))
+        for when, _order, event in due:
+            self.time = max(self.time, when)
+            if event.scheduled:
+                event.scheduled = False
+                event.callback(0)
+        self.time = end
+
+    def run(self, seconds, step=1 / 60):
+        """seconds 秒の間、1フレームずつ tick() する"""
+        for _ in range(round(seconds / step)):
+            self.tick(step)
+
+
+class _FakeEvent:
+    """FakeClock の予定（呼ぶとまだ予定されていなければ予定する。Kivy のトリガーと同じ）"""
+
+    def __init__(self, clock, callback, timeout):
+        self.clock = clock
+        self.callback = callback
+        self.timeout = timeout
+        self.scheduled = False
+
+    def __call__(self, *args):
+        if not self.scheduled:
+            self.scheduled = True
+            self.clock._schedule(self)
+
+    def cancel(self):
+        self.scheduled = False
+
+
+def _stub_function(value=None, *args, **kwargs):
+    """dp() などの代わりの関数（最初の引数をそのまま返す）"""
+    return value
+
+
+class _StubModule(types.ModuleType):
+    """kivy / kivymd の代わりのモジュール（小文字の名前は関数、それ以外はクラスを返す）"""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name.islower():
+            value = _stub_function
+        else:
+            value = type(name, (), {"__init__": lambda self, *args, **kwargs: None})
+        setattr(self, name, value)
+        return value
+
+
+class _StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """kivy / kivymd のimportに _StubModule を返すインポートフック"""
+
+    def find_spec(self, name, path=None, target=None):
+        if name.partition(".")[0] in ("kivy", "kivymd"):
+            return importlib.machinery.ModuleSpec(name, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        return _StubModule(spec.name)
+
+    def exec_module(self, module):
+        pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def load_practice(monkeypatch, clock):
+    """
+    Kivy を使う practice/ のモジュールをimportする関数を返すフィクスチャ
+
+    importしたモジュールの Clock は clock に置き換えます。
+    テストが終わったら、テスト中にimportしたモジュールは取り除きます。
+    """
+    try:
+        import kivy  # noqa: F401
+        finder = None
+    except ImportError:
+        finder = _StubFinder()
+        sys.meta_path.insert(0, finder)
+    before = set(sys.modules)
+
+    def load(name):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        module = importlib.import_module(name)
+        if hasattr(module, "Clock"):
+            monkeypatch.setattr(module, "Clock", clock)
+        return module
+
+    yield load
+    if finder is not None:
+        sys.meta_path.remove(finder)
+    for name in set(sys.modules) - before:
+        del sys.modules[name]
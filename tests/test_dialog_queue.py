@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""dialog_queue.py の DialogQueue のテスト（FakeClock で時間を進める）"""
+
+import pytest
+
+
+# 閉じるアニメーションの秒数
+CLOSE_SECONDS = 0.2
+
+
+class FakeDialog:
+    """
+    MDDialog の代わり
+
+    ModalView と同じく、dismiss() ですぐに on_dismiss を呼び、
+    閉じるアニメーションが終わるまでは parent が残ります。
+    """
+
+    def __init__(self, clock, on_button):
+        self.clock = clock
+        self.parent = None
+        self.title = None
+        self.text = None
+        self.press_ok = on_button("ok")
+        self._on_dismiss = []
+
+    def bind(self, on_dismiss):
+        self._on_dismiss.append(on_dismiss)
+
+    def open(self, animation=True):
+        assert self.parent is None, "閉じるアニメーション中のダイアログを開き直した"
+        self.parent = "window"
+
+    def dismiss(self, animation=True):
+        for callback in self._on_dismiss:
+            callback(self)
+        if animation:
+            self.clock.schedule_once(self._remove, CLOSE_SECONDS)
+        else:
+            self.parent = None
+
+    def _remove(self, dt):
+        self.parent = None
+
+
+class FakeInputDialog(FakeDialog):
+    """入力欄のあるダイアログの代わり（中断したときの入力内容を戻せる）"""
+
+    value = ""
+
+    def save_state(self):
+        return self.value
+
+    def restore_state(self, state):
+        self.value = state or ""
+
+
+@pytest.fixture
+def dialogs(load_practice, clock):
+    dialog_pool = load_practice("dialog_pool")
+    dialog_queue = load_practice("dialog_queue")
+    pool = dialog_pool.DialogPool()
+    pool.register("alert", lambda on_button: FakeDialog(clock, on_button))
+    pool.register("input", lambda on_button: FakeInputDialog(clock, on_button))
+    return dialog_queue.DialogQueue(pool)
+
+
+def close_and_settle(dialogs, clock):
+    """表示中のダイアログを閉じ、アニメーションが終わって次が開くまで進める"""
+    dialogs.dismiss_current()
+    clock.run(CLOSE_SECONDS + 0.2)
+
+
+def test_requests_open_in_priority_order(dialogs, clock):
+    for title, priority in (("a", 0), ("b", 5), ("c", 0), ("d", 5), ("e", 1)):
+        dialogs.request("alert", priority=priority, title=title)
+    clock.tick()
+    titles = []
+    while dialogs.dialog is not None:
+        titles.append(dialogs.dialog.title)
+        close_and_settle(dialogs, clock)
+    assert titles == ["b", "d", "e", "a", "c"]
+    assert dialogs.debug_counts()["opened"] == dialogs.debug_counts()["closed"] == 5
+
+
+def test_next_dialog_waits_for_close_animation(dialogs, clock):
+    dialogs.request("alert", title="a")
+    clock.tick()
+    first = dialogs.dialog
+    dialogs.dismiss_current()
+    dialogs.request("alert", title="b")
+    clock.tick()
+    # 閉じるアニメーションの途中は開かない（新しいダイアログも作らない）
+    assert dialogs.dialog is None and first.parent is not None
+    clock.run(CLOSE_SECONDS + 0.1)
+    assert dialogs.dialog is first and first.title == "b"
+    assert dialogs.pool.created == 1
+
+
+def test_higher_priority_preempts_and_resumes_with_state(dialogs, clock):
+    pressed = []
+    dialogs.request("input", title="入力", ok=lambda dialog: pressed.append(dialog.value))
+    clock.tick()
+    dialogs.dialog.value = "途中まで入力"
+    dialogs.request("alert", priority=10, title="エラー", ok=lambda dialog: pressed.append("error"))
+    clock.tick()
+    assert dialogs.dialog.title == "エラー"
+    assert dialogs.debug_counts()["stacked"] == 1
+    assert pressed == []      # 中断したダイアログのボタンの処理は呼ばない
+
+    dialogs.dialog.press_ok(None)
+    clock.run(CLOSE_SECONDS + 0.2)
+    assert dialogs.dialog.title == "入力"
+    assert dialogs.dialog.value == "途中まで入力"
+    dialogs.dialog.press_ok(None)
+    assert pressed == ["error", "途中まで入力"]
+
+
+def test_lower_priority_does_not_preempt(dialogs, clock):
+    dialogs.request("alert", priority=5, title="a")
+    clock.tick()
+    dialogs.request("alert", priority=5, title="b")
+    dialogs.request("alert", priority=1, title="c")
+    clock.tick()
+    assert dialogs.dialog.title == "a"
+    assert dialogs.debug_counts()["stacked"] == 0
+
+
+def test_animated_cycles_reuse_dialogs(dialogs, clock):
+    # 04_dialogs.py のストレステストと同じく、アニメーションありの開閉に中断を混ぜる
+    dialogs.pool.prewarm()
+    clock.run(0.1)
+    created = dialogs.pool.created
+    for cycle in range(30):
+        dialogs.request("alert", title=f"残り{cycle}")
+        clock.tick()
+        if cycle % 10 == 0:
+            dialogs.request("alert", priority=10, title="中断の確認")
+            clock.tick()
+        while dialogs.dialog is not None or dialogs.queued or dialogs.debug_counts()["stacked"]:
+            close_and_settle(dialogs, clock)
+    # 中断したダイアログは閉じるアニメーション中なので1つだけ作成する
+    assert dialogs.pool.created - created <= 1
+    # 30回 + 中断したダイアログ3回 + 中断から開き直した3回
+    assert dialogs.debug_counts()["opened"] == 36
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""facet_filter.py の FacetFilter のテスト（件数を1行ずつ数えた結果と比べる）"""
+
+import random
+
+import pytest
+
+import facet_filter
+from facet_filter import FacetFilter
+from range_index import RangeFilter, RangeIndex
+
+
+CATEGORIES = ["和食", "洋食", "中華", "カフェ", "居酒屋"]
+FLAGS = ["テイクアウト", "個室", "禁煙"]
+
+
+def make_rows(rng, count):
+    """各行の値（カテゴリ、フラグ、評価）のリストを作る"""
+    return [
+        {
+            "category": rng.choice(CATEGORIES),
+            "flags": {flag for flag in FLAGS if rng.random() < 0.5},
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+        }
+        for _ in range(count)
+    ]
+
+
+def make_filter(rows):
+    """rows と同じ内容の FacetFilter を作る（カテゴリは OR、フラグは AND）"""
+    facets = FacetFilter(len(rows))
+    facets.add_facet("category")
+    facets.add_facet("flags", mode="and")
+    for category in CATEGORIES:
+        facets.set_bitset("category", category, sum(
+            1 << row for row, values in enumerate(rows) if values["category"] == category
+        ))
+    for flag in FLAGS:
+        facets.set_bitset("flags", flag, sum(
+            1 << row for row, values in enumerate(rows) if flag in values["flags"]
+        ))
+    facets.add_range("rating", RangeFilter(RangeIndex([values["rating"] for values in rows])))
+    return facets
+
+
+class Model:
+    """FacetFilter と同じ条件を、1行ずつ調べて求めるモデル"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.categories = set()
+        self.flags = set()
+        self.low = None
+        self.high = None
+
+    def in_range(self, values):
+        rating = values["rating"]
+        return (self.low is None or rating >= self.low) and (self.high is None or rating <= self.high)
+
+    def passes(self, values, skip_category=False):
+        return (
+            self.in_range(values)
+            and (skip_category or not self.categories or values["category"] in self.categories)
+            and self.flags <= values["flags"]
+        )
+
+    def matching_rows(self):
+        return [row for row, values in enumerate(self.rows) if self.passes(values)]
+
+    def counts(self):
+        category_counts = {category: 0 for category in CATEGORIES}
+        flag_counts = {flag: 0 for flag in FLAGS}
+        for values in self.rows:
+            # OR のファセットは自分の選択を除いて、AND のファセットは含めて数える
+            if self.passes(values, skip_category=True):
+                category_counts[values["category"]] += 1
+            if self.passes(values):
+                for flag in values["flags"]:
+                    flag_counts[flag] += 1
+        return {"category": category_counts, "flags": flag_counts}
+
+
+def check(facets, model):
+    assert facets.counts == model.counts()
+    bits = facets.matching_bits()
+    assert facets.rows(bits) == model.matching_rows()
+    assert facets.count(bits) == len(model.matching_rows())
+
+
+@pytest.mark.parametrize("ratio", [facet_filter.DELTA_ROWS_RATIO, 0, 1])
+def test_counts_match_brute_force(monkeypatch, ratio):
+    # ratio=0 は常に数え直し、ratio=1 は常に増減した行だけを足し引きする
+    monkeypatch.setattr(facet_filter, "DELTA_ROWS_RATIO", ratio)
+    rng = random.Random(0)
+    rows = make_rows(rng, 300)
+    facets = make_filter(rows)
+    model = Model(rows)
+    check(facets, model)
+    for _ in range(300):
+        operation = rng.random()
+        if operation < 0.25:
+            category = rng.choice(CATEGORIES)
+            active = rng.random() < 0.5
+            facets.select("category", category, active)
+            (model.categories.add if active else model.categories.discard)(category)
+        elif operation < 0.4:
+            flag = rng.choice(FLAGS)
+            active = rng.random() < 0.5
+            facets.select("flags", flag, active)
+            (model.flags.add if active else model.flags.discard)(flag)
+        elif operation < 0.85:
+            model.low = rng.choice([None, round(rng.uniform(3.0, 5.0), 1)])
+            model.high = rng.choice([None, round(rng.uniform(3.0, 5.0), 1)])
+            facets.set_range("rating", model.low, model.high)
+        else:
+            values = make_rows(rng, 1)[0]
+            facets.add_row(len(rows), category=values["category"],
+                           flags=sorted(values["flags"]), rating=values["rating"])
+            rows.append(values)
+        check(facets, model)
+
+
+def test_small_range_steps_match_brute_force():
+    # スライダーを少しずつ動かす場合（増減する行が少なく、足し引きで更新される）
+    rng = random.Random(1)
+    rows = make_rows(rng, 2000)
+    facets = make_filter(rows)
+    model = Model(rows)
+    facets.select("category", "和食")
+    model.categories.add("和食")
+    for low in (3.5, 3.6, 3.5, 3.7, 3.8, 3.7):
+        model.low = low
+        facets.set_range("rating", low, None)
+        check(facets, model)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""geo_index.py の GridIndex のテスト（全行の距離を計算した結果と比べる）"""
+
+import math
+import random
+
+import pytest
+
+from geo_index import GridIndex, distance_between
+from restaurants import DEFAULT_POSITION, make_demo_store
+
+
+CENTER = (35.70, 139.70)
+
+
+@pytest.fixture(scope="module")
+def points():
+    """行番号 → (緯度, 経度)（東京の周辺に散らばった点と、座標のない行）"""
+    rng = random.Random(0)
+    points = {}
+    for row in range(3000):
+        if row % 97 == 0:
+            points[row] = (math.nan, math.nan)
+        else:
+            points[row] = (35.6 + rng.random() * 0.2, 139.6 + rng.random() * 0.2)
+    return points
+
+
+@pytest.fixture(scope="module")
+def index(points):
+    index = GridIndex()
+    for row, (latitude, longitude) in points.items():
+        index.add(row, latitude, longitude)
+    return index
+
+
+def brute_force(points, center, rows=None):
+    """全行の (距離, 行番号) を近い順に並べる"""
+    return sorted(
+        (distance_between(*center, latitude, longitude), row)
+        for row, (latitude, longitude) in points.items()
+        if not math.isnan(latitude) and (rows is None or row in rows)
+    )
+
+
+@pytest.mark.parametrize("radius", [0, 100, 800, 5000, 50000])
+def test_within_matches_brute_force(index, points, radius):
+    expected = [item for item in brute_force(points, CENTER) if item[0] <= radius]
+    assert index.within(*CENTER, radius) == expected
+
+
+@pytest.mark.parametrize("n", [1, 10, 500, 5000])
+def test_nearest_matches_brute_force(index, points, n):
+    assert index.nearest(*CENTER, n) == brute_force(points, CENTER)[:n]
+
+
+@pytest.mark.parametrize("count", [0, 1, 5, 50, 2000, 3500])
+def test_nearest_within_rows_matches_brute_force(index, points, count):
+    # 少ない rows は直接計算し、多い rows はマスを広げながら探す
+    rows = set(random.Random(count).sample(range(3500), count))
+    assert index.nearest(*CENTER, 100, rows=rows) == brute_force(points, CENTER, rows)[:100]
+
+
+def test_nearest_from_far_away(index, points):
+    # すべての点が遠い中心から探しても、全行を調べたところで止まる
+    center = (43.06, 141.35)
+    assert index.nearest(*center, 20) == brute_force(points, center)[:20]
+
+
+def test_extend_registers_new_rows_only():
+    store = make_demo_store(500)
+    index = GridIndex()
+    index.extend(store, 200)
+    index.extend(store, 500)
+    full = GridIndex.from_store(store)
+    assert index.count == full.count
+    assert index.nearest(*DEFAULT_POSITION, 50) == full.nearest(*DEFAULT_POSITION, 50)
+
+
+def test_empty_index():
+    index = GridIndex()
+    assert index.within(*CENTER, 1000) == []
+    assert index.nearest(*CENTER, 10) == []
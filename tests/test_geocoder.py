@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""geocoder.py の Geocoder のテスト"""
+
+import pytest
+
+import geocoder
+from geocoder import Geocoder, normalize_address
+
+
+@pytest.fixture
+def coder():
+    coder = Geocoder()
+    coder.add(("東京都", "", ""), 35.6895, 139.6917)
+    coder.add(("東京都", "渋谷区", ""), 35.6640, 139.6982)
+    coder.add(("東京都", "渋谷区", "道玄坂2丁目"), 35.6590, 139.6975)
+    coder.add(("東京都", "府中市", ""), 35.6689, 139.4776)
+    coder.add(("東京都", "府中市", "宮町1丁目"), 35.6717, 139.4800)
+    coder.add(("広島県", "", ""), 34.3966, 132.4596)
+    coder.add(("広島県", "府中市", ""), 34.5681, 133.2365)
+    return coder
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("道玄坂2-1-1", "道玄坂2丁目1-1"),
+    ("道玄坂二丁目1-1", "道玄坂2丁目1-1"),
+    ("道玄坂２－１－１", "道玄坂2丁目1-1"),
+    ("東京都 渋谷区", "東京都渋谷区"),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+def test_geocode_returns_deepest_match(coder):
+    assert coder.geocode("東京都渋谷区道玄坂2-1-1") == (35.6590, 139.6975, "town")
+    assert coder.geocode("東京都渋谷区宇田川町1-1") == (35.6640, 139.6982, "city")
+    assert coder.geocode("東京都千代田区") == (35.6895, 139.6917, "prefecture")
+    assert coder.geocode("北海道札幌市") is None
+
+
+def test_geocode_without_prefecture(coder):
+    assert coder.geocode("渋谷区道玄坂二丁目1-1") == (35.6590, 139.6975, "town")
+    assert coder.geocode("渋谷区宇田川町") == (35.6640, 139.6982, "city")
+
+
+def test_ambiguous_city_needs_a_unique_town(coder):
+    # 府中市は東京都と広島県にあるので、市区町村だけでは決められない
+    assert coder.geocode("府中市") is None
+    assert coder.geocode("府中市宮町1-1") == (35.6717, 139.4800, "town")
+    assert coder.geocode("広島県府中市") == (34.5681, 133.2365, "city")
+
+
+def test_memo_keeps_recently_used_addresses(coder, monkeypatch):
+    monkeypatch.setattr(geocoder, "MEMO_SIZE", 2)
+    coder.geocode("東京都渋谷区")
+    coder.geocode("東京都府中市")
+    coder.geocode("東京都渋谷区")      # 使ったので最後に消される
+    coder.geocode("広島県府中市")
+    assert list(coder._memo) == ["東京都渋谷区", "広島県府中市"]
+
+
+def test_add_clears_memo(coder):
+    assert coder.geocode("東京都渋谷区神南1-1") == (35.6640, 139.6982, "city")
+    coder.add(("東京都", "渋谷区", "神南1丁目"), 35.6637, 139.7000)
+    assert coder.geocode("東京都渋谷区神南1-1") == (35.6637, 139.7000, "town")
+
+
+def test_bundled_gazetteer():
+    coder = Geocoder.from_file()
+    latitude, longitude, level = coder.geocode("東京都渋谷区道玄坂2-1-1")
+    assert level == "town"
+    assert coder.geocode("渋谷区道玄坂2-1-1") == (latitude, longitude, level)
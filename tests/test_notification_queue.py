@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""notification_queue.py の NotificationQueue のテスト（FakeClock で時間を進める）"""
+
+import pytest
+
+
+# スナックバーの閉じるアニメーションの秒数
+CLOSE_SECONDS = 0.2
+
+
+class FakeWidget:
+    """スナックバーの中のラベル・ボタンの代わり"""
+
+    def __init__(self, *children, **kwargs):
+        self.text = ""
+        self.__dict__.update(kwargs)
+
+    def add_widget(self, widget):
+        pass
+
+
+class FakeSnackbar(FakeWidget):
+    """MDSnackbar の代わり（閉じるアニメーションが終わるまで parent が残る）"""
+
+    clock = None
+
+    def __init__(self, *children, **kwargs):
+        super().__init__(*children, **kwargs)
+        self.md_bg_color = [0.2, 0.2, 0.2, 1]
+        self.parent = None
+
+    def open(self):
+        assert self.parent is None, "閉じるアニメーション中のスナックバーを開き直した"
+        self.parent = "window"
+
+    def dismiss(self):
+        self.clock.schedule_once(self._remove, CLOSE_SECONDS)
+
+    def _remove(self, dt):
+        self.parent = None
+
+
+@pytest.fixture
+def module(load_practice, clock, monkeypatch):
+    module = load_practice("notification_queue")
+    monkeypatch.setattr(module, "time", clock)   # time.monotonic() を clock の時刻にする
+    monkeypatch.setattr(FakeSnackbar, "clock", clock)
+    monkeypatch.setattr(module, "MDSnackbar", FakeSnackbar)
+    for name in ("MDSnackbarText", "MDSnackbarSupportingText", "MDSnackbarButtonContainer",
+                 "MDSnackbarCloseButton", "MDSnackbarActionButton"):
+        monkeypatch.setattr(module, name, FakeWidget)
+    return module
+
+
+@pytest.fixture
+def queue(module):
+    return module.NotificationQueue(min_interval=1.0, max_pending=20)
+
+
+def displayed(queue):
+    """表示中の本文（閉じていれば None）"""
+    if queue.current is None:
+        return None
+    return queue.snackbar.text_label.text
+
+
+def test_same_text_is_counted_once(queue, clock):
+    for _ in range(3):
+        queue.notify("保存しました")
+    clock.tick()
+    assert displayed(queue) == "保存しました ×3"
+    queue.notify("保存しました")
+    clock.tick()
+    assert displayed(queue) == "保存しました ×4"
+    counts = queue.debug_counts()
+    assert counts["requested"] == 4 and counts["shown"] == 1 and counts["created"] == 1
+
+
+def test_higher_priority_replaces_and_requeues(queue, clock):
+    queue.notify("a")
+    clock.tick()
+    queue.notify("エラー", priority=10)
+    clock.tick()
+    assert displayed(queue) == "エラー"
+    assert queue.queued == 1
+    clock.run(3.1)
+    assert displayed(queue) == "a"
+
+
+def test_lower_priority_waits_for_duration(queue, clock):
+    queue.notify("エラー", priority=10, duration=3)
+    clock.tick()
+    queue.notify("a")
+    clock.tick()
+    clock.run(2.0)
+    # min_interval を過ぎても、低い優先度のためにエラーを早く閉じない
+    assert displayed(queue) == "エラー"
+    clock.run(1.1)
+    assert displayed(queue) == "a"
+
+
+def test_same_priority_rotates_after_min_interval(queue, clock):
+    for text in ("a", "b", "c"):
+        queue.notify(text, duration=5)
+    clock.tick()
+    seen = [displayed(queue)]
+    for _ in range(2):
+        clock.run(1.1)
+        seen.append(displayed(queue))
+    assert seen == ["a", "b", "c"]
+    clock.run(5.1)
+    assert displayed(queue) is None
+
+
+def test_overflow_merges_lowest_priority(module, clock):
+    queue = module.NotificationQueue(max_pending=3)
+    queue.notify("表示中")
+    clock.tick()
+    for index in range(5):
+        queue.notify(f"通知{index}", priority=index)
+    texts = []
+    while queue.current is not None:
+        texts.append(displayed(queue))
+        queue.dismiss_current()
+    # 優先度の高い3件が残り、低い2件は1件にまとめられる
+    assert texts == ["表示中", "通知4", "通知3", "通知2", "ほかに2件の通知があります"]
+
+
+def test_reopens_after_close_animation(queue, clock):
+    queue.notify("a", duration=1)
+    clock.tick()
+    clock.run(1.05)
+    assert queue.current is None and queue.snackbar.parent is not None
+    queue.notify("b")
+    clock.tick()
+    # 閉じるアニメーションが終わってから、同じスナックバーで開き直す
+    assert queue.current is None
+    clock.run(CLOSE_SECONDS + 0.2)
+    assert displayed(queue) == "b"
+    assert queue.debug_counts()["created"] == 1
+
+
+def test_many_notifications_touch_widgets_per_frame(queue, clock):
+    for index in range(1000):
+        queue.notify("保存しました" if index % 2 else "同期しました")
+    clock.tick()
+    assert queue.debug_counts()["widget_ops"] <= 3
+    assert displayed(queue) == "同期しました ×500"
+
+
+def test_max_pending_must_be_positive(module):
+    with pytest.raises(ValueError):
+        module.NotificationQueue(max_pending=0)
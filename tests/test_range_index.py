@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""range_index.py の RangeIndex と RangeFilter のテスト"""
+
+import random
+
+import pytest
+
+from range_index import RangeFilter, RangeIndex, bitset_from_rows
+
+
+VALUES = [3.5, 4.2, 3.0, 4.8, 3.9, 4.2, 3.1, 4.5, 3.7, 4.0, 3.3, 4.9]
+
+
+def expected_bits(values, low, high):
+    """low 以上 high 以下の値を持つ行のビットセットを1行ずつ調べて作る"""
+    rows = [
+        row for row, value in enumerate(values)
+        if (low is None or value >= low) and (high is None or value <= high)
+    ]
+    return bitset_from_rows(rows, len(values))
+
+
+def test_rows_between_uses_inclusive_bounds():
+    index = RangeIndex(VALUES)
+    assert sorted(index.rows_between(4.2, 4.5)) == [1, 5, 7]
+    assert sorted(index.rows_between(None, 3.1)) == [2, 6]
+    assert index.rows_between(5.0, None) == []
+
+
+@pytest.mark.parametrize("ranges", [
+    # 範囲が重ならないほど大きく動く（2つの端の間に同じ行が入る）
+    [(3.0, 3.3), (4.5, 4.9), (3.0, 3.3)],
+    # 内側の範囲に狭める・外側に広げる
+    [(3.0, 4.9), (3.5, 4.2), (3.0, 4.9)],
+    # 一部が重なる範囲にずらす
+    [(3.0, 4.0), (3.7, 4.5), (3.3, 4.2)],
+    # 下限だけ・上限だけ・指定なし
+    [(4.0, None), (None, 3.5), (None, None)],
+])
+def test_set_range_matches_full_recompute(ranges):
+    range_filter = RangeFilter(RangeIndex(VALUES))
+    for low, high in ranges:
+        range_filter.set_range(low, high)
+        assert range_filter.bits == expected_bits(VALUES, low, high)
+
+
+def test_set_range_returns_flipped_rows():
+    range_filter = RangeFilter(RangeIndex(VALUES))
+    assert sorted(range_filter.set_range(4.8, None)) == [0, 1, 2, 4, 5, 6, 7, 8, 9, 10]
+    assert range_filter.set_range(4.75, None) == []
+
+
+def test_set_range_random_changes():
+    rng = random.Random(0)
+    values = [round(rng.uniform(3.0, 5.0), 1) for _ in range(500)]
+    range_filter = RangeFilter(RangeIndex(values))
+    for _ in range(200):
+        low = rng.choice([None, round(rng.uniform(3.0, 5.0), 1)])
+        high = rng.choice([None, round(rng.uniform(3.0, 5.0), 1)])
+        range_filter.set_range(low, high)
+        assert range_filter.bits == expected_bits(values, low, high)
+
+
+def test_add_keeps_range_bits():
+    values = list(VALUES)
+    range_filter = RangeFilter(RangeIndex(values))
+    range_filter.set_range(4.0, 4.5)
+    for value in (4.1, 3.2, 4.5):
+        range_filter.add(len(values), value)
+        values.append(value)
+    assert range_filter.bits == expected_bits(values, 4.0, 4.5)
+    range_filter.set_range(None, 3.5)
+    assert range_filter.bits == expected_bits(values, None, 3.5)
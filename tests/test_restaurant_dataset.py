@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""restaurant_dataset.py のデータファイルの書き出しと読み込みのテスト"""
+
+import math
+import os
+
+import pytest
+
+import restaurant_dataset
+from restaurant_dataset import MappedRestaurantStore, load_store, write_dataset
+from restaurants import SAMPLE_RESTAURANTS, RestaurantStore, make_demo_store
+
+
+def nan_list(values):
+    """NaN どうしも等しく比べられるように、NaN を None にしたリスト"""
+    return [None if math.isnan(value) else value for value in values]
+
+
+def assert_same_store(mapped, store):
+    assert len(mapped) == len(store)
+    assert list(mapped.names) == list(store.names)
+    assert list(mapped.addresses) == list(store.addresses)
+    assert mapped.categories == store.categories
+    assert mapped.category_ids == store.category_ids
+    assert list(mapped.category_codes) == list(store.category_codes)
+    assert list(mapped.ratings) == list(store.ratings)
+    assert list(mapped.distances) == list(store.distances)
+    assert nan_list(mapped.latitudes) == nan_list(store.latitudes)
+    assert nan_list(mapped.longitudes) == nan_list(store.longitudes)
+    for row in range(len(store)):
+        assert mapped.record(row) == store.record(row)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(str(tmp_path), "restaurants.rstd")
+
+
+def test_round_trip_demo_store(path):
+    store = make_demo_store(2000)
+    write_dataset(store, path)
+    assert_same_store(load_store(path), store)
+
+
+def test_round_trip_unusual_strings_and_missing_coordinates(path):
+    store = RestaurantStore()
+    store.append("", "和食", "", 3.0, 0)
+    store.append("カフェ☕ 𠮷野家", "カフェ", "東京都渋谷区\n道玄坂2-1-1", 4.5, 4294967295,
+                 35.659, 139.6975)
+    store.append("ｶﾌｪ", "カフェ", "大阪府大阪市北区梅田1丁目", 5.0, 120)
+    write_dataset(store, path)
+    mapped = load_store(path)
+    assert_same_store(mapped, store)
+    assert mapped.names[-1] == "ｶﾌｪ"
+    assert math.isnan(mapped.latitudes[0]) and mapped.latitudes[1] == 35.659
+
+
+def test_round_trip_empty_store(path):
+    write_dataset(RestaurantStore(), path)
+    mapped = load_store(path)
+    assert len(mapped) == 0
+    assert mapped.categories == []
+
+
+def test_reads_version_1_without_coordinates(path, monkeypatch):
+    # バージョン1の並び順で書き出す（緯度・経度のセクションがない）
+    header, sections = restaurant_dataset.LAYOUTS[1]
+    monkeypatch.setattr(restaurant_dataset, "VERSION", 1)
+    monkeypatch.setattr(restaurant_dataset, "HEADER", header)
+    monkeypatch.setattr(restaurant_dataset, "SECTIONS", sections)
+    store = make_demo_store(100)
+    write_dataset(store, path)
+    monkeypatch.undo()
+    mapped = load_store(path)
+    assert list(mapped.names) == list(store.names)
+    assert list(mapped.ratings) == list(store.ratings)
+    assert all(math.isnan(value) for value in mapped.latitudes)
+    assert len(mapped.longitudes) == len(store)
+
+
+def test_rejects_other_files(path):
+    with open(path, "wb") as f:
+        f.write(b"NOT A DATASET FILE" * 8)
+    with pytest.raises(ValueError):
+        MappedRestaurantStore(path)
+
+
+def test_mapped_store_is_read_only(path):
+    write_dataset(make_demo_store(10), path)
+    with pytest.raises(TypeError):
+        load_store(path).append("店", "和食", "住所", 4.0, 100)
+
+
+def test_load_store_falls_back_to_sample_data(path):
+    store = load_store(path)
+    assert not isinstance(store, MappedRestaurantStore)
+    assert len(store) == len(SAMPLE_RESTAURANTS)
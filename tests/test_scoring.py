@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""scoring.py の RecommendationScorer のテスト（全件の並べ替えと比べる）"""
+
+import random
+
+import pytest
+
+import scoring
+from restaurants import RestaurantStore, make_demo_store
+from scoring import RecommendationScorer
+
+
+PREFERENCES = {"カフェ": 1.0, "居酒屋": -0.5}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def use_numpy(request, monkeypatch):
+    """NumPy を使う場合と、使わない場合（Python のループ）の両方で試す"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(scoring, "np", None)
+    return request.param == "numpy"
+
+
+def brute_order(scorer):
+    """スコアの高い順（同じスコアなら行番号順）に1行ずつ並べた行番号"""
+    scores = scorer.scores
+    return sorted(range(len(scores)), key=lambda row: (-scores[row], row))
+
+
+def test_order_matches_brute_force(use_numpy):
+    scorer = RecommendationScorer(make_demo_store(3000), preferences=PREFERENCES)
+    assert scorer.order() == brute_order(scorer)
+
+
+@pytest.mark.parametrize("start, stop", [(0, 1), (0, 20), (10, 50), (0, 999)])
+def test_top_k_matches_full_sort(use_numpy, start, stop):
+    store = make_demo_store(3000)
+    expected = brute_order(RecommendationScorer(store, preferences=PREFERENCES))
+    assert RecommendationScorer(store, preferences=PREFERENCES).rows(start, stop) == expected[start:stop]
+
+
+def test_top_k_with_tied_scores(use_numpy):
+    # 評価と距離を少ない種類にして、同じスコアの行をたくさん作る
+    store = make_demo_store(2000)
+    for row in range(len(store)):
+        store.ratings[row] = 3.0 + row % 3
+        store.distances[row] = 500 * (row % 2)
+    expected = brute_order(RecommendationScorer(store))
+    for stop in (1, 7, 100, 500):
+        assert RecommendationScorer(store).rows(0, stop) == expected[:stop]
+
+
+def test_update_matches_fresh_scorer(use_numpy):
+    store = make_demo_store(3000)
+    scorer = RecommendationScorer(store, preferences=PREFERENCES)
+    scorer.order()
+    rng = random.Random(0)
+    changed = rng.sample(range(len(store)), 50)
+    for row in changed:
+        store.ratings[row] = round(rng.uniform(3.0, 5.0), 1)
+        store.distances[row] = rng.randint(50, 5000)
+    scorer.update(changed + [len(store) + 10])   # 範囲外の行は無視される
+    fresh = RecommendationScorer(store, preferences=PREFERENCES)
+    assert list(scorer.scores) == list(fresh.scores)
+    assert scorer.rows(0, 20) == fresh.rows(0, 20)
+    assert scorer.order() == fresh.order()
+
+
+def test_set_preferences_changes_order(use_numpy):
+    store = make_demo_store(1000)
+    scorer = RecommendationScorer(store)
+    scorer.order()
+    scorer.set_preferences(PREFERENCES)
+    assert scorer.order() == brute_order(RecommendationScorer(store, preferences=PREFERENCES))
+
+
+def test_empty_store(use_numpy):
+    scorer = RecommendationScorer(RestaurantStore())
+    assert len(scorer.scores) == 0
+    assert scorer.rows(0, 10) == []
+    assert scorer.order() == []
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""search_index.py の SearchIndex と normalize() のテスト"""
+
+import pytest
+
+from restaurants import RestaurantStore, make_demo_store
+from search_index import SearchIndex, normalize
+
+
+RECORDS = [
+    ("ラーメン大将 渋谷店", "東京都渋谷区道玄坂1-2-3"),
+    ("らーめん 花", "東京都新宿区西新宿2-8-1"),
+    ("カフェ・ド・ソレイユ", "東京都渋谷区神南1-1-1"),
+    ("ﾗｰﾒﾝ 一番", "大阪府大阪市北区梅田1-1"),
+    ("寿司 さくら", "東京都渋谷区宇田川町5-5"),
+    ("ＣＡＦＥ Ｍｏｏｎ", "東京都港区六本木6-6-6"),
+    ("ラー油とメン", "東京都品川区大崎3-3"),
+]
+
+
+def make_store():
+    """RECORDS の店名と住所を持つストアを作成する"""
+    store = RestaurantStore()
+    for name, address in RECORDS:
+        store.append(name, "その他", address, 3.5, 100)
+    return store
+
+
+@pytest.fixture(params=["texts", "store"])
+def index(request):
+    """文字列を保持するインデックスと、ストアから取り出すインデックスの両方で試す"""
+    if request.param == "texts":
+        index = SearchIndex()
+        for row, (name, address) in enumerate(RECORDS):
+            index.add(row, name, address)
+        return index
+    return SearchIndex.from_store(make_store())
+
+
+def test_normalize_folds_width_kana_and_case():
+    assert normalize("ﾗｰﾒﾝ") == "ラーメン"
+    assert normalize("らーめん") == "ラーメン"
+    assert normalize("ＣＡＦＥ Ｍｏｏｎ") == "cafe moon"
+    assert normalize("１２３") == "123"
+
+
+def test_search_matches_across_kana_and_width(index):
+    assert index.search("らーめん") == [0, 1, 3]
+    assert index.search("ラーメン") == [0, 1, 3]
+    assert index.search("cafe") == [5]
+
+
+def test_search_verifies_long_terms_are_contiguous(index):
+    # "ラー油とメン" は ラー・ーメ 以外の 2-gram を含むが "ラーメン" は含まない
+    assert 6 not in index.search("らーめん")
+    assert index.search("ラー") == [0, 1, 3, 6]
+
+
+def test_search_does_not_match_across_fields(index):
+    # 店名の末尾と住所の先頭をつなげた文字列には一致しない
+    assert index.search("店東京") == []
+
+
+def test_and_query_requires_every_term(index):
+    assert index.search("渋谷 らーめん") == [0]
+    assert index.search("渋谷区") == [0, 2, 4]
+    assert index.search("渋谷区 さくら") == [4]
+    assert index.search("渋谷 梅田") == []
+
+
+def test_limit_returns_first_rows_in_order(index):
+    assert index.search("東京都", limit=2) == [0, 1]
+    assert index.search("らーめん", limit=2) == [0, 1]
+    assert index.search("らーめん", limit=0) == []
+    assert index.search("東京都", limit=100) == [0, 1, 2, 4, 5, 6]
+
+
+@pytest.fixture(scope="module")
+def demo_index():
+    return SearchIndex.from_store(make_demo_store(20000))
+
+
+@pytest.mark.parametrize("query", ["らーめん", "さくら 3-3-3", "渋谷 らーめん", "ン", "カフェ 東京"])
+def test_limit_matches_unlimited_prefix_across_chunks(demo_index, query):
+    # SEARCH_CHUNK_ROWS を何度もまたぐ件数で、limit の有無による違いがないことを確認する
+    expected = demo_index.search(query)
+    for limit in (1, 3, 500, 5000, len(demo_index)):
+        assert demo_index.search(query, limit=limit) == expected[:limit]
+
+
+def test_empty_or_unknown_query(index):
+    assert index.search("") == []
+    assert index.search("   ") == []
+    assert index.search("存在しない店") == []
+
+
+def test_remove_and_readd(index):
+    index.remove(0)
+    assert 0 not in index
+    assert len(index) == len(RECORDS) - 1
+    assert index.search("らーめん") == [1, 3]
+    index.remove(0)  # 登録されていない行の削除は何もしない
+
+    index.add(0, RECORDS[0][0], RECORDS[0][1])
+    assert index.search("らーめん") == [0, 1, 3]
+
+
+def test_add_out_of_order_keeps_rows_sorted():
+    index = SearchIndex()
+    for row in (5, 1, 3):
+        index.add(row, "ラーメン")
+    index.add(0, "らーめん")
+    assert index.search("らーめん") == [0, 1, 3, 5]
+    assert list(index.postings["ラー"]) == [0, 1, 3, 5]
+
+
+def test_add_replaces_existing_row():
+    index = SearchIndex()
+    index.add(0, "ラーメン")
+    index.add(0, "カフェ")
+    assert index.search("らーめん") == []
+    assert index.search("カフェ") == [0]
+    assert len(index) == 1
+
+
+def test_cancelled_search_returns_nothing(index):
+    assert index.search("東京都", cancelled=lambda: True) == []
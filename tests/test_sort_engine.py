@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""sort_engine.py の SortEngine のテスト"""
+
+import os
+import random
+
+import pytest
+
+from restaurant_dataset import load_store, write_dataset
+from restaurants import make_demo_store
+from sort_engine import NAME_SORT, SORT_TYPES, SortEngine
+
+
+KEY_SORT_TYPES = ("人気順", "評価順", NAME_SORT)
+
+
+def full_order(engine, sort_type):
+    """全件を並べ替えた行番号（top-k を使わない）"""
+    return engine.rows(sort_type, 0, None)
+
+
+@pytest.fixture
+def store():
+    return make_demo_store(2000)
+
+
+@pytest.mark.parametrize("sort_type", SORT_TYPES)
+def test_top_k_matches_full_sort(store, sort_type):
+    expected = full_order(SortEngine(store), sort_type)
+    for start, stop in ((0, 1), (0, 50), (30, 80), (0, 1000)):
+        assert SortEngine(store).rows(sort_type, start, stop) == expected[start:stop]
+
+
+def test_row_order_types(store):
+    engine = SortEngine(store)
+    assert engine.rows("新着順", 0, 3) == [len(store) - 1, len(store) - 2, len(store) - 3]
+    assert engine.rows("古い順", 5, 8) == [5, 6, 7]
+
+
+def test_rating_order_is_by_rating(store):
+    rows = full_order(SortEngine(store), "評価順")
+    ratings = [store.ratings[row] for row in rows]
+    assert ratings == sorted(ratings, reverse=True)
+    assert sorted(rows) == list(range(len(store)))
+
+
+@pytest.mark.parametrize("sort_type", KEY_SORT_TYPES)
+def test_update_matches_fresh_engine(store, sort_type):
+    engine = SortEngine(store)
+    engine.rows(sort_type, 0, 50)        # packed だけ作成した状態
+    full_order(engine, sort_type)        # order も作成した状態
+    rng = random.Random(0)
+    changed = rng.sample(range(len(store)), 40)
+    for row in changed:
+        store.ratings[row] = round(rng.uniform(3.0, 5.0), 1)
+        store.distances[row] = rng.randint(50, 5000)
+    engine.update(changed)
+    fresh = SortEngine(store)
+    assert full_order(engine, sort_type) == full_order(fresh, sort_type)
+    assert engine.rows(sort_type, 0, 50) == fresh.rows(sort_type, 0, 50)
+
+
+@pytest.mark.parametrize("sort_type", KEY_SORT_TYPES)
+def test_extend_matches_fresh_engine(sort_type):
+    store = make_demo_store(500)
+    engine = SortEngine(store)
+    full_order(engine, sort_type)
+    more = make_demo_store(200, seed=1)
+    for row in range(len(more)):
+        record = more.record(row)
+        store.append(record["name"], record["category"], record["address"],
+                     record["rating"], more.distances[row])
+    engine.extend(len(store))
+    assert full_order(engine, sort_type) == full_order(SortEngine(store), sort_type)
+
+
+@pytest.mark.parametrize("sort_type", SORT_TYPES)
+def test_mapped_store_round_trip(tmp_path, store, sort_type):
+    path = os.path.join(str(tmp_path), "restaurants.rstd")
+    write_dataset(store, path)
+    mapped = load_store(path)
+    assert SortEngine(mapped).rows(sort_type, 0, 5) == SortEngine(store).rows(sort_type, 0, 5)
+    assert full_order(SortEngine(mapped), sort_type) == full_order(SortEngine(store), sort_type)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""virtual_menu.py の PrefixIndex のテスト（先頭から1件ずつ調べた結果と比べる）"""
+
+import random
+
+import pytest
+
+from search_index import normalize
+
+
+ITEMS = ["らーめん", "ラーメン", "カフェ", "寿司", "すし", "ｶﾌｪ", "焼肉\n店", "A", "ab"]
+
+
+@pytest.fixture
+def PrefixIndex(load_practice):
+    return load_practice("virtual_menu").PrefixIndex
+
+
+def brute_force(items, prefix):
+    """prefix で始まる最初の項目の位置を、先頭から1件ずつ調べて求める"""
+    prefix = normalize(prefix).strip()
+    if not prefix:
+        return None
+    return next(
+        (position for position, text in enumerate(items)
+         if normalize(text.replace("\n", " ")).startswith(prefix)),
+        None
+    )
+
+
+def test_first_matches_brute_force(PrefixIndex):
+    rng = random.Random(0)
+    items = [rng.choice(ITEMS) + str(rng.randrange(100)) for _ in range(3000)]
+    index = PrefixIndex(items)
+    assert len(index.keys) == len(items)
+    queries = ["ら", "ラー", "かふ", "ｶﾌ", "寿", "す", "焼肉", "焼肉 店1", "a", "AB1", "zz", "らーめん5", " ", ""]
+    queries += [rng.choice(items)[:rng.randint(1, 4)] for _ in range(200)]
+    for query in queries:
+        assert index.first(query) == brute_force(items, query), query
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 5, 8, 9])
+def test_first_on_small_menus(PrefixIndex, count):
+    # 区間の最小値の表の段数が変わる件数でも、すべての区間で正しく求まる
+    items = ["b", "a", "ab", "b", "aa", "c", "a", "ba", "abc"][:count]
+    index = PrefixIndex(items)
+    for query in ("a", "ab", "b", "c", "d"):
+        assert index.first(query) == brute_force(items, query), query
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_build.py - 各サンプルAppの build() ベンチマーク
+
+ランチャー（KivyMDPracticeApp）と main.py の SAMPLES にある
+全サンプルのAppクラスを作成し、run() せずに build() だけを呼び出して
+次の値を測定します。
+- wall time（build() にかかった時間、複数回の中央値）
+- ウィジェット数（ルートウィジェット以下の全ウィジェット）
+- キャンバス命令数（canvas.before / canvas / canvas.after の命令）
+- tracemalloc で測ったピークメモリ
+
+結果はJSONに書き出せるので、前回の結果と比較して
+遅くなった画面（リグレッション）を見つけられます。
+
+実行方法:
+    python tools/bench_build.py --json build.json
+    python tools/bench_build.py --compare build.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# ウィンドウを表示せずにウィジェットを作成するための設定
+# （kivy をimportする前に設定する必要がある）
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from kivy.app import App  # noqa: E402
+
+import main  # noqa: E402
+
+
+def count_widgets(root):
+    """ルートウィジェット以下のウィジェット数を数える"""
+    return sum(1 for _widget in root.walk(restrict=True))
+
+
+def count_instructions(group):
+    """
+    命令グループ以下のキャンバス命令数を再帰的に数える
+
+    Args:
+        group (InstructionGroup): キャンバスまたは命令グループ
+
+    Returns:
+        int: 命令数
+    """
+    total = 0
+    for instruction in group.children:
+        total += 1
+        if hasattr(instruction, "children"):
+            total += count_instructions(instruction)
+    return total
+
+
+def count_canvas_instructions(root):
+    """
+    ルートウィジェット以下の全キャンバス命令数を数える
+
+    canvas.before / canvas.after は参照すると作成されてしまうため、
+    has_before / has_after で存在を確認してから数えます。
+    """
+    total = 0
+    for widget in root.walk(restrict=True):
+        canvas = widget.canvas
+        total += count_instructions(canvas)
+        if canvas.has_before:
+            total += count_instructions(canvas.before)
+        if canvas.has_after:
+            total += count_instructions(canvas.after)
+    return total
+
+
+def build_once(app_class):
+    """
+    Appを作成して build() を1回呼び出す
+
+    Returns:
+        tuple: (ルートウィジェット, build()の秒数)
+    """
+    app = app_class()
+    start = time.perf_counter()
+    root = app.build()
+    elapsed = time.perf_counter() - start
+    app.root = root
+    return root, elapsed
+
+
+def measure(app_class, repeat):
+    """
+    1つのAppクラスについて各値を測定する
+
+    時間はtracemallocのオーバーヘッドを含まないように、
+    メモリの測定とは別に計測します。
+
+    Args:
+        app_class (type): MDAppのサブクラス
+        repeat (int): 時間の測定回数
+
+    Returns:
+        dict: 測定結果
+    """
+    times = [build_once(app_class)[1] for _ in range(repeat)]
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    root, _elapsed = build_once(app_class)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms": statistics.median(times) * 1000,
+        "widgets": count_widgets(root),
+        "canvas_instructions": count_canvas_instructions(root),
+        "peak_kib": peak / 1024,
+    }
+
+
+def collect_app_classes():
+    """
+    測定対象の (名前, Appクラス) の一覧を作成する
+
+    Returns:
+        list: [(ファイル名, Appクラス), ...]
+    """
+    targets = [("main.py", main.KivyMDPracticeApp)]
+    for filename, _title, _description in main.SAMPLES:
+        app_class = main.find_app_class(main.load_sample_module(filename))
+        if app_class is not None:
+            targets.append((filename, app_class))
+    return targets
+
+
+def compare(results, baseline, threshold):
+    """
+    前回の結果と比較してリグレッションを表示する
+
+    Args:
+        results (dict): 今回の結果
+        baseline (dict): 前回の結果
+        threshold (float): 許容する増加率（0.2なら20%）
+
+    Returns:
+        list: リグレッションのあった (ファイル名, 項目, 前回, 今回) のリスト
+    """
+    regressions = []
+    for filename, current in results.items():
+        previous = baseline.get(filename)
+        if previous is None:
+            continue
+        for key, value in current.items():
+            if key not in previous or key == "app":
+                continue
+            if value > previous[key] * (1 + threshold):
+                regressions.append((filename, key, previous[key], value))
+    return regressions
+
+
+def main_cli():
+    """ベンチマークのエントリーポイント"""
+    parser = argparse.ArgumentParser(description="build() のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=5, help="時間の測定回数")
+    parser.add_argument("--json", help="結果を書き込むJSONファイル")
+    parser.add_argument("--compare", help="比較する前回の結果（JSON）")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="リグレッションとみなす増加率（既定: 0.2）")
+    args = parser.parse_args()
+
+    results = {}
+    for filename, app_class in collect_app_classes():
+        results[filename] = {"app": app_class.__name__, **measure(app_class, args.repeat)}
+        App._running_app = None
+
+    print(f"{'ファイル':<26}{'build':>10}{'widgets':>9}{'canvas':>8}{'peak':>11}")
+    for filename, r in results.items():
+        print(f"{filename:<26}{r['wall_ms']:>8.1f}ms{r['widgets']:>9}"
+              f"{r['canvas_instructions']:>8}{r['peak_kib']:>8.0f}KiB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for filename, key, before, after in regressions:
+            print(f"リグレッション: {filename} {key} {before:.1f} → {after:.1f}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_launch.py - サンプル起動時間のベンチマーク（コールド vs ウォーム）
+
+main.py の SAMPLES にある全サンプルについて、
+「最初のフレームが描画されるまでの時間」を次の2通りで測定します。
+- コールド: 新しい Python プロセスを起動してスクリプトを実行
+- ウォーム: zygote.py のプールからforkした子プロセスで実行
+
+各サンプルは最初のフレームを描画した直後に自動で終了します。
+ウィンドウを作成するため、ディスプレイのある環境で実行してください。
+
+実行方法:
+    python tools/bench_launch.py
+    python tools/bench_launch.py --repeat 3 --json launch.json
+    python tools/bench_launch.py 16_menu.py --repeat 5 --compare launch.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from zygote import PRACTICE_DIR, ROOT_DIR, ZygotePool, read_samples
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# コールド起動時に子プロセスで実行するコード
+COLD_BOOTSTRAP = (
+    "import sys; sys.path.insert(0, {tools!r}); "
+    "import zygote; zygote.run_script({script!r}, {report!r})"
+)
+
+
+def read_report(report_path):
+    """
+    子プロセスが書き込んだ最初のフレームの時刻を読み込む関数
+
+    Args:
+        report_path (str): 時刻が書き込まれたファイル
+
+    Returns:
+        float: time.monotonic() の値（書き込まれていなければNone）
+    """
+    try:
+        with open(report_path) as f:
+            return float(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def measure_cold(script, report_path):
+    """
+    新しいプロセスでスクリプトを起動し、最初のフレームまでの秒数を返す
+
+    Args:
+        script (str): スクリプトのパス
+        report_path (str): 時刻の書き込み先
+
+    Returns:
+        float: 最初のフレームまでの秒数（失敗した場合はNone）
+    """
+    code = COLD_BOOTSTRAP.format(tools=TOOLS_DIR, script=script, report=report_path)
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    first_frame = read_report(report_path)
+    return None if first_frame is None else first_frame - start
+
+
+def measure_warm(pool, script, report_path):
+    """
+    プールの子プロセスでスクリプトを起動し、最初のフレームまでの秒数を返す
+
+    Args:
+        pool (ZygotePool): 起動済みのプール
+        script (str): スクリプトのパス
+        report_path (str): 時刻の書き込み先
+
+    Returns:
+        float: 最初のフレームまでの秒数（失敗した場合はNone）
+    """
+    start = time.monotonic()
+    pid = pool.launch(script, report_path, refill=False)
+    pool.wait(pid)
+    first_frame = read_report(report_path)
+    # 次の測定に備えた補充のforkは、測定の外で行う
+    pool.fill()
+    return None if first_frame is None else first_frame - start
+
+
+def summarize(times):
+    """測定値の中央値を返す（全て失敗した場合はNone）"""
+    times = [t for t in times if t is not None]
+    return statistics.median(times) if times else None
+
+
+def format_ms(seconds):
+    """秒をミリ秒の文字列に変換する"""
+    return "失敗" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def format_change(current, previous):
+    """前回からの変化をミリ秒の文字列に変換する（比較できなければ空文字列）"""
+    if current is None or previous is None:
+        return ""
+    return f"{(current - previous) * 1000:+.0f} ms"
+
+
+def main():
+    """ベンチマークのエントリーポイント"""
+    parser = argparse.ArgumentParser(description="サンプル起動時間のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=1, help="各サンプルの測定回数")
+    parser.add_argument("--json", help="結果を書き込むJSONファイル")
+    parser.add_argument("--compare", help="比較する前回の結果（JSON）")
+    parser.add_argument("samples", nargs="*", help="測定するサンプル（省略時は全サンプル）")
+    args = parser.parse_args()
+
+    samples = [filename for filename, _t, _d in read_samples()
+               if not args.samples or filename in args.samples]
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = {filename: {"cold": [], "warm": []} for filename in samples}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, "first_frame")
+
+        # コールド起動を先に測る（プールのプリロードの影響を受けないように）
+        for filename in samples:
+            script = os.path.join(PRACTICE_DIR, filename)
+            for _ in range(args.repeat):
+                if os.path.exists(report_path):
+                    os.remove(report_path)
+                results[filename]["cold"].append(measure_cold(script, report_path))
+
+        with ZygotePool(size=1) as pool:
+            for filename in samples:
+                script = os.path.join(PRACTICE_DIR, filename)
+                for _ in range(args.repeat):
+                    if os.path.exists(report_path):
+                        os.remove(report_path)
+                    results[filename]["warm"].append(
+                        measure_warm(pool, script, report_path))
+
+    print(f"{'サンプル':<26}{'コールド':>10}{'ウォーム':>10}")
+    for filename in samples:
+        cold = summarize(results[filename]["cold"])
+        warm = summarize(results[filename]["warm"])
+        line = f"{filename:<28}{format_ms(cold):>12}{format_ms(warm):>12}"
+        previous = baseline.get(filename)
+        if previous is not None:
+            # 前回の結果からの変化（マイナスなら速くなった）
+            line += (f"{format_change(cold, summarize(previous['cold'])):>12}"
+                     f"{format_change(warm, summarize(previous['warm'])):>12}")
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    # コールド・ウォームのどちらかで1回も測定できなかったサンプルがあれば、
+    # 比較に使える結果ではないので失敗として終了する
+    failed = [f"{filename}（{label}）" for filename in samples
+              for kind, label in (("cold", "コールド"), ("warm", "ウォーム"))
+              if summarize(results[filename][kind]) is None]
+    if failed:
+        print("測定できませんでした（Kivy とディスプレイが必要です）: " + ", ".join(failed),
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+convert_restaurants.py - 飲食店データの変換ツール
+
+JSON（dict のリスト）、JSON Lines（1行に1件）、CSV（ヘッダー付き）の
+飲食店データを、03_cards.py / 05_lists.py がmmapで開ける
+バイナリ形式（practice/restaurant_dataset.py 参照）に変換します。
+出力先の拡張子が .jsonl / .sqlite3 の場合は、ページ単位で読み込むための
+JSON Lines / SQLite 形式（practice/restaurant_source.py 参照）で書き出します。
+
+各レコードには name, category, address, rating, distance が必要です。
+distance は "150m"、"1.2km" のような文字列でも数値（メートル）でも構いません。
+latitude, longitude（緯度・経度）は省略可能です。
+--geocode を付けると、緯度・経度がない店は住所から求めます（practice/geocoder.py 参照）。
+
+実行方法:
+    python tools/convert_restaurants.py restaurants.json
+    python tools/convert_restaurants.py restaurants.csv -o data/restaurants.rstd
+    python tools/convert_restaurants.py --demo 100000  # 動作確認用のデータを作成
+    python tools/convert_restaurants.py --demo 100000 -o data/restaurants.jsonl
+    python tools/convert_restaurants.py restaurants.csv --geocode
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "practice"))
+
+from geocoder import GeocodeCache, geocode_all  # noqa: E402
+from restaurant_dataset import DATASET_PATH, write_dataset  # noqa: E402
+from restaurants import RestaurantStore, make_demo_store  # noqa: E402
+
+
+def read_records(path):
+    """
+    JSON / JSON Lines / CSV ファイルから飲食店レコードを読み込む関数
+
+    Args:
+        path (str): 入力ファイルのパス（拡張子で形式を判定）
+
+    Returns:
+        iterable: レコード（dict）
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            for record in csv.DictReader(f):
+                record["rating"] = float(record["rating"])
+                yield record
+        elif path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def write_jsonl(store, path):
+    """ストアを JSON Lines 形式で書き出す関数"""
+    with open(path, "w", encoding="utf-8") as f:
+        for row in range(len(store)):
+            f.write(json.dumps(store.record(row), ensure_ascii=False) + "\n")
+
+
+def write_sqlite(store, path):
+    """ストアを SQLite の restaurants テーブルに書き出す関数"""
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(
+            "CREATE TABLE restaurants "
+            "(name TEXT, category TEXT, address TEXT, rating REAL, distance INTEGER, "
+            "latitude REAL, longitude REAL)"
+        )
+        # 緯度・経度が分からない店（NaN）は NULL にする
+        connection.executemany(
+            "INSERT INTO restaurants VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((store.name(row), store.category(row), store.address(row),
+              store.rating(row), store.distances[row],
+              *(None if math.isnan(value) else value
+                for value in (store.latitudes[row], store.longitudes[row])))
+             for row in range(len(store)))
+        )
+    connection.close()
+
+
+def fill_coordinates(store):
+    """
+    緯度・経度がない店の緯度・経度を住所から求める関数
+
+    変換結果は data/geocode_cache.json に保存し、次回は変換せずに使います。
+
+    Returns:
+        int: 緯度・経度を設定した件数
+    """
+    rows = [row for row in range(len(store)) if math.isnan(store.latitudes[row])]
+    cache = GeocodeCache()
+    results = geocode_all((store.address(row) for row in rows), cache=cache)
+    cache.save()
+    filled = 0
+    for row in rows:
+        result = results[store.address(row)]
+        if result is not None:
+            store.latitudes[row], store.longitudes[row], _level = result
+            filled += 1
+    return filled
+
+
+def main():
+    """変換のエントリーポイント"""
+    parser = argparse.ArgumentParser(description="飲食店データの変換")
+    parser.add_argument("input", nargs="?", help="入力ファイル（.json / .jsonl / .csv）")
+    parser.add_argument("-o", "--output", default=DATASET_PATH, help="出力先")
+    parser.add_argument("--demo", type=int, help="入力の代わりに指定件数のデモデータを作成")
+    parser.add_argument("--geocode", action="store_true", help="緯度・経度がない店を住所から求める")
+    args = parser.parse_args()
+
+    if args.demo:
+        store = make_demo_store(args.demo)
+    elif args.input:
+        store = RestaurantStore.from_records(read_records(args.input))
+    else:
+        parser.error("入力ファイルか --demo を指定してください")
+
+    if args.geocode:
+        print(f"{fill_coordinates(store)} 件の緯度・経度を住所から求めました")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    if args.output.endswith(".jsonl"):
+        write_jsonl(store, args.output)
+    elif args.output.endswith((".sqlite3", ".db")):
+        write_sqlite(store, args.output)
+    else:
+        write_dataset(store, args.output)
+    print(f"{len(store)} 件を書き出しました: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
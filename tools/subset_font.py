@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+subset_font.py - アプリで使う文字だけを含むサブセットフォントの作成
+
+NotoSansCJKjp-Regular.otf は数万文字を含む大きなフォントで、
+読み込み時間・メモリ・APKサイズの大部分を占めます。
+このスクリプトは次の文字だけを残したサブセットフォントを作成します。
+- main.py と practice/*.py の文字列リテラルに含まれる文字
+- data/ ディレクトリのデータファイル（JSON / CSV など）に含まれる文字
+- ASCII、ひらがな、カタカナ、全角記号などの基本的な文字
+
+作成したフォントは practice/fonts.py が自動的に使います。
+サブセットがない場合や、作成後に文字の元のファイルが更新された場合は
+フルセットのフォントが使われます（もう一度このスクリプトを実行してください）。
+
+必要なパッケージ:
+    pip install fonttools
+
+実行方法:
+    python tools/subset_font.py
+    python tools/subset_font.py --jis-level1  # JIS第1水準漢字も含める
+"""
+
+import argparse
+import ast
+import os
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "practice"))
+
+from fonts import DATA_DIR, FULL_FONT, SUBSET_FONT, subset_sources  # noqa: E402
+
+# 常に含める文字の範囲（開始, 終了）
+BASE_RANGES = [
+    (0x0020, 0x007E),  # ASCII
+    (0x00A0, 0x00FF),  # ラテン1補助（×、° など）
+    (0x2010, 0x206F),  # 一般句読点（…、‥ など）
+    (0x2190, 0x21FF),  # 矢印
+    (0x2460, 0x24FF),  # 囲み英数字
+    (0x25A0, 0x26FF),  # 幾何学模様・その他の記号（★、● など）
+    (0x3000, 0x303F),  # CJKの記号と句読点
+    (0x3040, 0x309F),  # ひらがな
+    (0x30A0, 0x30FF),  # カタカナ
+    (0xFF00, 0xFFEF),  # 半角・全角形
+]
+
+
+def collect_source_strings(paths):
+    """
+    Pythonファイルの文字列リテラルに含まれる文字を集める関数
+
+    f文字列の固定部分も文字列リテラルとして扱われます。
+
+    Args:
+        paths (list): Pythonファイルのパスのリスト
+
+    Returns:
+        set: 文字の集合
+    """
+    chars = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                chars.update(node.value)
+    return chars
+
+
+def collect_data_chars(paths):
+    """
+    データファイルに含まれる文字を集める関数
+
+    Args:
+        paths (list): データファイルのパスのリスト
+
+    Returns:
+        set: 文字の集合
+    """
+    chars = set()
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                chars.update(line)
+    return chars
+
+
+def jis_level1_chars():
+    """
+    JIS第1水準漢字（よく使われる約3000字）を返す関数
+
+    Shift_JIS の 0x889F〜0x9872 を順にデコードして作成します。
+
+    Returns:
+        set: 文字の集合
+    """
+    chars = set()
+    for lead in range(0x88, 0x99):
+        for trail in range(0x40, 0xFD):
+            if not 0x889F <= (lead << 8 | trail) <= 0x9872:
+                continue
+            try:
+                chars.add(bytes([lead, trail]).decode("shift_jis"))
+            except UnicodeDecodeError:
+                continue
+    return chars
+
+
+def base_chars():
+    """常に含める基本的な文字を返す関数"""
+    return {chr(c) for start, end in BASE_RANGES for c in range(start, end + 1)}
+
+
+def make_subset(source_font, output_font, chars):
+    """
+    fontTools でサブセットフォントを作成する関数
+
+    Args:
+        source_font (str): 元のフォント
+        output_font (str): 出力先
+        chars (set): 残す文字の集合
+    """
+    try:
+        from fontTools import subset
+    except ImportError:
+        sys.exit("fonttools が必要です: pip install fonttools")
+
+    options = subset.Options()
+    options.layout_features = ["*"]  # 縦書き・字形切り替えなどの機能を残す
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+
+    font = subset.load_font(source_font, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(chars)))
+    subsetter.subset(font)
+    subset.save_font(font, output_font, options)
+
+
+def main():
+    """サブセット作成のエントリーポイント"""
+    parser = argparse.ArgumentParser(description="サブセットフォントの作成")
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="文字を集めるデータファイルのディレクトリ")
+    parser.add_argument("--jis-level1", action="store_true",
+                        help="JIS第1水準漢字も含める（テキスト入力向け）")
+    parser.add_argument("--output", default=SUBSET_FONT, help="出力先")
+    args = parser.parse_args()
+
+    sources, data_files = subset_sources(args.data_dir)
+
+    chars = base_chars()
+    chars |= collect_source_strings(sources)
+    chars |= collect_data_chars(data_files)
+    if args.jis_level1:
+        chars |= jis_level1_chars()
+    chars = {c for c in chars if c.isprintable()}
+
+    make_subset(FULL_FONT, args.output, chars)
+
+    full_size = os.path.getsize(FULL_FONT)
+    subset_size = os.path.getsize(args.output)
+    print(f"文字数: {len(chars)}")
+    print(f"フォントサイズ: {full_size / 1024 / 1024:.1f} MiB → "
+          f"{subset_size / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+zygote.py - 事前にforkしておくウォームなインタプリタプール
+
+サンプルを別プロセスで起動する場合、毎回 Python + Kivy + KivyMD の
+importからやり直すと数秒かかります。このモジュールでは、
+kivy / よく使う kivymd.uix モジュールをimport済みの
+親プロセスから子プロセスを前もってforkしておき、
+起動要求が来たら待機中の子にスクリプトを渡して実行させます。
+
+注意:
+- os.fork() を使うため、Linux / macOS 専用です。
+- ウィンドウ（kivy.core.window）はfork後に子プロセスで作成します。
+  親でウィンドウを作ってしまうとGLコンテキストを共有できないため、
+  プリロード中は kivy.core.window のimportを止め、ウィンドウを必要とする
+  モジュール（kivymd.app など）はプリロードせずに読み飛ばします。
+
+実行方法:
+    python tools/zygote.py
+    （標準入力にサンプルのファイル名を1行ずつ入力すると起動します）
+"""
+
+import argparse
+import ast
+import importlib
+import os
+import runpy
+import sys
+import time
+import traceback
+
+
+# リポジトリのルートディレクトリと practice/ ディレクトリ
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRACTICE_DIR = os.path.join(ROOT_DIR, "practice")
+
+# 常にプリロードするモジュール
+# （kivymd.app は kivymd.theming からウィンドウを作成するため含めない）
+BASE_PRELOAD_MODULES = [
+    "kivy",
+    "kivy.app",
+    "kivy.clock",
+    "kivy.metrics",
+    "kivy.animation",
+    "kivy.core.text",
+]
+
+# importするとウィンドウが作成されるモジュール
+WINDOW_MODULE = "kivy.core.window"
+
+
+class WindowImportBlocker:
+    """
+    プリロード中に kivy.core.window のimportを止めるインポートフック
+
+    sys.meta_path の先頭に登録すると、kivy.core.window をimportしようとした
+    時点で ImportError になり、ウィンドウは作成されません。
+    """
+
+    def find_spec(self, name, path=None, target=None):
+        if name == WINDOW_MODULE:
+            raise ImportError(f"プリロード中は {WINDOW_MODULE} をimportしません", name=name)
+        return None
+
+
+def read_samples():
+    """
+    main.py の SAMPLES 一覧を読み込む関数
+
+    main.py をimportするとウィンドウが作成されてしまうため、
+    ソースを構文解析して SAMPLES の値だけを取り出します。
+
+    Returns:
+        list: (ファイル名, タイトル, 説明) のリスト
+    """
+    with open(os.path.join(ROOT_DIR, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if (isinstance(node, ast.Assign)
+                and any(getattr(t, "id", None) == "SAMPLES" for t in node.targets)):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("main.py に SAMPLES が見つかりません")
+
+
+def common_uix_modules(min_count=2):
+    """
+    複数のサンプルでimportされている kivymd.uix モジュールを調べる関数
+
+    Args:
+        min_count (int): 何個以上のサンプルで使われていれば対象にするか
+
+    Returns:
+        list: モジュール名のリスト（使用数の多い順）
+    """
+    counts = {}
+    for filename, _title, _description in read_samples():
+        with open(os.path.join(PRACTICE_DIR, filename), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        modules = {
+            node.module for node in ast.walk(tree)
+            if isinstance(node, ast.ImportFrom) and node.module
+            and node.module.startswith("kivymd.uix.")
+        }
+        for module in modules:
+            counts[module] = counts.get(module, 0) + 1
+    common = [m for m, c in counts.items() if c >= min_count]
+    return sorted(common, key=lambda m: (-counts[m], m))
+
+
+def preload(modules):
+    """
+    モジュールを事前にimportする関数
+
+    KivyMDのバージョンによって存在しないモジュールや、
+    ウィンドウを必要とするモジュールはimportできないため読み飛ばします。
+
+    Args:
+        modules (list): モジュール名のリスト
+
+    Returns:
+        list: importできたモジュール名のリスト
+
+    Raises:
+        RuntimeError: プリロード前にウィンドウが作成されている場合
+    """
+    if WINDOW_MODULE in sys.modules:
+        raise RuntimeError(
+            "ウィンドウが作成済みのプロセスではプリロードできません"
+            "（fork後の子プロセスで描画できなくなります）"
+        )
+    blocker = WindowImportBlocker()
+    sys.meta_path.insert(0, blocker)
+    loaded = []
+    try:
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            loaded.append(name)
+    finally:
+        sys.meta_path.remove(blocker)
+    return loaded
+
+
+def run_script(path, report_path=None):
+    """
+    スクリプトを __main__ として実行する関数
+
+    report_path を指定すると、最初のフレームが描画された時刻
+    （time.monotonic()）をそのファイルに書き込み、アプリを終了します。
+    ベンチマークで「最初のフレームまでの時間」を測るために使います。
+
+    Args:
+        path (str): 実行するスクリプトのパス
+        report_path (str): 時刻の書き込み先（Noneなら通常実行）
+    """
+    os.chdir(ROOT_DIR)
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(os.path.abspath(path))
+
+    if report_path:
+        from kivy.app import App
+        from kivy.clock import Clock
+
+        def on_first_frame(dt):
+            with open(report_path, "w") as f:
+                f.write(repr(time.monotonic()))
+            app = App.get_running_app()
+            if app is not None:
+                app.stop()
+
+        # 1回目のtickは最初の描画の前に実行されるため、
+        # もう1フレーム待ってから時刻を記録する
+        Clock.schedule_once(lambda dt: Clock.schedule_once(on_first_frame, 0), 0)
+
+    runpy.run_path(path, run_name="__main__")
+
+
+class ZygotePool:
+    """
+    fork済みの待機プロセスを保持するプール
+
+    start() を呼んだプロセスがウォームな親（zygote）になります。
+    launch() は待機中の子プロセスにスクリプトを渡し、
+    すぐに新しい子をforkしてプールを補充します（refill=False なら fill() を呼ぶまで補充しない）。
+    """
+
+    def __init__(self, size=2, modules=None):
+        """
+        Args:
+            size (int): 待機させておく子プロセスの数
+            modules (list): プリロードするモジュール（Noneなら既定の一覧）
+        """
+        self.size = size
+        if modules is None:
+            modules = BASE_PRELOAD_MODULES + common_uix_modules()
+        self.modules = modules
+        self.loaded_modules = []
+        # 待機中の子プロセス: [(pid, 書き込み用fd), ...]
+        self.idle = []
+
+    def start(self):
+        """モジュールをプリロードし、子プロセスをforkしてプールを満たす"""
+        self.loaded_modules = preload(self.modules)
+        self.fill()
+
+    def fill(self):
+        """待機中の子プロセスが size 個になるまでforkする"""
+        while len(self.idle) < self.size:
+            self.idle.append(self._fork_child())
+
+    def _fork_child(self):
+        """
+        子プロセスを1つforkするメソッド
+
+        子プロセスはパイプからスクリプトのパスを受け取るまで待機します。
+
+        Returns:
+            tuple: (pid, 書き込み用fd)
+        """
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid:
+            os.close(read_fd)
+            return pid, write_fd
+
+        # --- ここから子プロセス ---
+        os.close(write_fd)
+        for _pid, fd in self.idle:
+            os.close(fd)
+        code = 0
+        try:
+            with os.fdopen(read_fd, encoding="utf-8") as pipe:
+                line = pipe.readline().rstrip("\n")
+            if line:
+                script, _, report_path = line.partition("\t")
+                run_script(script, report_path or None)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def launch(self, script, report_path=None, refill=True):
+        """
+        待機中の子プロセスでスクリプトを実行するメソッド
+
+        Args:
+            script (str): 実行するスクリプトのパス
+            report_path (str): 最初のフレームの時刻の書き込み先
+            refill (bool): すぐに新しい子をforkしてプールを補充するか
+                           （ベンチマークでは、forkが測定に含まれないように後から fill() を呼ぶ）
+
+        Returns:
+            int: スクリプトを実行する子プロセスのpid
+        """
+        if not self.idle:
+            self.idle.append(self._fork_child())
+        pid, write_fd = self.idle.pop(0)
+        with os.fdopen(write_fd, "w", encoding="utf-8") as pipe:
+            pipe.write(f"{os.path.abspath(script)}\t{report_path or ''}\n")
+        if refill:
+            # 次の起動に備えて補充する
+            self.fill()
+        return pid
+
+    def wait(self, pid):
+        """
+        子プロセスの終了を待つメソッド
+
+        Args:
+            pid (int): launch() が返したpid
+
+        Returns:
+            int: 終了コード
+        """
+        _pid, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+    def reap(self):
+        """終了済みの子プロセスを回収する（ゾンビプロセス対策）"""
+        while True:
+            try:
+                pid, _status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+    def close(self):
+        """待機中の子プロセスを終了させる"""
+        for pid, write_fd in self.idle:
+            os.close(write_fd)  # 空行を読んだ子はそのまま終了する
+            os.waitpid(pid, 0)
+        self.idle = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """
+    コマンドラインのエントリーポイント
+
+    標準入力からサンプルのファイル名（例: 03_cards.py）を受け取り、
+    プールの子プロセスで起動します。
+    """
+    parser = argparse.ArgumentParser(description="ウォームなインタプリタプール")
+    parser.add_argument("--size", type=int, default=2, help="待機プロセス数")
+    args = parser.parse_args()
+
+    sample_files = {filename for filename, _t, _d in read_samples()}
+    with ZygotePool(size=args.size) as pool:
+        print(f"プリロード済み: {len(pool.loaded_modules)} モジュール")
+        print("起動するサンプルのファイル名を入力してください（空行で終了）")
+        for line in sys.stdin:
+            filename = line.strip()
+            if not filename:
+                break
+            if filename not in sample_files:
+                print(f"不明なサンプルです: {filename}")
+                continue
+            pool.reap()
+            pid = pool.launch(os.path.join(PRACTICE_DIR, filename))
+            print(f"{filename} を起動しました (pid={pid})")
+
+
+if __name__ == '__main__':
+    main()